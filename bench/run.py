@@ -0,0 +1,494 @@
+"""
+Benchmark polars_credit on synthetic credit data.
+
+Every case runs in a fresh process so that the reported peak memory belongs to
+that case alone. Results are written as JSON and can be compared between runs
+to catch regressions::
+
+    python bench/run.py generate data/1m_x_100 --rows 1_000_000 --cols 100
+    python bench/run.py run data/1m_x_100 --output base.json
+    python bench/run.py run data/1m_x_100 --output new.json
+    python bench/run.py compare base.json new.json --tolerance 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import multiprocessing
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from functools import cached_property
+from importlib import metadata
+from pathlib import Path
+
+import polars as pl
+import polars.selectors as cs
+from synthetic import PERIOD, TARGET, write_credit_parquet
+
+CASES = {}
+
+
+def case(name: str):
+    """
+    Register a benchmark case, a function returning the callable to time.
+
+    The case reads its inputs from `BenchData` before returning the callable,
+    never inside it, so that loading them is neither timed nor counted in the
+    memory of the timed calls.
+    """
+
+    def decorator(func):
+        CASES[name] = func
+        return func
+
+    return decorator
+
+
+class BenchData:
+    """
+    Inputs shared by the benchmark cases, prepared outside of the timings.
+
+    The dataset is scanned rather than read, and every input is collected the
+    first time a case asks for it, so that a case only holds the columns it
+    needs, e.g. the metrics cases never load the features.
+    """
+
+    def __init__(self, path: Path):
+        self.lf = pl.scan_parquet(path / "*.parquet")
+
+    @cached_property
+    def y(self) -> pl.Series:
+        """The target."""
+        return self.lf.select(TARGET).collect().to_series()
+
+    @cached_property
+    def t(self) -> pl.Series:
+        """The period of every row."""
+        return self.lf.select(PERIOD).collect().to_series()
+
+    @cached_property
+    def X(self) -> pl.DataFrame:
+        """The features."""
+        return self.lf.drop(TARGET, PERIOD).collect()
+
+    @cached_property
+    def binner(self):
+        """Deciles of the features."""
+        from polars_credit.bin import QuantileBinner
+
+        return QuantileBinner(q=10).fit(self.X)
+
+    @cached_property
+    def X_binned(self) -> pl.DataFrame:
+        """The binned features, as strings."""
+        return self.binner.transform(self.X).with_columns(
+            cs.categorical().cast(pl.String)
+        )
+
+    @cached_property
+    def score(self) -> pl.Series:
+        """A score increasing with the float features."""
+        return (
+            self.lf.select(
+                pl.sum_horizontal(cs.float().rank() / pl.len()).alias("score")
+            )
+            .collect()
+            .to_series()
+        )
+
+
+@case("plugin.cal_iv")
+def _plugin_cal_iv(d: BenchData):
+    from polars_credit import cal_iv
+
+    df = d.X_binned.with_columns(d.y)
+    return lambda: df.select(cal_iv(pl.exclude(TARGET), TARGET))
+
+
+@case("plugin.cal_woe")
+def _plugin_cal_woe(d: BenchData):
+    from polars_credit import cal_woe
+
+    lf = d.X_binned.with_columns(d.y).lazy()
+    queries = [lf.select(cal_woe(x, TARGET)) for x in d.X_binned.columns]
+    return lambda: pl.collect_all(queries)
+
+
+@case("divergence.cal_iv")
+def _divergence_cal_iv(d: BenchData):
+    from polars_credit.util.divergence import cal_iv
+
+    df = d.X_binned.with_columns(d.y)
+    return lambda: cal_iv(df, TARGET)
+
+
+@case("divergence.cal_psi")
+def _divergence_cal_psi(d: BenchData):
+    from polars_credit.util.divergence import cal_psi
+
+    df = d.X_binned.with_columns(d.t)
+    return lambda: cal_psi(df, PERIOD)
+
+
+@case("bin.QuantileBinner.fit")
+def _quantile_binner_fit(d: BenchData):
+    from polars_credit.bin import QuantileBinner
+
+    X = d.X
+    return lambda: QuantileBinner(q=10).fit(X)
+
+
+@case("bin.QuantileBinner.transform")
+def _quantile_binner_transform(d: BenchData):
+    binner = d.binner
+    X = d.X
+    return lambda: binner.transform(X)
+
+
+@case("bin.CustomBinner.transform")
+def _custom_binner_transform(d: BenchData):
+    from polars_credit.bin import CustomBinner
+
+    binner = CustomBinner(d.binner.breakpoints_).fit(d.X)
+    X = d.X
+    return lambda: binner.transform(X)
+
+
+@case("woe.WOETransformer.fit")
+def _woe_fit(d: BenchData):
+    from polars_credit.woe import WOETransformer
+
+    X_binned = d.X_binned
+    y = d.y
+    return lambda: WOETransformer().fit(X_binned, y)
+
+
+@case("woe.WOETransformer.transform")
+def _woe_transform(d: BenchData):
+    from polars_credit.woe import WOETransformer
+
+    woe = WOETransformer().fit(d.X_binned, d.y)
+    X_binned = d.X_binned
+    return lambda: woe.transform(X_binned)
+
+
+@case("feature_selection.NullRatioThreshold.fit")
+def _null_ratio_fit(d: BenchData):
+    from polars_credit.feature_selection import NullRatioThreshold
+
+    X = d.X
+    return lambda: NullRatioThreshold().fit(X)
+
+
+@case("feature_selection.IdenticalRatioThreshold.fit")
+def _identical_ratio_fit(d: BenchData):
+    from polars_credit.feature_selection import IdenticalRatioThreshold
+
+    X = d.X
+    return lambda: IdenticalRatioThreshold().fit(X)
+
+
+@case("feature_selection.IVThreshold.fit")
+def _iv_threshold_fit(d: BenchData):
+    from polars_credit.feature_selection import IVThreshold
+
+    X_binned = d.X_binned
+    y = d.y
+    return lambda: IVThreshold().fit(X_binned, y)
+
+
+@case("feature_selection.PSIThreshold.fit")
+def _psi_threshold_fit(d: BenchData):
+    from polars_credit.feature_selection import PSIThreshold
+
+    X_binned = d.X_binned
+    t = d.t
+    return lambda: PSIThreshold().fit(X_binned, t=t)
+
+
+@case("impute.FixedValueImputer.transform")
+def _fixed_value_imputer_transform(d: BenchData):
+    from polars_credit.impute import FixedValueImputer
+
+    fill = dict.fromkeys(cs.expand_selector(d.X, cs.numeric()), 0)
+    imputer = FixedValueImputer(fill).fit(d.X)
+    X = d.X
+    return lambda: imputer.transform(X)
+
+
+@case("eda.null_ratio")
+def _eda_null_ratio(d: BenchData):
+    import polars_credit.eda  # noqa: F401
+
+    X = d.X
+    return lambda: X.eda.null_ratio()
+
+
+@case("eda.identical_ratio")
+def _eda_identical_ratio(d: BenchData):
+    import polars_credit.eda  # noqa: F401
+
+    X = d.X
+    return lambda: X.eda.identical_ratio()
+
+
+@case("eda.n_unique")
+def _eda_n_unique(d: BenchData):
+    import polars_credit.eda  # noqa: F401
+
+    X = d.X
+    return lambda: X.eda.n_unique()
+
+
+@case("eda.iv")
+def _eda_iv(d: BenchData):
+    import polars_credit.eda  # noqa: F401
+
+    df = d.X_binned.with_columns(d.y)
+    return lambda: df.eda.iv(TARGET)
+
+
+@case("metrics.roc_auc_score")
+def _roc_auc_score(d: BenchData):
+    from polars_credit.metrics import roc_auc_score
+
+    df = pl.DataFrame([d.y, d.score])
+    return lambda: df.select(roc_auc_score(TARGET, "score"))
+
+
+@case("metrics.ks_score")
+def _ks_score(d: BenchData):
+    from polars_credit.metrics import ks_score
+
+    df = pl.DataFrame([d.y, d.score])
+    return lambda: df.select(ks_score(TARGET, "score"))
+
+
+@case("metrics.gini")
+def _gini(d: BenchData):
+    from polars_credit.metrics import gini
+
+    df = pl.DataFrame([d.y, d.score])
+    return lambda: df.select(gini(TARGET, "score"))
+
+
+def _reset_peak_rss() -> bool:
+    # Linux resets the peak of /proc/self/status on writing 5 to clear_refs
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_rss_mb() -> float:
+    status = Path("/proc/self/status")
+    if status.exists():
+        match = re.search(r"VmHWM:\s+(\d+) kB", status.read_text())
+        return int(match.group(1)) / 2**10
+
+    import resource  # not available on Windows
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _rss_mb() -> float:
+    status = Path("/proc/self/status")
+    if status.exists():
+        match = re.search(r"VmRSS:\s+(\d+) kB", status.read_text())
+        return int(match.group(1)) / 2**10
+    return _peak_rss_mb()
+
+
+def _run_case(name: str, path: Path, repeat: int) -> dict:
+    data = BenchData(path)
+    func = CASES[name](data)
+
+    # the memory of the inputs is left out: the delta is the peak during the
+    # timed calls over the resident memory before them, which is exact where
+    # the peak can be reset and a lower bound elsewhere
+    gc.collect()
+    _reset_peak_rss()
+    rss_before = _rss_mb()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    peak = _peak_rss_mb()
+    return {
+        "case": name,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "peak_rss_mb": peak,
+        "peak_rss_delta_mb": peak - rss_before,
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _version(package: str) -> str | None:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _environment(path: Path) -> dict:
+    lf = pl.scan_parquet(path / "*.parquet")
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_revision": _git_revision(),
+        "polars_credit": _version("polars_credit"),
+        "polars": pl.__version__,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "n_rows": lf.select(pl.len()).collect().item(),
+        "n_cols": len(lf.collect_schema()) - 2,
+    }
+
+
+def run(path: Path, *, pattern: str = ".*", repeat: int = 3) -> dict:
+    """
+    Run every benchmark case matching ``pattern`` on the dataset at ``path``.
+
+    Parameters
+    ----------
+    path : Path
+        Directory of Parquet files written by ``write_credit_parquet``.
+    pattern : str, optional
+        Regular expression selecting the cases to run. Default runs all cases.
+    repeat : int, optional
+        Number of timed repetitions per case. Default is 3.
+
+    Returns
+    -------
+    dict
+        The environment description and one record per case with the minimum
+        and median wall time in seconds, the peak resident memory in MB and
+        its increase over the memory held before the timed calls.
+
+    """
+    names = [name for name in CASES if re.search(pattern, name)]
+    ctx = multiprocessing.get_context("spawn")
+
+    results = []
+    for name in names:
+        with ctx.Pool(1, maxtasksperchild=1) as pool:
+            result = pool.apply(_run_case, (name, path, repeat))
+        print(
+            f"{name:<50} {result['median_s']:>10.4f}s "
+            f"{result['peak_rss_delta_mb']:>10.0f}MB"
+        )
+        results.append(result)
+
+    timings = {r["case"]: r["median_s"] for r in results}
+    if {"plugin.cal_iv", "divergence.cal_iv"} <= timings.keys():
+        speedup = timings["divergence.cal_iv"] / timings["plugin.cal_iv"]
+        print(f"pl_iv speedup over util.divergence.cal_iv: {speedup:.2f}x")
+
+    return {"environment": _environment(path), "results": results}
+
+
+def compare(base: dict, new: dict, *, tolerance: float = 0.1) -> list[str]:
+    """
+    Return the cases whose median time grew by more than ``tolerance``.
+
+    Parameters
+    ----------
+    base : dict
+        Results of the reference run.
+    new : dict
+        Results of the candidate run.
+    tolerance : float, optional
+        Allowed relative slowdown. Default is 0.1.
+
+    Returns
+    -------
+    list[str]
+        Names of the regressed cases.
+
+    """
+    base_times = {r["case"]: r["median_s"] for r in base["results"]}
+
+    regressions = []
+    for result in new["results"]:
+        name = result["case"]
+        if name not in base_times:
+            continue
+        ratio = result["median_s"] / base_times[name]
+        flag = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{name:<50} {ratio:>8.2f}x {flag}")
+        if flag:
+            regressions.append(name)
+
+    return regressions
+
+
+def main(argv=None):  # noqa: D103
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p_gen = commands.add_parser("generate", help="write a synthetic dataset")
+    p_gen.add_argument("path", type=Path)
+    p_gen.add_argument("--rows", type=int, default=1_000_000)
+    p_gen.add_argument("--cols", type=int, default=100)
+    p_gen.add_argument("--seed", type=int, default=0)
+    p_gen.add_argument("--bad-rate", type=float, default=0.05)
+    p_gen.add_argument("--chunk-rows", type=int, default=1_000_000)
+
+    p_run = commands.add_parser("run", help="run the benchmark cases")
+    p_run.add_argument("path", type=Path)
+    p_run.add_argument("--cases", default=".*", help="regex selecting cases")
+    p_run.add_argument("--repeat", type=int, default=3)
+    p_run.add_argument("--output", type=Path)
+
+    p_cmp = commands.add_parser("compare", help="compare two result files")
+    p_cmp.add_argument("base", type=Path)
+    p_cmp.add_argument("new", type=Path)
+    p_cmp.add_argument("--tolerance", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        write_credit_parquet(
+            args.path,
+            args.rows,
+            args.cols,
+            seed=args.seed,
+            bad_rate=args.bad_rate,
+            chunk_rows=args.chunk_rows,
+        )
+    elif args.command == "run":
+        output = run(args.path, pattern=args.cases, repeat=args.repeat)
+        if args.output is not None:
+            args.output.write_text(json.dumps(output, indent=2))
+    else:
+        base = json.loads(args.base.read_text())
+        new = json.loads(args.new.read_text())
+        return 1 if compare(base, new, tolerance=args.tolerance) else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
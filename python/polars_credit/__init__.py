@@ -1,15 +1,50 @@
+from __future__ import annotations
+
+import ctypes
+import importlib
+from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import polars as pl
-from polars._typing import IntoExpr
 from polars.plugins import register_plugin_function
 
-from polars_credit import base, bin, feature_selection, impute, util, woe
+if TYPE_CHECKING:
+    from polars._typing import IntoExpr
 
 LIB = Path(__file__).parent
 
+# Submodules are imported on first attribute access (PEP 562) so that the
+# plugin expressions below can be used without paying for scikit-learn.
+_SUBMODULES = frozenset(
+    {
+        "base",
+        "bin",
+        "eda",
+        "feature_selection",
+        "impute",
+        "linear_model",
+        "metrics",
+        "monitor",
+        "plot",
+        "preprocessing",
+        "scorecard",
+        "util",
+        "woe",
+    }
+)
+
+
+def cal_iv(x: IntoExpr, y: IntoExpr | list[IntoExpr]) -> pl.Expr:  # noqa: D103
+    if isinstance(y, list):
+        # one field per target, each a separate pass of the kernel over x; for
+        # one aggregation per feature covering all the targets, use
+        # polars_credit.util.divergence.cal_iv(df, y=[...])
+        return pl.struct(
+            cal_iv(x, t).alias(t if isinstance(t, str) else t.meta.output_name())
+            for t in y
+        )
 
-def cal_iv(x: IntoExpr, y: IntoExpr) -> pl.Expr:  # noqa: D103
     output = register_plugin_function(
         args=[x, y],
         plugin_path=LIB,
@@ -35,13 +70,114 @@ def cal_woe(x: IntoExpr, y: IntoExpr) -> pl.Expr:  # noqa: D103
     return output
 
 
+def _plugin_library() -> Path | None:
+    # the library polars loads the plugin functions from: the first dynamic
+    # library found in LIB, .pyd on Windows
+    for path in LIB.iterdir():
+        if path.is_file() and path.suffix in {".so", ".dll", ".pyd"}:
+            return path
+    return None
+
+
+@cache
+def _has_kernel(name: str) -> bool:
+    # wheels built before a kernel was added do not export its symbols; polars
+    # only finds out when the plugin is called, by panicking
+    lib = _plugin_library()
+    if lib is None:
+        return False
+    try:
+        handle = ctypes.CDLL(str(lib))
+    except OSError:
+        return False
+    symbols = (f"_polars_plugin_{name}", f"_polars_plugin_field_{name}")
+    return all(hasattr(handle, symbol) for symbol in symbols)
+
+
+def _bin_index_fallback(args: list[IntoExpr], breaks: list[list[float]]) -> pl.Expr:
+    # the same ordinals as the native kernel, from one binary search per column
+    fields = []
+    for arg, bs in zip(args, breaks):
+        col = pl.col(arg) if isinstance(arg, str) else arg
+        index = pl.lit(
+            pl.Series([float(b) for b in bs], dtype=pl.Float64)
+        ).search_sorted(col.cast(pl.Float64), side="left")
+        fields.append(
+            pl.when(col.is_not_null() & col.cast(pl.Float64).is_not_nan())
+            .then(index.cast(pl.UInt16))
+            .alias(col.meta.output_name())
+        )
+    return pl.struct(fields)
+
+
+def cal_bin_index(x: IntoExpr | list[IntoExpr], breaks: list[list[float]]) -> pl.Expr:
+    """
+    Return the bin ordinals of one or more columns.
+
+    All columns are binned by a single call of the native kernel, which uses a
+    branch-free binary search over the breakpoints of each column. Bins are
+    right-closed like `pl.Expr.cut`: ordinal ``i`` holds the values in
+    ``(breaks[i - 1], breaks[i]]``. Null and NaN values are null, as with
+    `pl.Expr.cut`. With an extension built without the kernel, the same
+    ordinals are computed by Polars expressions.
+
+    Parameters
+    ----------
+    x : IntoExpr | list[IntoExpr]
+        The numeric column(s) to bin.
+    breaks : list[list[float]]
+        The sorted, unique breakpoints of each column.
+
+    Returns
+    -------
+    pl.Expr
+        A struct expression with one UInt16 field per column.
+
+    """
+    args = x if isinstance(x, list) else [x]
+    if not _has_kernel("pl_bin_index"):
+        return _bin_index_fallback(args, breaks)
+
+    output = register_plugin_function(
+        args=args,
+        plugin_path=LIB,
+        function_name="pl_bin_index",
+        kwargs={"breaks": [[float(b) for b in bs] for bs in breaks]},
+        is_elementwise=True,
+    )
+
+    return output
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
+
+
 __all__ = [
+    "base",
+    "bin",
+    "cal_bin_index",
     "cal_iv",
     "cal_woe",
-    "woe",
+    "eda",
     "feature_selection",
-    "bin",
-    "base",
     "impute",
+    "linear_model",
+    "metrics",
+    "monitor",
+    "plot",
+    "preprocessing",
+    "scorecard",
     "util",
+    "woe",
 ]
@@ -3,6 +3,8 @@ from abc import ABCMeta
 import polars as pl
 from sklearn.base import TransformerMixin
 
+from polars_credit.util.profile import profiled
+
 
 class PolarSelectorMixin(TransformerMixin, metaclass=ABCMeta):
     """
@@ -33,6 +35,7 @@ class PolarSelectorMixin(TransformerMixin, metaclass=ABCMeta):
         """Get the columns to drop."""
         return self.cols_to_drop_
 
+    @profiled
     def transform(self, X: pl.DataFrame) -> pl.DataFrame:
         """
         Apply the feature selection by dropping columns.
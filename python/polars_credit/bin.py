@@ -1,9 +1,18 @@
+from __future__ import annotations
+
+import heapq
+from fractions import Fraction
+
+import numpy as np
 import polars as pl
 import polars.selectors as cs
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.utils.validation import check_is_fitted
 
+from polars_credit import cal_bin_index
+from polars_credit.util.cache import cached_fit
 from polars_credit.util.expr import _parse_expr
+from polars_credit.util.profile import collect, collect_all, collect_like, profiled
 
 
 def get_qcut_breaks_expr(col: str, q: int, *, allow_duplicates: bool = True):
@@ -42,6 +51,202 @@ def get_qcut_breaks_expr(col: str, q: int, *, allow_duplicates: bool = True):
     return expr_rm_inf
 
 
+def _index_dtype(breaks: list) -> pl.DataType:
+    return pl.UInt8 if len(breaks) < 2**8 else pl.UInt16
+
+
+def get_bin_labels(breaks: list) -> list[str]:
+    """
+    Return the labels of the bins defined by a list of breakpoints.
+
+    Parameters
+    ----------
+    breaks : list
+        The breakpoints.
+
+    Returns
+    -------
+    list[str]
+        The labels produced by `pl.Expr.cut`, e.g. ``"(-inf, 3.5]"``, ordered
+        by bin ordinal.
+
+    """
+    breaks = sorted(map(float, breaks))
+    return pl.Series([*breaks, float("inf")]).cut(breaks).cast(pl.String).to_list()
+
+
+def _cut_expr(x: str, breaks: list) -> pl.Expr:
+    # the labels of `pl.Expr.cut` from a when/then chain, which unlike `cut`
+    # runs on the streaming engine; going through an Enum gives the same
+    # categories, in bin order, as `cut`
+    breaks = sorted(map(float, breaks))
+    labels = get_bin_labels(breaks)
+    value = pl.col(x).cast(pl.Float64)
+
+    # null and NaN values are null, as with `cut`
+    conditions = [*(value <= b for b in breaks), value.is_not_nan()]
+    expr = pl.when(conditions[0]).then(pl.lit(labels[0]))
+    for condition, label in zip(conditions[1:], labels[1:]):
+        expr = expr.when(condition).then(pl.lit(label))
+
+    return expr.cast(pl.Enum(labels)).cast(pl.Categorical).alias(x)
+
+
+def _quantile_values(X: pl.DataFrame, xs: list[str], ps: list[float]) -> dict:
+    # the quantiles of `qcut`, all probabilities of a column from a single sort.
+    # The position is offset by the nulls sorted first, as in Polars, so that
+    # the interpolated values are identical to the bit
+    positions = {}
+    for x in xs:
+        n_null = X[x].null_count()
+        float_idx = [(X.height - n_null - 1) * p + n_null for p in ps]
+        lower = [int(i) - n_null for i in float_idx]
+        upper = [min(i + 1, X.height - n_null - 1) for i in lower]
+        positions[x] = (np.array(float_idx) % 1, lower, upper)
+
+    df_values = X.select(
+        pl.col(x)
+        .drop_nulls()
+        .cast(pl.Float64)
+        .sort()
+        .gather([*lower, *upper])
+        .implode()
+        for x, (_, lower, upper) in positions.items()
+        if lower and lower[0] >= 0
+    )
+
+    values = {}
+    for x, (proportion, _, _) in positions.items():
+        if x not in df_values.columns:
+            values[x] = [None] * len(ps)
+            continue
+        gathered = df_values[x].item().to_numpy()
+        lo, hi = gathered[: len(ps)], gathered[len(ps) :]
+        with np.errstate(invalid="ignore"):
+            interp = proportion * (hi - lo) + lo
+        values[x] = np.where(lo == hi, lo, interp).tolist()
+
+    return values
+
+
+def _quantile_grid(
+    X: pl.DataFrame, y: pl.Series, qs
+) -> tuple[pl.DataFrame, dict[tuple[str, int], list[float]]]:
+    xs = cs.expand_selector(X, cs.numeric())
+    qs = sorted(set(qs))
+    ps = sorted({Fraction(i, q) for q in qs for i in range(1, q)})
+    quantiles = _quantile_values(X, xs, [float(p) for p in ps])
+
+    breaks = {}
+    fine_breaks = {}
+    for x in xs:
+        by_p = dict(zip(ps, quantiles[x]))
+        for q in qs:
+            values = {by_p[Fraction(i, q)] for i in range(1, q)} - {None}
+            breaks[x, q] = sorted(v for v in values if np.isfinite(v))
+        fine_breaks[x] = sorted(set().union(*(breaks[x, q] for q in qs)))
+
+    # the summary: good/bad counts of the bins of the union of all breakpoints,
+    # as ordinals rather than the physicals of `cut`, which are global ids
+    # under a string cache
+    df = X.lazy().with_columns(y)
+    ls_counts = collect_all(
+        df.group_by(
+            cal_bin_index(x, [fine_breaks[x]]).struct.field(x).alias("bin")
+        ).agg(
+            pl.col(y.name).eq(0).sum().alias("good"),
+            pl.col(y.name).eq(1).sum().alias("bad"),
+        )
+        for x in xs
+    )
+
+    rows = []
+    for x, df_counts in zip(xs, ls_counts):
+        df_null = df_counts.filter(pl.col("bin").is_null())
+        df_fine = df_counts.drop_nulls("bin")
+        # upper bound of each fine bin, the last bin being unbounded
+        upper = np.append(fine_breaks[x], np.inf)[df_fine["bin"].to_numpy()]
+        fine_good = df_fine["good"].to_numpy()
+        fine_bad = df_fine["bad"].to_numpy()
+        null_good, null_bad = df_null["good"].sum(), df_null["bad"].sum()
+        n_good = fine_good.sum() + null_good
+        n_bad = fine_bad.sum() + null_bad
+
+        for q in qs:
+            coarse = np.searchsorted(breaks[x, q], upper, side="left")
+            n_bins = len(breaks[x, q]) + 1
+            good = np.bincount(coarse, fine_good, minlength=n_bins)
+            bad = np.bincount(coarse, fine_bad, minlength=n_bins)
+            share = (good + bad) / (n_good + n_bad)
+            # like `qcut`, a breakpoint closing an empty bin is dropped
+            breaks[x, q] = [b for b, s in zip(breaks[x, q], share) if s > 0]
+            n_bins = len(breaks[x, q]) + 1
+
+            good = np.append(good[share > 0], null_good) / n_good
+            bad = np.append(bad[share > 0], null_bad) / n_bad
+            share = share[share > 0]
+            observed = (good > 0) | (bad > 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                iv = np.sum(
+                    (bad - good)[observed] * np.log(bad[observed] / good[observed])
+                )
+            rows.append((x, q, n_bins, float(iv), float(share.min())))
+
+    df_grid = pl.DataFrame(
+        rows,
+        schema={
+            "column": pl.String,
+            "q": pl.Int64,
+            "n_bins": pl.Int64,
+            "iv": pl.Float64,
+            "min_share": pl.Float64,
+        },
+        orient="row",
+    )
+    return df_grid, breaks
+
+
+def quantile_grid(X: pl.DataFrame, y: pl.Series, qs=(5, 10, 20, 50)) -> pl.DataFrame:
+    """
+    Evaluate quantile binnings of every numeric column for a grid of `q`.
+
+    Instead of refitting `QuantileBinner` and recomputing the IV for each `q`,
+    the quantiles of all the grid values are computed from a single sort per
+    column, and the good/bad counts are aggregated once over the bins of the
+    union of all the breakpoints. The breakpoints of each `q` are a subset of
+    that union, so the counts of its bins, and its IV, are sums over the fine
+    bins, without another pass over the rows.
+
+    Parameters
+    ----------
+    X : pl.DataFrame
+        The input DataFrame containing numeric columns to be binned.
+    y : pl.Series
+        The binary target variable.
+    qs : iterable of int, optional
+        The numbers of quantiles to evaluate. Default is (5, 10, 20, 50).
+
+    Returns
+    -------
+    pl.DataFrame
+        One row per (column, q) with the columns:
+        - 'column': The name of the feature
+        - 'q': The number of quantiles
+        - 'n_bins': The number of bins, fewer than q if quantiles coincide
+        - 'iv': The IV of the binned feature, nulls forming their own bin
+        - 'min_share': The share of all rows in the smallest non-empty bin
+
+    Notes
+    -----
+    The breakpoints and IV are the same as those of
+    ``QuantileBinner(q).fit_transform(X)``.
+
+    """
+    if isinstance(X, pl.LazyFrame):
+        X = collect(X)
+    return _quantile_grid(X, y, qs)[0]
+
+
 class BinnerMixin(BaseEstimator, TransformerMixin):
     """
     Base class for binning transformers in polars_credit.
@@ -63,14 +268,189 @@ class BinnerMixin(BaseEstimator, TransformerMixin):
         Should compute the breakpoints for binning.
     transform(X)
         Bin the values in X according to the computed breakpoints.
+    get_bin_labels()
+        Return the labels of the bins of each column, indexed by bin ordinal.
+    transform_sparse(X)
+        Return the bin dummies of X as a SciPy CSR matrix.
+    get_dummy_columns()
+        Return the feature and bin of each column of `transform_sparse`.
 
     Notes
     -----
     Subclasses must implement the `fit` method to define
     the specific binning criteria and compute breakpoints.
+    Subclasses may define an `output` parameter, "label" (the default) for
+    Categorical labels or "index" for integer bin ordinals, and a
+    `segment_col` parameter, in which case `breakpoints_` maps each segment to
+    the breakpoints of its columns.
     """
 
-    def transform(self, X: pl.DataFrame):
+    @property
+    def _segment_col(self) -> str | None:
+        return getattr(self, "segment_col", None)
+
+    def _check_not_segmented(self):
+        if self._segment_col is not None:
+            msg = "bin dummies are not supported with segment_col"
+            raise ValueError(msg)
+
+    def get_bin_labels(self) -> dict[str, list[str]]:
+        """Return the labels of the bins of each column, indexed by bin ordinal."""
+        check_is_fitted(self)
+        if self._segment_col is not None:
+            return {
+                segment: {col: get_bin_labels(b) for col, b in breaks.items()}
+                for segment, breaks in self.breakpoints_.items()
+            }
+        return {
+            col: get_bin_labels(breaks) for col, breaks in self.breakpoints_.items()
+        }
+
+    def get_dummy_columns(self) -> pl.DataFrame:
+        """
+        Return the feature and bin of each column of `transform_sparse`.
+
+        Returns
+        -------
+        pl.DataFrame
+            One row per dummy column with the columns 'column' (its index),
+            'feature', 'bin' (the bin ordinal, null for the null bin) and 'label'.
+
+        """
+        check_is_fitted(self)
+        self._check_not_segmented()
+        rows = [
+            (feature, i, label)
+            for feature, labels in self.get_bin_labels().items()
+            for i, label in [*enumerate(labels), (None, "null")]
+        ]
+        df = pl.DataFrame(
+            rows,
+            schema={"feature": pl.String, "bin": pl.UInt32, "label": pl.String},
+            orient="row",
+        )
+        return df.with_row_index("column")
+
+    def transform_sparse(self, X: pl.DataFrame | pl.LazyFrame, *, dtype=None):
+        """
+        Return the bin dummies of X as a SciPy CSR matrix.
+
+        Every row has exactly one non-zero per feature, so the matrix is built
+        in one pass from the (n_rows, n_features) matrix of bin ordinals: its
+        memory is proportional to rows x features, not rows x total bins as
+        with ``transform(X).to_dummies()``. Each feature has one dummy per bin
+        plus one for nulls, described by `get_dummy_columns`.
+
+        Parameters
+        ----------
+        X : pl.DataFrame | pl.LazyFrame
+            The input data, containing every fitted feature.
+        dtype : np.dtype, optional
+            Data type of the matrix values. Default is float64.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            The (n_rows, n_dummies) dummy matrix.
+
+        Raises
+        ------
+        ValueError
+            If a fitted feature is missing from X, or the binner is segmented.
+
+        Notes
+        -----
+        SciPy is imported on the first call only.
+
+        """
+        from scipy import sparse
+
+        check_is_fitted(self)
+        self._check_not_segmented()
+
+        features = list(self.breakpoints_)
+        missing = set(features) - set(X.lazy().collect_schema().names())
+        if missing:
+            msg = f"X is missing the fitted features {sorted(missing)}"
+            raise ValueError(msg)
+
+        # the null bin of each feature comes after its last bin
+        n_bins = [len(self.breakpoints_[x]) + 2 for x in features]
+        # the bin ordinals, not the physicals of `cut`, which are global ids
+        # under a string cache
+        codes = collect(
+            self._bin_index(X.lazy().select(features), features).select(
+                pl.col(x).cast(pl.Int64).fill_null(n - 1) + offset
+                for x, n, offset in zip(
+                    features, n_bins, np.cumsum([0, *n_bins[:-1]]).tolist()
+                )
+            )
+        ).to_numpy(order="c")
+
+        n_rows, n_features = codes.shape
+        return sparse.csr_matrix(
+            (
+                np.ones(codes.size, dtype=dtype or np.float64),
+                codes.ravel(),
+                np.arange(0, codes.size + 1, n_features),
+            ),
+            shape=(n_rows, sum(n_bins)),
+        )
+
+    def _bin_index(self, X: pl.LazyFrame, cols: list[str]) -> pl.LazyFrame:
+        if not cols:
+            return X
+
+        breaks = [sorted(self.breakpoints_[col]) for col in cols]
+        # a single kernel call bins all the columns, its struct output is then
+        # split back into the original columns
+        return (
+            X.with_columns(cal_bin_index(cols, breaks).alias("__bin_index"))
+            .with_columns(
+                pl.col("__bin_index").struct.field(col).cast(_index_dtype(b)).alias(col)
+                for col, b in zip(cols, breaks)
+            )
+            .drop("__bin_index")
+        )
+
+    def _segment_bin_expr(self, col: str, output: str) -> pl.Expr:
+        # every segment's breakpoints are a subset of their union, so a single
+        # search over the union followed by a gather in a (segment, fine bin)
+        # table gives each row the bin of its own segment
+        segments = list(self.breakpoints_)
+        seg_breaks = [sorted(map(float, self.breakpoints_[s][col])) for s in segments]
+        fine_breaks = sorted(set().union(*seg_breaks))
+        upper = np.append(fine_breaks, np.inf)
+
+        ordinals = [np.searchsorted(b, upper, side="left") for b in seg_breaks]
+        if output == "index":
+            dtype = _index_dtype(max(seg_breaks, key=len))
+            table = pl.Series(np.concatenate(ordinals), dtype=dtype)
+        else:
+            labels = [
+                np.array(get_bin_labels(b))[o] for b, o in zip(seg_breaks, ordinals)
+            ]
+            table = pl.Series(np.concatenate(labels), dtype=pl.String)
+
+        segment_code = (
+            pl.col(self._segment_col)
+            .cast(pl.String)
+            .cast(pl.Enum([str(s) for s in segments]), strict=False)
+            .to_physical()
+            .cast(pl.UInt32)
+        )
+        fine = pl.lit(pl.Series(fine_breaks, dtype=pl.Float64)).search_sorted(
+            pl.col(col).cast(pl.Float64), side="left"
+        )
+        expr = (
+            pl.when(pl.col(col).is_not_null())
+            .then(pl.lit(table).gather(segment_code * len(upper) + fine))
+            .alias(col)
+        )
+        return expr if output == "index" else expr.cast(pl.Categorical)
+
+    @profiled
+    def transform(self, X: pl.DataFrame | pl.LazyFrame):
         """
         Transform the input DataFrame by binning numeric columns.
 
@@ -80,35 +460,64 @@ class BinnerMixin(BaseEstimator, TransformerMixin):
 
         Parameters
         ----------
-        X : pl.DataFrame
+        X : pl.DataFrame | pl.LazyFrame
             The input DataFrame to be transformed.
 
         Returns
         -------
-        pl.DataFrame
+        pl.DataFrame | pl.LazyFrame
             A new DataFrame with the numeric columns binned according to
-            the computed breakpoints.
+            the computed breakpoints, lazy if X is a LazyFrame. Bins are
+            Categorical labels such as "(-inf, 3.5]", or UInt8/UInt16 bin
+            ordinals if `output` is "index".
 
         Raises
         ------
         NotFittedError
             If the transformer has not been fitted yet.
+        ValueError
+            If `output` is not "label" or "index".
 
         Notes
         -----
         This method only transforms columns that were present during the fit
         phase and have computed breakpoints. Other columns remain unchanged.
+        Ordinals are computed for all columns at once by a native kernel, and
+        can be mapped back to labels with `get_bin_labels`. Labels are the
+        same as those of `pl.Expr.cut`, but are built so that a lazy query
+        can run on the streaming engine, e.g. ``sink_parquet``. With a
+        `segment_col`, each row is binned with the breakpoints of its segment
+        in a single vectorized pass, rows of segments unseen during fit getting
+        a null bin.
 
         """
         check_is_fitted(self)
 
-        X_cut = X.with_columns(
-            pl.col(col).cut(self.breakpoints_[col])
-            for col in X.columns
-            if col in self.breakpoints_
-        )
+        output = getattr(self, "output", "label")
+        if output not in {"label", "index"}:
+            msg = f"output must be 'label' or 'index', got {output!r}"
+            raise ValueError(msg)
 
-        return X_cut
+        if self._segment_col is not None:
+            fitted = set().union(*self.breakpoints_.values())
+            cols = [col for col in X.lazy().collect_schema().names() if col in fitted]
+            X_cut = X.lazy().with_columns(
+                self._segment_bin_expr(col, output) for col in cols
+            )
+            return collect_like(X, X_cut)
+
+        cols = [
+            col for col in X.lazy().collect_schema().names() if col in self.breakpoints_
+        ]
+
+        if output == "index":
+            X_cut = self._bin_index(X.lazy(), cols)
+        else:
+            X_cut = X.lazy().with_columns(
+                _cut_expr(col, self.breakpoints_[col]) for col in cols
+            )
+
+        return collect_like(X, X_cut)
 
 
 class QuantileBinner(BinnerMixin):
@@ -121,16 +530,34 @@ class QuantileBinner(BinnerMixin):
 
     Parameters
     ----------
-    q : int
-        The number of quantiles to use for binning.
+    q : int | list[int]
+        The number of quantiles to use for binning. Given a list, the binnings
+        of all its values are evaluated from a single summary per column (see
+        `quantile_grid`) and each column uses the `q` with the highest IV whose
+        bins all hold at least `min_bin_share` of the rows; fit then requires y.
     allow_duplicates : bool, optional
         Whether to allow duplicate breakpoints. Default is True.
+    output : {"label", "index"}, optional
+        Whether transform returns Categorical bin labels or integer bin
+        ordinals. Default is "label".
+    min_bin_share : float, optional
+        The smallest share of rows in a bin for a `q` of a list to be chosen.
+        If no `q` qualifies, the smallest is used. Default is 0.05.
+    segment_col : str, optional
+        A column of X splitting the rows into segments, e.g. product lines.
+        The quantiles of every segment are computed by a single grouped
+        aggregation and each row is binned with those of its segment.
 
     Attributes
     ----------
     breakpoints_ : dict
         A dictionary containing the breakpoints for each numeric column,
-        calculated during the fit phase.
+        calculated during the fit phase. With a `segment_col`, a dictionary of
+        such dictionaries keyed by segment.
+    q_ : dict
+        The number of quantiles chosen for each column, if `q` is a list.
+    grid_ : pl.DataFrame
+        The evaluation of every `q` of each column, if `q` is a list.
 
     Methods
     -------
@@ -150,10 +577,23 @@ class QuantileBinner(BinnerMixin):
 
     """
 
-    def __init__(self, q: int, *, allow_duplicates: bool = True):
+    def __init__(
+        self,
+        q: int | list[int],
+        *,
+        allow_duplicates: bool = True,
+        output: str = "label",
+        min_bin_share: float = 0.05,
+        segment_col: str | None = None,
+    ):
         self.q = q
         self.allow_duplicates = allow_duplicates
+        self.output = output
+        self.min_bin_share = min_bin_share
+        self.segment_col = segment_col
 
+    @profiled
+    @cached_fit
     def fit(self, X: pl.DataFrame, y=None):
         """
         Compute the quantile breakpoints for each numeric column in the input DataFrame.
@@ -162,24 +602,71 @@ class QuantileBinner(BinnerMixin):
         ----------
         X : pl.DataFrame
             The input DataFrame containing numeric columns to be binned.
-        y : None
-            Ignored. Kept for compatibility with scikit-learn API.
+        y : pl.Series, optional
+            The binary target variable, required if `q` is a list. Otherwise
+            ignored, kept for compatibility with scikit-learn API.
 
         Returns
         -------
         self : QuantileBinner
             Returns the instance itself.
         """
-        numeric_columns = cs.expand_selector(X, cs.numeric())
+        numeric_columns = [
+            x for x in cs.expand_selector(X, cs.numeric()) if x != self.segment_col
+        ]
 
         if not numeric_columns:
             msg = "Input DataFrame contains no numeric columns"
             raise ValueError(msg)
 
-        self.breakpoints_ = X.select(
+        if not isinstance(self.q, int):
+            if y is None:
+                msg = "y is required to choose q among several values"
+                raise ValueError(msg)
+            if self.segment_col is not None:
+                msg = "q must be an int with segment_col"
+                raise ValueError(msg)
+            return self._fit_grid(collect(X.lazy()), y)
+
+        if self.segment_col is not None:
+            df_breaks = X.lazy().drop_nulls(self.segment_col).group_by(self.segment_col)
+            df_breaks = collect(
+                df_breaks.agg(
+                    get_qcut_breaks_expr(
+                        x, q=self.q, allow_duplicates=self.allow_duplicates
+                    ).explode()
+                    for x in numeric_columns
+                ).sort(self.segment_col)
+            )
+            self.breakpoints_ = {
+                row.pop(self.segment_col): row
+                for row in df_breaks.iter_rows(named=True)
+            }
+            return self
+
+        df_breaks = X.lazy().select(
             get_qcut_breaks_expr(x, q=self.q, allow_duplicates=self.allow_duplicates)
             for x in numeric_columns
-        ).row(0, named=True)
+        )
+        self.breakpoints_ = collect(df_breaks).row(0, named=True)
+
+        return self
+
+    def _fit_grid(self, X: pl.DataFrame, y: pl.Series):
+        self.grid_, breaks = _quantile_grid(X, y, self.q)
+
+        df_best = (
+            self.grid_.filter(
+                (pl.col("min_share") >= self.min_bin_share) & pl.col("iv").is_finite()
+            )
+            .sort(["iv", "q"], descending=[True, False])
+            .unique("column", keep="first")
+        )
+        self.q_ = dict.fromkeys(
+            self.grid_["column"].unique(maintain_order=True), min(self.q)
+        )
+        self.q_.update(zip(df_best["column"], df_best["q"]))
+        self.breakpoints_ = {x: breaks[x, q] for x, q in self.q_.items()}
 
         return self
 
@@ -197,6 +684,13 @@ class CustomBinner(BinnerMixin):
         A dictionary where keys are column names and values are lists of
         breakpoints for that column. Each list should contain the lower
         and upper bounds of the bins, in ascending order.
+    output : {"label", "index"}, optional
+        Whether transform returns Categorical bin labels or integer bin
+        ordinals. Default is "label".
+    segment_col : str, optional
+        A column of X splitting the rows into segments. `breakpoints` is then a
+        dictionary of such dictionaries keyed by segment, and each row is
+        binned with the breakpoints of its segment.
 
     Attributes
     ----------
@@ -222,9 +716,18 @@ class CustomBinner(BinnerMixin):
 
     """
 
-    def __init__(self, breakpoints: dict):
+    def __init__(
+        self,
+        breakpoints: dict,
+        *,
+        output: str = "label",
+        segment_col: str | None = None,
+    ):
         self.breakpoints = breakpoints
+        self.output = output
+        self.segment_col = segment_col
 
+    @profiled
     def fit(self, X: pl.DataFrame, y=None):
         """
         Validate and store the custom breakpoints.
@@ -262,3 +765,253 @@ class CustomBinner(BinnerMixin):
         # needs to add validation logic later
         self.breakpoints_ = self.breakpoints
         return self
+
+
+def _group_label(levels: list[str], max_levels: int = 5) -> str:
+    label = "|".join(levels[:max_levels])
+    if len(levels) > max_levels:
+        label += f"|+{len(levels) - max_levels}"
+    return label
+
+
+def _merge_adjacent(
+    groups: list[tuple[list[str], float, float]], n_groups: int
+) -> list[tuple[list[str], float, float]]:
+    # repeatedly merge the adjacent pair of groups, sorted by target rate, with
+    # the closest target rates; the pairs are kept in a heap keyed by their gap
+    # and the groups in a linked list, so G groups are merged in O(G log G)
+    def gap(i, j):
+        return groups[j][2] / groups[j][1] - groups[i][2] / groups[i][1]
+
+    size = len(groups)
+    nxt = list(range(1, size + 1))
+    prv = list(range(-1, size - 1))
+    # bumped whenever a group is merged, invalidating its pairs in the heap
+    version = [0] * size
+    heap = [(gap(i, i + 1), i, i + 1, 0, 0) for i in range(size - 1)]
+    heapq.heapify(heap)
+
+    while size > n_groups:
+        _, i, j, version_i, version_j = heapq.heappop(heap)
+        if version[i] != version_i or version[j] != version_j:
+            continue
+        (levels_a, n_a, bad_a), (levels_b, n_b, bad_b) = groups[i], groups[j]
+        groups[i] = (levels_a + levels_b, n_a + n_b, bad_a + bad_b)
+        groups[j] = None
+        version[i] += 1
+        version[j] += 1
+        nxt[i] = nxt[j]
+        if nxt[j] < len(groups):
+            prv[nxt[j]] = i
+        size -= 1
+        # the merged rate lies between its neighbours', so the order holds
+        if prv[i] >= 0:
+            heapq.heappush(
+                heap, (gap(prv[i], i), prv[i], i, version[prv[i]], version[i])
+            )
+        if nxt[i] < len(groups):
+            heapq.heappush(
+                heap, (gap(i, nxt[i]), i, nxt[i], version[i], version[nxt[i]])
+            )
+
+    return [group for group in groups if group is not None]
+
+
+def _merge_levels(
+    df_counts: pl.DataFrame, min_count: float, max_groups: int, other_label: str
+) -> pl.DataFrame:
+    # (levels, count, bad) per group, rare levels pooled into one group
+    is_rare = pl.col("n") < min_count
+    groups = [
+        ([level], n, bad) for level, n, bad in df_counts.filter(~is_rare).iter_rows()
+    ]
+    df_rare = df_counts.filter(is_rare)
+    if df_rare.height:
+        groups.append(([other_label], df_rare["n"].sum(), df_rare["bad"].sum()))
+
+    groups.sort(key=lambda g: g[2] / g[1])
+    groups = _merge_adjacent(groups, max(max_groups, 1))
+
+    labels = [_group_label(levels) for levels, _, _ in groups]
+    mapping = [
+        (level, label)
+        for (levels, _, _), label in zip(groups, labels)
+        for level in levels
+    ]
+
+    return pl.DataFrame(
+        mapping,
+        schema={"level": pl.String, "group": pl.Enum(labels)},
+        orient="row",
+    )
+
+
+class CategoryBinner(BaseEstimator, TransformerMixin):
+    """
+    A binner that groups the levels of high-cardinality categorical columns.
+
+    Levels seen in fewer than `min_frequency` rows are pooled into a single
+    "other" group, then groups are sorted by target rate and the adjacent pair
+    with the closest target rates is merged until at most `max_groups` remain.
+    Only the frequent levels are stored, so the fitted mapping stays small even
+    for features with hundreds of thousands of levels, e.g. merchant, employer
+    or postcode.
+
+    Parameters
+    ----------
+    min_frequency : int | float, optional
+        Levels with fewer rows are pooled into the "other" group. A float below
+        1 is a share of the non-null rows. Default is 0.01.
+    max_groups : int, optional
+        Maximum number of groups per column. Default is 10.
+    other_label : str, optional
+        Label of the pooled rare levels, also used for levels unseen during fit.
+        Default is "__other__".
+
+    Attributes
+    ----------
+    mapping_ : dict
+        A dictionary mapping each String or Categorical column to a DataFrame of
+        its frequent levels ('level') and their group ('group'), an Enum whose
+        categories are ordered by increasing target rate. The pooled rare levels
+        are listed under `other_label`, and levels absent from the mapping
+        belong to its group.
+
+    Methods
+    -------
+    fit(X, y)
+        Compute the groups of each String or Categorical column of X.
+    transform(X)
+        Replace the levels in X by their group.
+
+    Examples
+    --------
+    >>> import polars as pl
+    >>> from polars_credit.bin import CategoryBinner
+    >>> df = pl.DataFrame({"merchant": ["a", "b", "a", "c", "d", "a"]})
+    >>> y = pl.Series("y", [0, 1, 0, 1, 0, 0])
+    >>> binner = CategoryBinner(min_frequency=2, max_groups=2)
+    >>> binner.fit(df, y)
+    >>> binned_df = binner.transform(df)
+
+    """
+
+    def __init__(
+        self,
+        min_frequency: float = 0.01,
+        max_groups: int = 10,
+        *,
+        other_label: str = "__other__",
+    ):
+        self.min_frequency = min_frequency
+        self.max_groups = max_groups
+        self.other_label = other_label
+
+    @profiled
+    @cached_fit
+    def fit(self, X: pl.DataFrame, y: pl.Series):
+        """
+        Compute the groups of each String or Categorical column.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The input DataFrame containing the categorical columns to be grouped.
+        y : pl.Series
+            The binary target variable.
+
+        Returns
+        -------
+        self : CategoryBinner
+            Returns the instance itself.
+
+        Raises
+        ------
+        ValueError
+            If X contains no String or Categorical column.
+
+        """
+        cat_columns = cs.expand_selector(X, cs.string() | cs.categorical())
+
+        if not cat_columns:
+            msg = "Input DataFrame contains no String or Categorical columns"
+            raise ValueError(msg)
+
+        df = X.with_columns(y).lazy()
+        ls_counts = collect_all(
+            df.group_by(pl.col(x).cast(pl.String).alias("level"))
+            .agg(pl.len().alias("n"), pl.col(y.name).sum().alias("bad"))
+            .drop_nulls("level")
+            .sort("level")
+            for x in cat_columns
+        )
+
+        self.mapping_ = {}
+        for x, df_counts in zip(cat_columns, ls_counts):
+            min_count = self.min_frequency
+            if isinstance(min_count, float) and min_count < 1:
+                min_count *= df_counts["n"].sum()
+            self.mapping_[x] = _merge_levels(
+                df_counts, min_count, self.max_groups, self.other_label
+            )
+
+        return self
+
+    @profiled
+    def transform(self, X: pl.DataFrame | pl.LazyFrame):
+        """
+        Replace the levels of the fitted columns by their group.
+
+        Each value is cast to an Enum of the frequent levels, whose physical
+        codes index the array of groups directly, so no hash lookup is needed.
+
+        Parameters
+        ----------
+        X : pl.DataFrame | pl.LazyFrame
+            The input DataFrame to be transformed.
+
+        Returns
+        -------
+        pl.DataFrame | pl.LazyFrame
+            A new DataFrame with the fitted columns replaced by Enum groups, lazy
+            if X is a LazyFrame. Nulls remain null, and levels absent from the
+            mapping fall into the `other_label` group, or null if no level was
+            pooled during fit.
+
+        Raises
+        ------
+        NotFittedError
+            If the transformer has not been fitted yet.
+
+        """
+        check_is_fitted(self)
+
+        X_grouped = X.lazy().with_columns(
+            self._group_expr(x)
+            for x in X.lazy().collect_schema().names()
+            if x in self.mapping_
+        )
+
+        return collect_like(X, X_grouped)
+
+    def _group_expr(self, x: str) -> pl.Expr:
+        mapping = self.mapping_[x]
+        dtype = mapping["group"].dtype
+        code = (
+            pl.col(x)
+            .cast(pl.String)
+            .cast(pl.Enum(mapping["level"]), strict=False)
+            .to_physical()
+        )
+        # the pooled rare levels appear in the mapping under `other_label`
+        other = mapping.filter(pl.col("level") == self.other_label)["group"]
+        other = other.item() if other.len() else None
+
+        return (
+            pl.when(pl.col(x).is_null())
+            .then(pl.lit(None, dtype=dtype))
+            .when(code.is_null())
+            .then(pl.lit(other, dtype=dtype))
+            .otherwise(pl.lit(mapping["group"]).gather(code))
+            .alias(x)
+        )
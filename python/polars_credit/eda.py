@@ -1,6 +1,51 @@
+from __future__ import annotations
+
 import polars as pl
 
 from polars_credit import cal_iv
+from polars_credit.util.cache import get_count_tables
+
+
+def _iv_from_counts(table: pl.DataFrame, x: str, y: str) -> float:
+    # same definition as the pl_iv plugin
+    return (
+        table.group_by(x)
+        .agg(
+            pl.col("n").filter(pl.col(y).eq(0)).sum().alias("good"),
+            pl.col("n").filter(pl.col(y).eq(1)).sum().alias("bad"),
+        )
+        .select(pl.col("good", "bad") / pl.col("good", "bad").sum())
+        .select(
+            (
+                (pl.col("bad") - pl.col("good"))
+                * (pl.col("bad") / pl.col("good")).log()
+            ).sum()
+        )
+        .item()
+    )
+
+
+_PERIOD_METRICS = (
+    "null_count",
+    "null_ratio",
+    "identical_ratio",
+    "n_unique",
+    "mean",
+    "iv",
+)
+
+
+def _period_metric(x: str, dtype: pl.DataType, metric: str, y: str | None) -> pl.Expr:
+    col = pl.col(x)
+    if metric == "iv":
+        return cal_iv(col, y).cast(pl.Float64)
+    if metric == "mean":
+        if not (dtype.is_numeric() or dtype == pl.Boolean):
+            return pl.lit(None, dtype=pl.Float64)
+        return col.eda.mean().cast(pl.Float64)
+    if metric in {"null_count", "n_unique"}:
+        return getattr(col.eda, metric)().cast(pl.UInt32)
+    return getattr(col.eda, metric)().cast(pl.Float64)
 
 
 def _eda_long_format(df, operation, *args, **kwargs):
@@ -27,6 +72,10 @@ class EdaExpr:
         """Return the number of unique values in the expression."""
         return self._expr.n_unique()
 
+    def mean(self) -> pl.Expr:
+        """Return the mean of the expression."""
+        return self._expr.mean()
+
     def identical_ratio(self, *, ignore_nulls: bool = True) -> pl.Expr:
         """Return the ratio of identical values in the expression."""
         expr_mode = self._expr.drop_nulls().mode().first()
@@ -67,5 +116,94 @@ class EdaFrame:
         return _eda_long_format(self._df, "n_unique")
 
     def iv(self, y: str) -> pl.DataFrame:
-        """Return a DataFrame with the information value for each column."""
-        return _eda_long_format(self._df, "iv", y=y)
+        """
+        Return a DataFrame with the information value for each column.
+
+        The contingency tables are shared with the other consumers of an active
+        `util.cache.ContingencyCache`.
+        """
+        xs = [x for x in self._df.columns if x != y]
+        tables = get_count_tables(self._df, y, xs)
+        if tables is None:
+            return _eda_long_format(self._df, "iv", y=y)
+
+        return pl.DataFrame(
+            {
+                "var": xs,
+                "iv": [_iv_from_counts(t, x, y) for x, t in zip(xs, tables)],
+            },
+            schema={"var": pl.String, "iv": pl.Float64},
+        )
+
+    def by_period(
+        self,
+        t: str,
+        metrics: list[str] | None = None,
+        *,
+        y: str | None = None,
+    ) -> pl.DataFrame:
+        """
+        Return the metrics of every column in each period.
+
+        All the metrics of all the columns are aggregated by a single lazy
+        ``group_by(t)`` query, instead of one query per period and metric.
+
+        Parameters
+        ----------
+        t : str
+            The period column, e.g. the month of application.
+        metrics : list[str], optional
+            The metrics among "null_count", "null_ratio", "identical_ratio",
+            "n_unique", "mean" and "iv". Default is all of them but "iv" if
+            `y` is None, and all of them otherwise.
+        y : str, optional
+            The binary target column, required by the metric "iv".
+
+        Returns
+        -------
+        pl.DataFrame
+            The columns t, 'var' and one column per metric, one row per period
+            and column, sorted by period. The mean of a non-numeric column is
+            null.
+
+        Raises
+        ------
+        ValueError
+            If a metric is unknown, or "iv" is requested without `y`.
+
+        Examples
+        --------
+        >>> df.eda.by_period("month", ["null_ratio", "iv"], y="default")
+
+        """
+        if metrics is None:
+            metrics = [m for m in _PERIOD_METRICS if m != "iv" or y is not None]
+        unknown = [m for m in metrics if m not in _PERIOD_METRICS]
+        if unknown:
+            msg = f"unknown metrics {unknown}, expected some of {list(_PERIOD_METRICS)}"
+            raise ValueError(msg)
+        if "iv" in metrics and y is None:
+            msg = "the metric 'iv' requires y"
+            raise ValueError(msg)
+
+        schema = self._df.collect_schema()
+        xs = [x for x in schema.names() if x not in {t, y}]
+
+        # one struct of metrics per column, so that all columns share a dtype
+        df_metrics = (
+            self._df.lazy()
+            .group_by(t)
+            .agg(
+                pl.struct(
+                    _period_metric(x, schema[x], m, y).alias(m) for m in metrics
+                ).alias(x)
+                for x in xs
+            )
+            .collect()
+        )
+
+        return (
+            df_metrics.unpivot(xs, index=t, variable_name="var", value_name="__metrics")
+            .unnest("__metrics")
+            .sort(t, maintain_order=True)
+        )
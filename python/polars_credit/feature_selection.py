@@ -1,8 +1,82 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import polars as pl
 from sklearn.base import BaseEstimator
 
 from polars_credit.base import PolarSelectorMixin
+from polars_credit.util.cache import cached_fit
 from polars_credit.util.divergence import cal_iv, cal_psi
+from polars_credit.util.logistic import (
+    design_matrix,
+    independent_columns,
+    irls,
+    score_test,
+)
+from polars_credit.util.profile import collect, collect_all, profiled
+
+
+def _below_everywhere(df: pl.DataFrame, value: str, threshold: float) -> list[str]:
+    # the features at or below the threshold in every segment, if any
+    return (
+        df.group_by("var", maintain_order=True)
+        .agg((pl.col(value) <= threshold).all().alias("drop"))
+        .filter("drop")["var"]
+        .to_list()
+    )
+
+
+def _stratified_sample(
+    df: pl.DataFrame, y: str, size: int, seed: int | None
+) -> pl.DataFrame:
+    # the same fraction of every class, so that the bad rate is kept
+    fraction = size / df.height
+    return df.filter(
+        pl.int_range(pl.len()).shuffle(seed).over(y)
+        < (pl.len().over(y) * fraction).ceil()
+    )
+
+
+def _iv_of_counts(bad: np.ndarray, good: np.ndarray) -> np.ndarray:
+    # IV of the bin counts along the last axis, empty bins having no term
+    bad_share = bad / bad.sum(axis=-1, keepdims=True)
+    good_share = good / good.sum(axis=-1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = (bad_share - good_share) * np.log(bad_share / good_share)
+    terms[(bad == 0) & (good == 0)] = 0.0
+    return terms.sum(axis=-1)
+
+
+def _bootstrap_iv(
+    bad: np.ndarray,
+    good: np.ndarray,
+    n_bootstrap: int,
+    rng: np.random.Generator,
+    block_size: int = 1024,
+) -> np.ndarray:
+    # resampling the rows within each class draws multinomial bin counts, so
+    # the replicates come from the contingency table without touching the rows;
+    # they are drawn by blocks to bound the memory of features with many bins
+    n_bad, n_good = bad.sum(), good.sum()
+    replicates = []
+    for start in range(0, n_bootstrap, block_size):
+        size = min(block_size, n_bootstrap - start)
+        bad_boot = rng.multinomial(n_bad, bad / n_bad, size=size)
+        good_boot = rng.multinomial(n_good, good / n_good, size=size)
+        replicates.append(_iv_of_counts(bad_boot, good_boot))
+    return np.concatenate(replicates)
+
+
+# replicates expected beyond each end of a screening interval, so that its
+# ends are quantiles rather than the extremes of the replicates
+_TAIL_REPLICATES = 10
+
+
+def _min_bootstrap(confidence: float) -> int:
+    # rounded first, so that e.g. 0.9 asks for 200 rather than 201 replicates
+    return int(np.ceil(round(2 * _TAIL_REPLICATES / (1 - confidence), 6)))
 
 
 class NullRatioThreshold(PolarSelectorMixin, BaseEstimator):
@@ -60,9 +134,13 @@ class NullRatioThreshold(PolarSelectorMixin, BaseEstimator):
     def __init__(self, threshold: float = 0.95):
         self.threshold = threshold
 
+    @profiled
+    @cached_fit
     def fit(self, X: pl.DataFrame, y=None):
         """Fit the null ratio threshold."""
-        X_null_ratio_above_tr = (X.null_count() / X.height) >= self.threshold
+        X_null_ratio_above_tr = collect(
+            X.lazy().select(pl.all().null_count() / pl.len() >= self.threshold)
+        )
 
         self.cols_to_drop_ = [col.name for col in X_null_ratio_above_tr if col.item()]
 
@@ -125,6 +203,8 @@ class IdenticalRatioThreshold(PolarSelectorMixin, BaseEstimator):
         self.threshold = threshold
         self.ignore_nulls = ignore_nulls
 
+    @profiled
+    @cached_fit
     def fit(self, X: pl.DataFrame, y=None):
         """Fit the identical ratio threshold."""
         expr_mode = pl.all().drop_nulls().mode().first()
@@ -134,7 +214,7 @@ class IdenticalRatioThreshold(PolarSelectorMixin, BaseEstimator):
         else:
             expr = pl.all().eq_missing(expr_mode)
 
-        X_mode_ratio_above_tr = X.select(expr.mean() >= self.threshold)
+        X_mode_ratio_above_tr = collect(X.lazy().select(expr.mean() >= self.threshold))
 
         self.cols_to_drop_ = [col.name for col in X_mode_ratio_above_tr if col.item()]
 
@@ -154,11 +234,46 @@ class IVThreshold(PolarSelectorMixin, BaseEstimator):
     threshold : float, optional (default=0.02)
         The threshold for Information Value. Features with IV less than or equal to
         this threshold will be removed.
+    segment_col : str, optional
+        A column of X splitting the rows into segments. The IV of every segment
+        is computed in one grouped aggregation, and a feature is removed only if
+        its IV is below the threshold in every segment. The column is kept.
+    sample_size : int, optional
+        Screen the features on a stratified sample of about this many rows
+        first. The IV of each feature on the sample comes with a bootstrap
+        confidence interval: features whose interval lies above the threshold
+        are kept, those whose interval lies at or below it are dropped, and
+        only the others have their IV computed on all the rows. Default is to
+        compute the IV of every feature on all the rows.
+    confidence : float, optional
+        The confidence level of the screening intervals. A feature is decided
+        otherwise on the sample than on all the rows only if its IV lies
+        beyond the end of its interval on the side of the decision, which
+        happens with probability about ``(1 - confidence) / 2``: out of 1,000
+        features screened at the default level, about 0.5 are expected to be
+        wrongly kept or dropped. The bootstrap intervals are approximate, and
+        least accurate for the features with almost no signal, whose IV is
+        close to zero. Default is 0.999.
+    n_bootstrap : int, optional
+        The number of bootstrap replicates of the screening. Default is enough
+        replicates for 10 of them to be expected beyond each end of the
+        intervals, i.e. ``20 / (1 - confidence)``, 20,000 at the default
+        level, which is also the fewest accepted.
+    seed : int, optional
+        The seed of the sample and of the bootstrap.
 
     Attributes
     ----------
     cols_to_drop_ : list
         A list of column names identified for removal during the fit phase.
+    iv_ : pl.DataFrame
+        The IV of each feature, in each segment with a `segment_col`, and for
+        each target (in long format) if fitted on several. With a
+        `sample_size`, the IV of the features decided on the sample is their
+        IV on the sample.
+    screening_ : pl.DataFrame
+        Only with a `sample_size`: the columns 'var', 'iv_sample', 'lower',
+        'upper' and 'decision' ("keep", "drop" or "full"), one row per feature.
 
     Methods
     -------
@@ -185,15 +300,139 @@ class IVThreshold(PolarSelectorMixin, BaseEstimator):
     ['A', 'C']
     """
 
-    def __init__(self, threshold: float = 0.02):
+    def __init__(
+        self,
+        threshold: float = 0.02,
+        *,
+        segment_col: str | None = None,
+        sample_size: int | None = None,
+        confidence: float = 0.999,
+        n_bootstrap: int | None = None,
+        seed: int | None = None,
+    ):
         self.threshold = threshold
+        self.segment_col = segment_col
+        self.sample_size = sample_size
+        self.confidence = confidence
+        self.n_bootstrap = n_bootstrap
+        self.seed = seed
+
+    def _screen(self, X: pl.DataFrame, y: pl.Series) -> pl.DataFrame:
+        df_sample = _stratified_sample(
+            X.with_columns(y), y.name, self.sample_size, self.seed
+        )
+        tables = collect_all(
+            [
+                df_sample.lazy()
+                .group_by(x)
+                .agg(
+                    pl.col(y.name).eq(1).sum().alias("bad"),
+                    pl.col(y.name).eq(0).sum().alias("good"),
+                )
+                for x in X.columns
+            ]
+        )
+
+        rng = np.random.default_rng(self.seed)
+        alpha = 1 - self.confidence
+        n_bootstrap = self.n_bootstrap
+        if n_bootstrap is None:
+            n_bootstrap = _min_bootstrap(self.confidence)
+        rows = []
+        for x, table in zip(X.columns, tables):
+            bad, good = table["bad"].to_numpy(), table["good"].to_numpy()
+            iv = float(_iv_of_counts(bad, good))
+            replicates = _bootstrap_iv(bad, good, n_bootstrap, rng)
+            if not np.isfinite(replicates).all():
+                # a bin without goods or bads, left to the full data
+                rows.append((x, iv, -np.inf, np.inf))
+                continue
+            # basic bootstrap interval, which corrects the upward bias of the
+            # IV of a sample
+            q_low, q_high = np.quantile(replicates, [alpha / 2, 1 - alpha / 2])
+            rows.append((x, iv, 2 * iv - q_high, 2 * iv - q_low))
+
+        return pl.DataFrame(
+            rows, schema=["var", "iv_sample", "lower", "upper"], orient="row"
+        ).with_columns(
+            pl.when(pl.col("lower") > self.threshold)
+            .then(pl.lit("keep"))
+            .when(pl.col("upper") <= self.threshold)
+            .then(pl.lit("drop"))
+            .otherwise(pl.lit("full"))
+            .alias("decision")
+        )
+
+    def _fit_screened(self, X: pl.DataFrame, y: pl.Series):
+        if self.segment_col is not None or isinstance(y, pl.DataFrame):
+            msg = "sample_size is not supported with segment_col or several targets"
+            raise ValueError(msg)
+        if not 0 < self.confidence < 1:
+            msg = f"confidence must be in (0, 1), got {self.confidence}"
+            raise ValueError(msg)
+        n_min = _min_bootstrap(self.confidence)
+        if self.n_bootstrap is not None and self.n_bootstrap < n_min:
+            msg = (
+                f"n_bootstrap={self.n_bootstrap} is too few for confidence="
+                f"{self.confidence}: the interval ends would be the extremes of "
+                f"the replicates, use at least {n_min}"
+            )
+            raise ValueError(msg)
 
-    def fit(self, X: pl.DataFrame, y: pl.Series):
-        """Fit the IV threshold."""
-        self.iv_ = X.with_columns(y).pipe(cal_iv, y.name)
+        self.screening_ = self._screen(X, y)
+        full = self.screening_.filter(pl.col("decision") == "full")["var"].to_list()
+        if full:
+            df_full = X.select(full).with_columns(y).pipe(cal_iv, y.name)
+        else:
+            # every feature was decided on the sample
+            df_full = pl.DataFrame(schema={"var": pl.String, "iv": pl.Float64})
+        self.iv_ = self.screening_.join(df_full, on="var", how="left").select(
+            "var", pl.coalesce("iv", "iv_sample").alias("iv")
+        )
+        decision = self.screening_["decision"]
+        drop = (decision == "drop") | (
+            (decision == "full") & (self.iv_["iv"] <= self.threshold)
+        )
+        self.cols_to_drop_ = self.iv_.filter(drop)["var"].to_list()
 
-        df_iv_filter = self.iv_.filter(pl.col("iv") <= self.threshold)
-        self.cols_to_drop_ = df_iv_filter["var"].to_list()
+        return self
+
+    @profiled
+    @cached_fit
+    def fit(self, X: pl.DataFrame, y: pl.Series | pl.DataFrame):
+        """
+        Fit the IV threshold.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The input features.
+        y : pl.Series | pl.DataFrame
+            The binary target, or a DataFrame of several binary targets, e.g.
+            alternative bad definitions. With several targets, the IVs of all
+            of them are computed in one aggregation per feature and a feature
+            is removed only if its IV is below the threshold for every target.
+
+        Returns
+        -------
+        self : IVThreshold
+            Returns the instance itself.
+
+        Raises
+        ------
+        ValueError
+            If `sample_size` is given with a `segment_col` or several targets,
+            or with too few `n_bootstrap` replicates for the `confidence`.
+
+        """
+        if self.sample_size is not None and self.sample_size < X.height:
+            return self._fit_screened(X, y)
+
+        if isinstance(y, pl.DataFrame):
+            self.iv_ = X.with_columns(y).pipe(cal_iv, y.columns, by=self.segment_col)
+        else:
+            self.iv_ = X.with_columns(y).pipe(cal_iv, y.name, by=self.segment_col)
+        self.cols_to_drop_ = _below_everywhere(self.iv_, "iv", self.threshold)
 
         return self
 
@@ -211,13 +450,18 @@ class PSIThreshold(PolarSelectorMixin, BaseEstimator):
     threshold : float, optional (default=0.1)
         The threshold for Population Stability Index. Features with PSI less than or
         equal to this threshold will be removed.
+    segment_col : str, optional
+        A column of X splitting the rows into segments. The PSI of every segment
+        is computed in one grouped aggregation, and a feature is removed only if
+        its PSI is below the threshold in every segment. The column is kept.
 
     Attributes
     ----------
     cols_to_drop_ : list
         A list of column names identified for removal during the fit phase.
     psi_ : pl.DataFrame
-        A DataFrame containing the PSI values for each feature.
+        A DataFrame containing the PSI values for each feature, in each segment
+        with a `segment_col`.
 
     Methods
     -------
@@ -244,17 +488,343 @@ class PSIThreshold(PolarSelectorMixin, BaseEstimator):
     ['A', 'C']
     """
 
-    def __init__(self, threshold: float = 0.1):
+    def __init__(self, threshold: float = 0.1, *, segment_col: str | None = None):
         self.threshold = threshold
+        self.segment_col = segment_col
 
+    @profiled
+    @cached_fit
     def fit(self, X: pl.DataFrame, y: pl.Series = None, t: pl.Series = None):
         """Fit the PSI threshold."""
         if t is None:
             msg = "t must be provided"
             raise ValueError(msg)
 
-        self.psi_ = X.with_columns(t).pipe(cal_psi, t.name)
+        self.psi_ = X.with_columns(t).pipe(cal_psi, t.name, by=self.segment_col)
+        self.cols_to_drop_ = _below_everywhere(self.psi_, "psi", self.threshold)
+        return self
+
+
+class StepwiseSelector(PolarSelectorMixin, BaseEstimator):
+    """
+    Forward/backward stepwise selection of logistic regression features.
+
+    The features, typically WOE values, are copied once into a single float32
+    design matrix. At each forward step, the candidates are ranked by a score
+    test computed for all of them in a single pass, and only the best
+    `n_candidates` are refitted, in parallel threads, each fit being
+    warm-started from the coefficients of the current model. Backward steps
+    drop the least significant feature (or the one improving the criterion
+    most), also from warm-started fits of the `n_candidates` features with the
+    smallest Wald statistics.
+
+    Candidates collinear with the current model cannot be fitted and are
+    skipped, and the full model of backward selection leaves out the columns
+    collinear with the previous ones. With a `sign` constraint, backward
+    selection first removes the wrongly signed features of the full model.
+
+    Parameters
+    ----------
+    direction : {"forward", "backward", "both"}, optional
+        "forward" starts from the intercept and only adds features, "backward"
+        starts from all the features and only removes them, "both" adds
+        features and then removes those that are no longer significant.
+        Default is "both".
+    criterion : {"pvalue", "aic", "bic"}, optional
+        A feature enters when its Wald p-value is below `p_enter` ("pvalue") or
+        when it lowers the AIC or BIC, and leaves when its p-value is above
+        `p_remove` or when removing it lowers the AIC or BIC. Default is
+        "pvalue".
+    p_enter : float, optional
+        Maximum p-value of an entering feature. Default is 0.05.
+    p_remove : float, optional
+        Minimum p-value of a removed feature. Default is 0.1.
+    sign : {"positive", "negative"}, optional
+        Required sign of every coefficient. With WOE = ln(%bad / %good) and a
+        target of 1 for bad, coefficients are expected to be positive. Models
+        breaking the constraint are rejected. Default is no constraint.
+    max_features : int, optional
+        Maximum number of selected features. Default is no limit.
+    n_candidates : int, optional
+        Number of best scoring candidates refitted at each forward step, and of
+        least significant features refitted at each backward step. Default is 5.
+    n_jobs : int, optional
+        Number of threads fitting candidates. Default is chosen by
+        `concurrent.futures.ThreadPoolExecutor`.
+    max_iter : int, optional
+        Maximum number of IRLS iterations per fit. Default is 50.
+
+    Attributes
+    ----------
+    selected_features_ : list[str]
+        The selected features, in order of entry.
+    coef_ : np.ndarray
+        The (1, n_selected) coefficients of the final model.
+    intercept_ : np.ndarray
+        The (1,) intercept of the final model.
+    steps_ : pl.DataFrame
+        One row per step with the action ("add" or "remove"), the feature, and
+        the p-value, AIC and BIC of the resulting model.
+    cols_to_drop_ : list
+        The features that were not selected.
+
+    Methods
+    -------
+    fit(X, y, sample_weight=None)
+        Select the features.
+    transform(X)
+        Remove the features that were not selected.
+    get_cols_to_drop()
+        Return the list of columns identified for removal.
+
+    Examples
+    --------
+    >>> from polars_credit.feature_selection import StepwiseSelector
+    >>> selector = StepwiseSelector(criterion="bic", sign="positive")
+    >>> selector.fit(X_woe, y)
+    >>> selector.selected_features_
+
+    """
+
+    def __init__(
+        self,
+        direction: str = "both",
+        criterion: str = "pvalue",
+        *,
+        p_enter: float = 0.05,
+        p_remove: float = 0.1,
+        sign: str | None = None,
+        max_features: int | None = None,
+        n_candidates: int = 5,
+        n_jobs: int | None = None,
+        max_iter: int = 50,
+    ):
+        self.direction = direction
+        self.criterion = criterion
+        self.p_enter = p_enter
+        self.p_remove = p_remove
+        self.sign = sign
+        self.max_features = max_features
+        self.n_candidates = n_candidates
+        self.n_jobs = n_jobs
+        self.max_iter = max_iter
+
+    def _check_params(self):
+        if self.direction not in {"forward", "backward", "both"}:
+            msg = (
+                "direction must be 'forward', 'backward' or 'both', "
+                f"got {self.direction!r}"
+            )
+            raise ValueError(msg)
+        if self.criterion not in {"pvalue", "aic", "bic"}:
+            msg = f"criterion must be 'pvalue', 'aic' or 'bic', got {self.criterion!r}"
+            raise ValueError(msg)
+        if self.sign not in {None, "positive", "negative"}:
+            msg = f"sign must be None, 'positive' or 'negative', got {self.sign!r}"
+            raise ValueError(msg)
+
+    def _fit(self, cols, coef):
+        # a candidate collinear with the model cannot be fitted, it is skipped
+        try:
+            return irls(
+                self._A,
+                self._y,
+                cols,
+                weights=self._weights,
+                coef=coef,
+                max_iter=self.max_iter,
+            )
+        except np.linalg.LinAlgError:
+            return None
+
+    def _fit_required(self, cols, coef):
+        # the starting models and those of the sign constraint cannot be
+        # skipped: a failed warm start is retried cold, then fit fails
+        fit = self._fit(cols, coef)
+        if fit is None and coef is not None:
+            fit = self._fit(cols, None)
+        if fit is None:
+            msg = "the logistic regression is singular and cannot be fitted"
+            raise ValueError(msg)
+        return fit
+
+    def _valid_sign(self, fit) -> bool:
+        coef = fit.coef[1:]
+        if self.sign == "positive":
+            return bool(np.all(coef >= 0))
+        if self.sign == "negative":
+            return bool(np.all(coef <= 0))
+        return True
+
+    def _improves(self, new, current, *, add: bool) -> bool:
+        if self.criterion == "pvalue":
+            if add:
+                return new.pvalues[-1] < self.p_enter
+            return True
+        return getattr(new, self.criterion) < getattr(current, self.criterion)
+
+    def _acceptable(self, fit, current, visited, *, add: bool) -> bool:
+        return (
+            fit is not None
+            and frozenset(fit.cols) not in visited
+            and self._valid_sign(fit)
+            and self._improves(fit, current, add=add)
+        )
+
+    def _forward_step(self, current, pool, visited):
+        candidates = [j for j in range(1, self._A.shape[1]) if j not in current.cols]
+        if not candidates:
+            return None
+
+        stat = score_test(self._A, self._y, current, candidates, weights=self._weights)
+        best = np.argsort(-stat)[: self.n_candidates]
+        fits = pool.map(
+            lambda j: self._fit([*current.cols, j], [*current.coef, 0.0]),
+            [candidates[i] for i in best],
+        )
+        # models already visited are skipped for the next best candidates
+        fits = [
+            fit for fit in fits if self._acceptable(fit, current, visited, add=True)
+        ]
+        if not fits:
+            return None
+        if self.criterion == "pvalue":
+            return min(fits, key=lambda fit: fit.pvalues[-1])
+        return min(fits, key=lambda fit: getattr(fit, self.criterion))
+
+    def _backward_step(self, current, pool, visited):
+        if len(current.cols) <= 1:
+            return None, None
+
+        if self.criterion == "pvalue":
+            i = int(np.argmax(current.pvalues[1:])) + 1
+            if current.pvalues[i] <= self.p_remove:
+                return None, None
+            drops = [i]
+        else:
+            # the Wald statistics rank the features like the score test ranks
+            # the candidates, only the least significant ones are refitted
+            wald = (current.coef[1:] / current.bse[1:]) ** 2
+            drops = np.argsort(wald)[: self.n_candidates] + 1
+
+        fits = pool.map(
+            lambda i: self._fit(np.delete(current.cols, i), np.delete(current.coef, i)),
+            drops,
+        )
+        fits = [
+            (current.cols[i], fit)
+            for i, fit in zip(drops, fits)
+            if self._acceptable(fit, current, visited, add=False)
+        ]
+        if not fits:
+            return None, None
+        if self.criterion == "pvalue":
+            return fits[0]
+        return min(fits, key=lambda item: getattr(item[1], self.criterion))
+
+    def _select(self, features: list[str]):
+        max_features = self.max_features or len(features)
+
+        steps = []
+        if self.direction == "backward":
+            # collinear columns are left out of the full model, which then
+            # loses its wrongly signed features, least significant first
+            cols = independent_columns(self._A, np.arange(len(features) + 1))
+            current = self._fit_required(cols, None)
+            while not self._valid_sign(current):
+                coef = current.coef[1:]
+                wrong = coef < 0 if self.sign == "positive" else coef > 0
+                i = int(np.argmax(np.where(wrong, current.pvalues[1:], -1.0))) + 1
+                col = current.cols[i]
+                current = self._fit_required(
+                    np.delete(current.cols, i), np.delete(current.coef, i)
+                )
+                steps.append(("remove", features[col - 1], current))
+        else:
+            current = self._fit_required([0], None)
+
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as pool:
+            # a model is never visited twice, which rules out add/remove cycles
+            visited = {frozenset(current.cols)}
+            while True:
+                changed = False
+
+                if self.direction != "backward" and len(current.cols) <= max_features:
+                    fit = self._forward_step(current, pool, visited)
+                    if fit is not None:
+                        current, changed = fit, True
+                        visited.add(frozenset(fit.cols))
+                        steps.append(("add", features[fit.cols[-1] - 1], current))
+
+                if self.direction != "forward":
+                    col, fit = self._backward_step(current, pool, visited)
+                    if fit is not None:
+                        current, changed = fit, True
+                        visited.add(frozenset(fit.cols))
+                        steps.append(("remove", features[col - 1], current))
+
+                if not changed:
+                    break
+
+        return current, steps
+
+    @profiled
+    def fit(self, X: pl.DataFrame, y: pl.Series, sample_weight=None):
+        """
+        Select the features by stepwise logistic regression.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The numeric features, e.g. WOE values. Nulls count as 0.
+        y : pl.Series
+            The binary target variable.
+        sample_weight : array-like, optional
+            The weight of each row.
+
+        Returns
+        -------
+        self : StepwiseSelector
+            Returns the instance itself.
+
+        Raises
+        ------
+        ValueError
+            If `direction`, `criterion` or `sign` is not valid, or if the
+            starting model or a model of the sign constraint is singular.
+
+        """
+        self._check_params()
+
+        features = X.columns
+        self._A = design_matrix(X)
+        self._y = y.cast(pl.Float64).to_numpy()
+        self._weights = (
+            None if sample_weight is None else np.asarray(sample_weight, np.float64)
+        )
+        try:
+            current, steps = self._select(features)
+        finally:
+            del self._A, self._y, self._weights
+
+        self.selected_features_ = [features[j - 1] for j in current.cols[1:]]
+        self.coef_ = current.coef[1:].reshape(1, -1)
+        self.intercept_ = current.coef[:1]
+        self.steps_ = pl.DataFrame(
+            [
+                (
+                    i,
+                    action,
+                    feature,
+                    fit.pvalues[-1] if action == "add" else None,
+                    fit.aic,
+                    fit.bic,
+                )
+                for i, (action, feature, fit) in enumerate(steps, start=1)
+            ],
+            schema=["step", "action", "feature", "pvalue", "aic", "bic"],
+            orient="row",
+        )
+        self.cols_to_drop_ = [x for x in features if x not in self.selected_features_]
 
-        df_psi_filter = self.psi_.filter(pl.col("psi") <= self.threshold)
-        self.cols_to_drop_ = df_psi_filter["var"].to_list()
         return self
@@ -1,8 +1,62 @@
+from __future__ import annotations
+
+import math
+
 import polars as pl
-from sklearn.base import BaseEstimator, TransformerMixin
+import polars.selectors as cs
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+
+from polars_credit import cal_bin_index
+from polars_credit.bin import QuantileBinner
+from polars_credit.util.cache import cached_fit
+from polars_credit.util.profile import collect, collect_like, profiled
+
+
+class ImputerMixin(TransformerMixin, BaseEstimator):
+    """
+    Base class for imputers in polars_credit.
+
+    Subclasses compute the `fill_value_dict_` attribute during fit, a dictionary
+    of column names and the value used to fill their missing values.
+
+    Methods
+    -------
+    transform(X)
+        Impute missing values in the input DataFrame using the fitted values.
+    """
+
+    @profiled
+    def transform(self, X: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+        """
+        Transform the input DataFrame by imputing missing values with fitted values.
+
+        This method applies the fixed value imputation to the specified columns
+        in the input DataFrame using the fill values computed during fit.
+
+        Parameters
+        ----------
+        X : pl.DataFrame | pl.LazyFrame
+            The input DataFrame to transform.
+
+        Returns
+        -------
+        pl.DataFrame | pl.LazyFrame
+            A new DataFrame with missing values imputed in the specified columns,
+            lazy if X is a LazyFrame.
+
+        Notes
+        -----
+        This method uses the `fill_value_dict_` attribute set during the fit method
+        to determine which columns to impute and what values to use for imputation.
+        """
+        X_filled = X.lazy().with_columns(
+            pl.col(col).fill_null(value) for col, value in self.fill_value_dict_.items()
+        )
 
+        return collect_like(X, X_filled)
 
-class FixedValueImputer(TransformerMixin, BaseEstimator):
+
+class FixedValueImputer(ImputerMixin):
     """
     Imputer that fills missing values with fixed values for specified columns.
 
@@ -88,28 +142,262 @@ class FixedValueImputer(TransformerMixin, BaseEstimator):
         self.fill_value_dict_ = self.fill_value_dict
         return self
 
-    def transform(self, X: pl.DataFrame) -> pl.DataFrame:
-        """
-        Transform the input DataFrame by imputing missing values with fixed values.
 
-        This method applies the fixed value imputation to the specified columns
-        in the input DataFrame using the fill values provided during initialization.
+_STRATEGIES = ("median", "mean", "mode", "quantile", "constant")
+
+
+def _parse_strategy(strategy) -> tuple[str, object]:
+    name, arg = (strategy, None) if isinstance(strategy, str) else strategy
+    if name not in _STRATEGIES:
+        msg = f"strategy must be one of {_STRATEGIES}, got {name!r}"
+        raise ValueError(msg)
+    return name, arg
+
+
+def _statistic_expr(col: str, name: str, arg, *, step: int, quantile: float) -> pl.Expr:
+    expr = pl.col(col)
+    if name == "constant":
+        return pl.lit(arg).alias(col)
+    if name == "mode":
+        return expr.drop_nulls().mode().sort().first()
+    if step > 1:
+        # approximate statistics on a systematic subsample of the rows
+        expr = expr.gather_every(step)
+    if name == "mean":
+        return expr.mean()
+    if name == "median":
+        return expr.median()
+    return expr.quantile(quantile if arg is None else arg)
+
+
+def _keep_integers(schema: pl.Schema, fill_values: dict) -> dict:
+    # integer columns get rounded fill values, so that imputing them does not
+    # turn them into floats
+    return {
+        x: round(value)
+        if schema[x].is_integer() and isinstance(value, float) and math.isfinite(value)
+        else value
+        for x, value in fill_values.items()
+    }
+
+
+class StatisticImputer(ImputerMixin):
+    """
+    Imputer that fills missing values with statistics computed from the data.
+
+    All statistics, for all columns, are computed in a single lazy aggregation.
+
+    Parameters
+    ----------
+    strategy : str, tuple or list, optional
+        How the fill values are computed. Either a single strategy applied to all
+        numeric columns, or a list of ``(selector, strategy)`` pairs where the
+        selector is a column name, a list of column names or a Polars selector;
+        later pairs take precedence. A strategy is one of "median", "mean", "mode",
+        "quantile" or "constant", or a tuple ``("quantile", q)`` or
+        ``("constant", value)``. Default is "median".
+    quantile : float, optional
+        The quantile used by the "quantile" strategy when none is given in the
+        tuple form. Default is 0.5.
+    approximate : bool, optional
+        Whether to compute median, mean and quantiles on a systematic subsample
+        of at most `sample_size` rows, for very large inputs. Default is False.
+    sample_size : int, optional
+        Maximum number of rows used when `approximate` is True. Default is
+        1,000,000.
+
+    Attributes
+    ----------
+    fill_value_dict_ : dict
+        The fitted dictionary of column names and their imputation values. The
+        values of integer columns are rounded, so that they keep their dtype.
+
+    Examples
+    --------
+    >>> import polars as pl
+    >>> import polars.selectors as cs
+    >>> from polars_credit.impute import StatisticImputer
+    >>> df = pl.DataFrame({"A": [1, None, 3, 4], "B": ["x", None, "x", "z"]})
+    >>> imputer = StatisticImputer([(cs.numeric(), "median"), ("B", "mode")])
+    >>> imputer.fit(df).fill_value_dict_
+    {'A': 3, 'B': 'x'}
+    """
+
+    def __init__(
+        self,
+        strategy="median",
+        *,
+        quantile: float = 0.5,
+        approximate: bool = False,
+        sample_size: int = 1_000_000,
+    ):
+        self.strategy = strategy
+        self.quantile = quantile
+        self.approximate = approximate
+        self.sample_size = sample_size
+
+    def _column_strategies(self, X: pl.DataFrame) -> dict:
+        if isinstance(self.strategy, list):
+            pairs = self.strategy
+        else:
+            pairs = [(cs.numeric(), self.strategy)]
+
+        strategies = {}
+        for selector, strategy in pairs:
+            if isinstance(selector, str):
+                selector = [selector]
+            if isinstance(selector, list):
+                selector = cs.by_name(selector)
+            parsed = _parse_strategy(strategy)
+            strategies.update(dict.fromkeys(cs.expand_selector(X, selector), parsed))
+
+        return strategies
+
+    @profiled
+    @cached_fit
+    def fit(self, X: pl.DataFrame, y=None):
+        """
+        Compute the fill value of every selected column.
 
         Parameters
         ----------
         X : pl.DataFrame
-            The input DataFrame to transform.
+            The input DataFrame to fit the imputer on.
+        y : None
+            Ignored. Kept for compatibility with scikit-learn API.
 
         Returns
         -------
-        pl.DataFrame
-            A new DataFrame with missing values imputed in the specified columns.
+        self : StatisticImputer
+            Returns the instance itself.
 
-        Notes
-        -----
-        This method uses the `fill_value_dict_` attribute set during the fit method
-        to determine which columns to impute and what values to use for imputation.
+        Raises
+        ------
+        ValueError
+            If a strategy is not recognised.
         """
-        return X.with_columns(
-            pl.col(col).fill_null(value) for col, value in self.fill_value_dict_.items()
+        strategies = self._column_strategies(X)
+
+        step = 1
+        if self.approximate and X.height > self.sample_size:
+            step = math.ceil(X.height / self.sample_size)
+
+        df_fill = X.lazy().select(
+            _statistic_expr(col, name, arg, step=step, quantile=self.quantile)
+            for col, (name, arg) in strategies.items()
+        )
+
+        fill_values = collect(df_fill).row(0, named=True)
+        self.fill_value_dict_ = _keep_integers(X.schema, fill_values)
+        return self
+
+
+class WOEAwareImputer(ImputerMixin):
+    """
+    Imputer that fills missing values with the value of the WOE-closest bin.
+
+    Each numeric column is binned and the Weight of Evidence of every bin,
+    including the group of missing values, is computed. Missing values are then
+    filled with the median of the bin whose WOE is closest to the WOE of the
+    missing group, so that imputation leaves the risk ranking of these rows as
+    unchanged as possible. The WOE and medians of all columns are computed in a
+    single lazy aggregation over a long-format frame.
+
+    Parameters
+    ----------
+    binner : BinnerMixin, optional
+        The binner defining the bins, cloned and fitted on X. Default is
+        ``QuantileBinner(q=10)``.
+
+    Attributes
+    ----------
+    fill_value_dict_ : dict
+        The fitted dictionary of column names and their imputation values.
+        Columns without missing values in the training data are not included.
+    woe_ : pl.DataFrame
+        The WOE and median of every (column, bin) pair, bins being the ordinals
+        of the binner's bins and null bins standing for the missing values.
+
+    Examples
+    --------
+    >>> import polars as pl
+    >>> from polars_credit.bin import QuantileBinner
+    >>> from polars_credit.impute import WOEAwareImputer
+    >>> X = pl.DataFrame({"A": [1.0, 2.0, None, 4.0, 5.0, None, 7.0, 8.0]})
+    >>> y = pl.Series("y", [0, 0, 1, 0, 1, 1, 1, 0])
+    >>> imputer = WOEAwareImputer(QuantileBinner(q=2)).fit(X, y)
+    """
+
+    def __init__(self, binner=None):
+        self.binner = binner
+
+    @profiled
+    @cached_fit
+    def fit(self, X: pl.DataFrame, y: pl.Series):
+        """
+        Compute the fill value of every numeric column with missing values.
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The input DataFrame to fit the imputer on.
+        y : pl.Series
+            The binary target variable.
+
+        Returns
+        -------
+        self : WOEAwareImputer
+            Returns the instance itself.
+        """
+        binner = QuantileBinner(q=10) if self.binner is None else clone(self.binner)
+        breakpoints = binner.fit(X).breakpoints_
+        cols = list(breakpoints)
+
+        # the struct of raw value and bin ordinal gives every column the same
+        # dtype, so that all of them can be unpivoted into one long frame
+        df_long = (
+            X.lazy()
+            .select(
+                pl.struct(
+                    pl.col(x).cast(pl.Float64).alias("raw"),
+                    cal_bin_index(x, [sorted(breakpoints[x])])
+                    .struct.field(x)
+                    .alias("bin"),
+                ).alias(x)
+                for x in cols
+            )
+            .with_columns(y)
+            .unpivot(cols, index=y.name)
+            .unnest("value")
+        )
+
+        df_woe = (
+            df_long.group_by("variable", "bin")
+            .agg(
+                pl.col(y.name).eq(0).sum().alias("good"),
+                pl.col(y.name).eq(1).sum().alias("bad"),
+                pl.col("raw").quantile(0.5, interpolation="nearest").alias("median"),
+            )
+            .with_columns(
+                pl.col("good", "bad") / pl.col("good", "bad").sum().over("variable")
+            )
+            .with_columns((pl.col("bad") / pl.col("good")).log().alias("woe"))
+            .sort("variable", "bin", nulls_last=True)
         )
+        self.woe_ = collect(df_woe.select("variable", "bin", "woe", "median"))
+
+        # infinite WOEs are clipped so that e.g. an all-bad missing group is
+        # matched with the riskiest bin
+        woe = pl.col("woe").clip(-20, 20)
+        null_woe = woe.filter(pl.col("bin").is_null()).first().over("variable")
+        df_fill = (
+            self.woe_.with_columns((woe - null_woe).abs().alias("distance"))
+            .filter(pl.col("bin").is_not_null() & pl.col("distance").is_not_null())
+            .sort("distance")
+            .group_by("variable", maintain_order=True)
+            .first()
+        )
+
+        fill_values = dict(zip(df_fill["variable"], df_fill["median"]))
+        self.fill_value_dict_ = _keep_integers(X.schema, fill_values)
+        return self
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import numpy as np
+import polars as pl
+from scipy import stats
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.utils.validation import check_is_fitted
+
+from polars_credit.util.logistic import newton
+from polars_credit.util.profile import collect, profiled
+
+
+def _to_frame(X) -> pl.DataFrame:
+    if isinstance(X, pl.LazyFrame):
+        return collect(X)
+    if isinstance(X, pl.DataFrame):
+        return X
+    return pl.DataFrame(np.asarray(X))
+
+
+class LogisticRegression(BaseEstimator, ClassifierMixin):
+    """
+    Unpenalized logistic regression fitted by IRLS on Polars columns.
+
+    The rows are processed in blocks: each block is a zero-copy slice of the
+    input frame, converted to a small float64 matrix whose contributions to
+    the gradient and the Gram (Fisher information) matrix are accumulated. The
+    full design matrix is never materialized, so fitting on tens of millions
+    of rows of WOE features costs little more memory than the frame itself.
+    Standard errors and Wald p-values are available for model documentation,
+    and the estimator can be wrapped by `ScorecardTransformer`.
+
+    Parameters
+    ----------
+    fit_intercept : bool, optional
+        Whether to fit an intercept. Default is True.
+    max_iter : int, optional
+        Maximum number of IRLS iterations. Default is 50.
+    tol : float, optional
+        The fit stops when no coefficient moves by more than `tol`. Default is
+        1e-8.
+    block_size : int, optional
+        Number of rows processed at a time. Default is 65536.
+
+    Attributes
+    ----------
+    coef_ : np.ndarray
+        The (1, n_features) coefficients.
+    intercept_ : np.ndarray
+        The (1,) intercept, 0 if `fit_intercept` is False.
+    cov_ : np.ndarray
+        The covariance matrix of the intercept (if fitted) and coefficients.
+    bse_ : np.ndarray
+        The (1, n_features) standard errors of the coefficients.
+    intercept_bse_ : np.ndarray
+        The (1,) standard error of the intercept, NaN if not fitted.
+    loglik_ : float
+        The log-likelihood of the fitted model.
+    n_iter_ : int
+        The number of IRLS iterations.
+    classes_ : np.ndarray
+        The class labels, [0, 1].
+    feature_names_in_ : np.ndarray
+        The feature names seen during fit.
+
+    Methods
+    -------
+    fit(X, y, sample_weight=None)
+        Fit the model.
+    decision_function(X)
+        Return the log-odds of X.
+    predict_proba(X)
+        Return the probabilities of both classes.
+    predict_log_proba(X)
+        Return the log-probabilities of both classes.
+    predict(X)
+        Return the predicted class.
+    summary()
+        Return the coefficients with their standard errors and p-values.
+
+    Examples
+    --------
+    >>> from polars_credit.linear_model import LogisticRegression
+    >>> from polars_credit.scorecard import ScorecardTransformer
+    >>> scorecard = ScorecardTransformer(LogisticRegression()).fit(X_woe, y)
+    >>> scorecard.cls_fitted_.summary()
+
+    """
+
+    def __init__(
+        self,
+        *,
+        fit_intercept: bool = True,
+        max_iter: int = 50,
+        tol: float = 1e-8,
+        block_size: int = 2**16,
+    ):
+        self.fit_intercept = fit_intercept
+        self.max_iter = max_iter
+        self.tol = tol
+        self.block_size = block_size
+
+    @profiled
+    def fit(self, X, y, sample_weight=None):
+        """
+        Fit the logistic regression by IRLS.
+
+        Parameters
+        ----------
+        X : pl.DataFrame | pl.LazyFrame | array-like
+            The numeric features, without nulls.
+        y : pl.Series | array-like
+            The binary target variable.
+        sample_weight : pl.Series | array-like, optional
+            The weight of each row.
+
+        Returns
+        -------
+        self : LogisticRegression
+            Returns the instance itself.
+
+        Raises
+        ------
+        ValueError
+            If X contains nulls.
+
+        Warns
+        -----
+        sklearn.exceptions.ConvergenceWarning
+            If IRLS does not converge within `max_iter` iterations.
+
+        """
+        X = _to_frame(X)
+        nulls = [s.name for s in X.null_count() if s.item()]
+        if nulls:
+            msg = (
+                f"X contains nulls in {nulls}; impute them first, e.g. with the "
+                "WOE of a missing bin"
+            )
+            raise ValueError(msg)
+        y = np.asarray(y, dtype=np.float64)
+        weights = None if sample_weight is None else np.asarray(sample_weight, float)
+
+        def blocks():
+            for start in range(0, X.height, self.block_size):
+                # only a block of rows is cast to float64 at a time
+                df = X.slice(start, self.block_size).cast(pl.Float64)
+                stop = start + df.height
+                columns = [s.to_numpy() for s in df.iter_columns()]
+                if self.fit_intercept:
+                    columns.insert(0, np.ones(df.height))
+                wb = None if weights is None else weights[start:stop]
+                yield np.column_stack(columns), y[start:stop], wb
+
+        n_coef = X.width + self.fit_intercept
+        coef, cov, loglik, n_iter = newton(
+            blocks, np.zeros(n_coef), max_iter=self.max_iter, tol=self.tol
+        )
+
+        bse = np.sqrt(np.diag(cov))
+        if self.fit_intercept:
+            self.intercept_, self.intercept_bse_ = coef[:1], bse[:1]
+            coef, bse = coef[1:], bse[1:]
+        else:
+            self.intercept_, self.intercept_bse_ = np.zeros(1), np.full(1, np.nan)
+
+        self.coef_ = coef.reshape(1, -1)
+        self.bse_ = bse.reshape(1, -1)
+        self.cov_ = cov
+        self.loglik_ = loglik
+        self.n_iter_ = n_iter
+        self.classes_ = np.array([0, 1])
+        self.feature_names_in_ = np.array(X.columns, dtype=object)
+
+        return self
+
+    def decision_function(self, X) -> np.ndarray:
+        """
+        Return the log-odds of X, computed by a Polars expression.
+
+        Null feature values contribute 0 to the log-odds, like in
+        `ScorecardTransformer.score_expr`.
+        """
+        check_is_fitted(self)
+        if not isinstance(X, (pl.DataFrame, pl.LazyFrame)):
+            # arrays are matched to the features by position
+            X = pl.DataFrame(np.asarray(X), schema=list(self.feature_names_in_))
+        X = _to_frame(X)
+
+        log_odds = pl.sum_horizontal(
+            pl.col(x).cast(pl.Float64).fill_null(0.0) * float(c)
+            for x, c in zip(self.feature_names_in_, self.coef_[0])
+        ) + float(self.intercept_[0])
+
+        return X.select(log_odds).to_series().to_numpy()
+
+    def predict_log_proba(self, X) -> np.ndarray:
+        """Return the (n_samples, 2) log-probabilities of classes 0 and 1."""
+        log_odds = self.decision_function(X)
+        return np.column_stack(
+            [-np.logaddexp(0, log_odds), -np.logaddexp(0, -log_odds)]
+        )
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Return the (n_samples, 2) probabilities of classes 0 and 1."""
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X) -> np.ndarray:
+        """Return the class with the highest probability."""
+        return (self.decision_function(X) > 0).astype(np.int64)
+
+    def summary(self) -> pl.DataFrame:
+        """
+        Return the coefficients with their standard errors and p-values.
+
+        Returns
+        -------
+        pl.DataFrame
+            One row per coefficient, the intercept first, with the columns
+            'feature', 'coef', 'std_err', 'z' and 'pvalue' (two-sided Wald test).
+
+        """
+        check_is_fitted(self)
+        features = list(self.feature_names_in_)
+        coef = self.coef_[0]
+        bse = self.bse_[0]
+        if self.fit_intercept:
+            features = ["intercept", *features]
+            coef = np.r_[self.intercept_, coef]
+            bse = np.r_[self.intercept_bse_, bse]
+
+        z = coef / bse
+        return pl.DataFrame(
+            {
+                "feature": features,
+                "coef": coef,
+                "std_err": bse,
+                "z": z,
+                "pvalue": 2 * stats.norm.sf(np.abs(z)),
+            }
+        )
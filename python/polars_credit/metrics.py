@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import heapq
 
-from polars_credit.util.expr import _parse_expr
+import numpy as np
+import polars as pl
 
-if TYPE_CHECKING:
-    import polars as pl
+from polars_credit.util.expr import _parse_expr
 
 
 def roc_curve(true: str | pl.Expr, pred: str | pl.Expr):
@@ -51,3 +51,167 @@ def ks_score(true: str | pl.Expr, pred: str | pl.Expr):
 def gini(true: str | pl.Expr, pred: str | pl.Expr):
     """Calculate the Gini coefficient using Polars expressions."""
     return 2 * roc_auc_score(true, pred) - 1
+
+
+def _cumulative_counts(
+    df: pl.DataFrame | pl.LazyFrame, true: str, pred: str
+) -> pl.LazyFrame:
+    # one row per distinct score, in decreasing order, with the cumulative
+    # counts of positives and negatives scoring at least that much
+    return (
+        df.lazy()
+        .group_by(pl.col(pred).alias("threshold"))
+        .agg(pl.col(true).eq(1).sum().alias("tp"), pl.col(true).eq(0).sum().alias("fp"))
+        .sort("threshold", descending=True)
+        .select(
+            "threshold",
+            pl.col("tp").cum_sum().cast(pl.Float64),
+            pl.col("fp").cum_sum().cast(pl.Float64),
+        )
+    )
+
+
+def _rdp_indices(x: np.ndarray, y: np.ndarray, max_points: int) -> np.ndarray:
+    # top-down Ramer-Douglas-Peucker: repeatedly split the segment holding the
+    # point farthest from its chord until max_points points are kept
+    def farthest(start: int, stop: int):
+        if stop - start < 2:
+            return None
+        dx, dy = x[stop] - x[start], y[stop] - y[start]
+        xs, ys = x[start + 1 : stop] - x[start], y[start + 1 : stop] - y[start]
+        dist = np.abs(dx * ys - dy * xs) / max(np.hypot(dx, dy), 1e-300)
+        i = int(np.argmax(dist))
+        return -dist[i], start + 1 + i, start, stop
+
+    keep = {0, len(x) - 1}
+    heap = [item for item in [farthest(0, len(x) - 1)] if item is not None]
+    while heap and len(keep) < max_points:
+        neg_dist, i, start, stop = heapq.heappop(heap)
+        if neg_dist == 0:
+            break
+        keep.add(i)
+        for item in (farthest(start, i), farthest(i, stop)):
+            if item is not None:
+                heapq.heappush(heap, item)
+
+    return np.array(sorted(keep))
+
+
+def _downsample(df: pl.DataFrame, x: str, y: str, max_points: int, method: str):
+    if method not in {"threshold", "rdp"}:
+        msg = f"method must be 'threshold' or 'rdp', got {method!r}"
+        raise ValueError(msg)
+
+    if df.height <= max_points:
+        return df
+
+    if method == "threshold":
+        idx = np.unique(np.linspace(0, df.height - 1, max_points).round().astype(int))
+    else:
+        idx = _rdp_indices(df[x].to_numpy(), df[y].to_numpy(), max_points)
+
+    return df[idx]
+
+
+def roc_curve_points(
+    df: pl.DataFrame | pl.LazyFrame,
+    true: str,
+    pred: str,
+    *,
+    max_points: int = 1000,
+    method: str = "threshold",
+) -> pl.DataFrame:
+    """
+    Return at most `max_points` points of the ROC curve.
+
+    Unlike `roc_curve`, which has one point per row, the curve is computed from
+    the counts per distinct score and then downsampled, so that it can be
+    plotted whatever the number of rows.
+
+    Parameters
+    ----------
+    df : pl.DataFrame | pl.LazyFrame
+        The data, with a binary target and a score column.
+    true : str
+        The binary target column.
+    pred : str
+        The score column, higher meaning more likely positive.
+    max_points : int, optional
+        Maximum number of points. Default is 1000.
+    method : {"threshold", "rdp"}, optional
+        "threshold" keeps points evenly spaced in threshold rank, "rdp" keeps
+        the points that best preserve the shape of the curve
+        (Ramer-Douglas-Peucker). Both keep the end points. Default is
+        "threshold".
+
+    Returns
+    -------
+    pl.DataFrame
+        The columns 'threshold', 'fpr' and 'tpr', from (0, 0) to (1, 1).
+
+    """
+    df_curve = (
+        _cumulative_counts(df, true, pred)
+        .select(
+            "threshold",
+            (pl.col("fp") / pl.col("fp").last()).alias("fpr"),
+            (pl.col("tp") / pl.col("tp").last()).alias("tpr"),
+        )
+        .collect()
+    )
+    start = pl.DataFrame(
+        {"threshold": [float("inf")], "fpr": [0.0], "tpr": [0.0]}
+    ).cast(df_curve.schema)
+    df_curve = pl.concat([start, df_curve])
+
+    return _downsample(df_curve, "fpr", "tpr", max_points, method)
+
+
+def gains_curve_points(
+    df: pl.DataFrame | pl.LazyFrame,
+    true: str,
+    pred: str,
+    *,
+    max_points: int = 1000,
+    method: str = "threshold",
+) -> pl.DataFrame:
+    """
+    Return at most `max_points` points of the cumulative gains curve.
+
+    Parameters
+    ----------
+    df : pl.DataFrame | pl.LazyFrame
+        The data, with a binary target and a score column.
+    true : str
+        The binary target column.
+    pred : str
+        The score column, higher meaning more likely positive.
+    max_points : int, optional
+        Maximum number of points. Default is 1000.
+    method : {"threshold", "rdp"}, optional
+        How points are selected, see `roc_curve_points`. Default is "threshold".
+
+    Returns
+    -------
+    pl.DataFrame
+        The columns 'threshold', 'population' (share of rows scoring at least
+        the threshold) and 'tpr' (share of positives among them), from (0, 0)
+        to (1, 1).
+
+    """
+    total = pl.col("tp").last() + pl.col("fp").last()
+    df_curve = (
+        _cumulative_counts(df, true, pred)
+        .select(
+            "threshold",
+            ((pl.col("tp") + pl.col("fp")) / total).alias("population"),
+            (pl.col("tp") / pl.col("tp").last()).alias("tpr"),
+        )
+        .collect()
+    )
+    start = pl.DataFrame(
+        {"threshold": [float("inf")], "population": [0.0], "tpr": [0.0]}
+    ).cast(df_curve.schema)
+    df_curve = pl.concat([start, df_curve])
+
+    return _downsample(df_curve, "population", "tpr", max_points, method)
@@ -0,0 +1,199 @@
+"""Post-deployment monitoring of model performance over rolling windows."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import numpy as np
+import polars as pl
+
+from polars_credit.util.profile import collect
+
+
+def _window_start(end, days: int):
+    # the first day of the window of `days` days ending at `end`
+    if isinstance(end, date):
+        return end - timedelta(days=days - 1)
+    return end - (days - 1)
+
+
+def _metrics_of_counts(bad: np.ndarray, good: np.ndarray) -> tuple:
+    # AUC, KS and Gini from the counts per score bucket in increasing score
+    # order, rows of a same bucket being tied
+    n_bad, n_good = bad.sum(), good.sum()
+    if n_bad == 0 or n_good == 0:
+        return None, None, None
+    tpr = np.r_[0.0, np.cumsum(bad[::-1]) / n_bad]
+    fpr = np.r_[0.0, np.cumsum(good[::-1]) / n_good]
+    auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+    ks = float(np.max(np.abs(tpr - fpr)))
+    return auc, ks, 2 * auc - 1
+
+
+class RollingMonitor:
+    """
+    AUC, KS and Gini of a score over rolling windows of days.
+
+    The monitor keeps the counts of goods and bads per day and score bucket,
+    never the rows. Each update aggregates the new rows in one grouped query
+    and adds their counts to the running totals of every window, subtracting
+    the days that leave a window and forgetting the days older than the
+    longest window. The metrics of a window are then computed from its
+    bucket totals in O(buckets), instead of sorting all the rows of the
+    window.
+
+    Rows of a same bucket count as tied, so the metrics approach the exact ones
+    as the buckets get finer, e.g. one bucket per scorecard point.
+
+    Parameters
+    ----------
+    breaks : list[float]
+        The sorted, unique breakpoints of the score buckets. Buckets are
+        right-closed like `pl.Expr.cut`.
+    windows : list[int], optional
+        The window lengths in days, each window ending at the latest day
+        seen. Default is (90,).
+
+    Attributes
+    ----------
+    days : list
+        The days held, in increasing order.
+    latest : date | int | None
+        The latest day seen.
+
+    Methods
+    -------
+    update(df, t, true, pred)
+        Add the counts of new days, or replace those of days already held.
+    metrics()
+        Return the metrics of every window.
+
+    Examples
+    --------
+    >>> from polars_credit.monitor import RollingMonitor
+    >>> monitor = RollingMonitor(breaks=list(range(300, 901)), windows=[30, 90])
+    >>> for df_day in daily_outcomes:
+    ...     monitor.update(df_day, "decision_date", "bad", "score")
+    ...     monitor.metrics()
+
+    """
+
+    def __init__(self, breaks: list[float], windows: list[int] = (90,)):
+        self.breaks = [float(b) for b in breaks]
+        self.windows = sorted({int(w) for w in windows})
+        if not self.windows or self.windows[0] < 1:
+            msg = f"windows must be positive numbers of days, got {windows!r}"
+            raise ValueError(msg)
+
+        n_buckets = len(self.breaks) + 1
+        self._counts = {}
+        self._members = {w: set() for w in self.windows}
+        self._totals = {w: np.zeros((2, n_buckets), np.int64) for w in self.windows}
+        self.latest = None
+
+    @property
+    def days(self) -> list:
+        """The days held, in increasing order."""
+        return sorted(self._counts)
+
+    def _in_window(self, day, w: int) -> bool:
+        return _window_start(self.latest, w) <= day <= self.latest
+
+    def update(
+        self, df: pl.DataFrame | pl.LazyFrame, t: str, true: str, pred: str
+    ) -> RollingMonitor:
+        """
+        Add the counts of the days of `df`.
+
+        A day already held is replaced, so that the outcomes of past days can
+        be refreshed as they mature. Rows with a null day, target or score are
+        ignored.
+
+        Parameters
+        ----------
+        df : pl.DataFrame | pl.LazyFrame
+            The scored rows of one or more days.
+        t : str
+            The day column, of Date or integer dtype.
+        true : str
+            The binary target column.
+        pred : str
+            The score column, higher meaning more likely positive.
+
+        Returns
+        -------
+        self : RollingMonitor
+            Returns the instance itself.
+
+        """
+        n_buckets = len(self.breaks) + 1
+        bucket = pl.lit(pl.Series(self.breaks, dtype=pl.Float64)).search_sorted(
+            pl.col(pred).cast(pl.Float64), side="left"
+        )
+        df_counts = collect(
+            df.lazy()
+            .drop_nulls([t, true, pred])
+            .group_by(pl.col(t).alias("day"), bucket.alias("bucket"))
+            .agg(
+                pl.col(true).eq(0).sum().alias("good"),
+                pl.col(true).eq(1).sum().alias("bad"),
+            )
+        )
+
+        for (day,), df_day in df_counts.partition_by("day", as_dict=True).items():
+            counts = np.zeros((2, n_buckets), np.int64)
+            buckets = df_day["bucket"].to_numpy()
+            counts[0, buckets] = df_day["good"].to_numpy()
+            counts[1, buckets] = df_day["bad"].to_numpy()
+
+            for w in self.windows:
+                if day in self._members[w]:
+                    self._totals[w] -= self._counts[day]
+                    self._members[w].discard(day)
+            self._counts[day] = counts
+            if self.latest is None or day > self.latest:
+                self.latest = day
+
+        for w in self.windows:
+            members = {day for day in self._counts if self._in_window(day, w)}
+            for day in self._members[w] - members:
+                self._totals[w] -= self._counts[day]
+            for day in members - self._members[w]:
+                self._totals[w] += self._counts[day]
+            self._members[w] = members
+
+        # days out of the longest window are never needed again
+        for day in [
+            d for d in self._counts if d not in self._members[self.windows[-1]]
+        ]:
+            del self._counts[day]
+
+        return self
+
+    def metrics(self) -> pl.DataFrame:
+        """
+        Return the metrics of every window.
+
+        Returns
+        -------
+        pl.DataFrame
+            One row per window with the columns 'window' (days), 'start',
+            'end', 'n', 'bad_rate', 'auc', 'ks' and 'gini'. The metrics of a
+            window without both goods and bads are null.
+
+        """
+        rows = []
+        for w in self.windows:
+            good, bad = self._totals[w]
+            n = int(good.sum() + bad.sum())
+            start = None if self.latest is None else _window_start(self.latest, w)
+            bad_rate = bad.sum() / n if n else None
+            rows.append(
+                (w, start, self.latest, n, bad_rate, *_metrics_of_counts(bad, good))
+            )
+
+        return pl.DataFrame(
+            rows,
+            schema=["window", "start", "end", "n", "bad_rate", "auc", "ks", "gini"],
+            orient="row",
+        )
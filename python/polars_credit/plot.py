@@ -0,0 +1,289 @@
+"""
+Charts of credit model diagnostics.
+
+Every chart aggregates its data in Polars first, so the chart specification
+holds at most a few hundred points whatever the number of rows. Altair is an
+optional dependency (``pip install polars_credit[plot]``), imported on the
+first call.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+from polars_credit.metrics import _cumulative_counts, _downsample, roc_curve_points
+from polars_credit.woe import get_woe
+
+if TYPE_CHECKING:
+    import altair as alt
+
+
+def _altair():
+    try:
+        import altair as alt
+    except ImportError as e:
+        msg = "charts require altair, install it with `pip install polars_credit[plot]`"
+        raise ImportError(msg) from e
+    return alt
+
+
+def roc_chart(
+    df: pl.DataFrame | pl.LazyFrame,
+    true: str,
+    pred: str,
+    *,
+    max_points: int = 500,
+    method: str = "rdp",
+) -> alt.LayerChart:
+    """
+    Plot the ROC curve from at most `max_points` points.
+
+    Parameters
+    ----------
+    df : pl.DataFrame | pl.LazyFrame
+        The data, with a binary target and a score column.
+    true : str
+        The binary target column.
+    pred : str
+        The score column, higher meaning more likely positive.
+    max_points : int, optional
+        Maximum number of points of the curve. Default is 500.
+    method : {"threshold", "rdp"}, optional
+        How points are selected, see `metrics.roc_curve_points`. Default is
+        "rdp".
+
+    Returns
+    -------
+    alt.LayerChart
+        The ROC curve over the diagonal.
+
+    """
+    alt = _altair()
+    df_roc = roc_curve_points(df, true, pred, max_points=max_points, method=method)
+
+    curve = (
+        alt.Chart(df_roc)
+        .mark_line()
+        .encode(
+            x=alt.X("fpr:Q", title="False positive rate"),
+            y=alt.Y("tpr:Q", title="True positive rate"),
+            tooltip=["threshold:Q", "fpr:Q", "tpr:Q"],
+        )
+    )
+    diagonal = (
+        alt.Chart(pl.DataFrame({"fpr": [0.0, 1.0], "tpr": [0.0, 1.0]}))
+        .mark_line(strokeDash=[4, 4], color="gray")
+        .encode(x="fpr:Q", y="tpr:Q")
+    )
+
+    return diagonal + curve
+
+
+def ks_chart(
+    df: pl.DataFrame | pl.LazyFrame,
+    true: str,
+    pred: str,
+    *,
+    max_points: int = 500,
+) -> alt.LayerChart:
+    """
+    Plot the cumulative shares of positives and negatives by population share.
+
+    The KS statistic is the largest gap between the two curves, marked by a
+    vertical rule. The point of the KS is always kept by the downsampling.
+
+    Parameters
+    ----------
+    df : pl.DataFrame | pl.LazyFrame
+        The data, with a binary target and a score column.
+    true : str
+        The binary target column.
+    pred : str
+        The score column, higher meaning more likely positive.
+    max_points : int, optional
+        Maximum number of points per curve. Default is 500.
+
+    Returns
+    -------
+    alt.LayerChart
+        The two cumulative distributions and the KS rule.
+
+    """
+    alt = _altair()
+
+    df_curve = (
+        _cumulative_counts(df, true, pred)
+        .select(
+            "threshold",
+            (
+                (pl.col("tp") + pl.col("fp"))
+                / (pl.col("tp").last() + pl.col("fp").last())
+            ).alias("population"),
+            (pl.col("tp") / pl.col("tp").last()).alias("positive"),
+            (pl.col("fp") / pl.col("fp").last()).alias("negative"),
+        )
+        .collect()
+    )
+    i_ks = int((df_curve["positive"] - df_curve["negative"]).arg_max())
+    df_ks = df_curve[i_ks]
+
+    df_points = _downsample(df_curve, "population", "positive", max_points, "threshold")
+    df_points = pl.concat([df_points, df_ks]).unique("population").sort("population")
+
+    curves = (
+        alt.Chart(df_points.unpivot(["positive", "negative"], index="population"))
+        .mark_line()
+        .encode(
+            x=alt.X("population:Q", title="Population share"),
+            y=alt.Y("value:Q", title="Cumulative share"),
+            color=alt.Color("variable:N", title=None),
+        )
+    )
+    ks = df_ks.with_columns((pl.col("positive") - pl.col("negative")).alias("ks"))
+    rule = (
+        alt.Chart(ks)
+        .mark_rule(strokeDash=[4, 4])
+        .encode(x="population:Q", tooltip=["ks:Q", "threshold:Q"])
+    )
+
+    return curves + rule
+
+
+def woe_chart(df: pl.DataFrame | pl.LazyFrame, x: str, y: str) -> alt.Chart:
+    """
+    Plot the WOE of each bin of a feature.
+
+    Parameters
+    ----------
+    df : pl.DataFrame | pl.LazyFrame
+        The data, with a binned feature and a binary target.
+    x : str
+        The binned feature, e.g. an output of `QuantileBinner.transform`.
+    y : str
+        The binary target column.
+
+    Returns
+    -------
+    alt.Chart
+        One bar per bin, in bin order, with the shares of goods and bads in the
+        tooltip.
+
+    """
+    alt = _altair()
+
+    df_woe = (
+        get_woe(df.lazy(), y, x)
+        .with_columns(pl.col(x).cast(pl.String).fill_null("null").alias("bin"))
+        .collect()
+    )
+
+    return (
+        alt.Chart(df_woe)
+        .mark_bar()
+        .encode(
+            x=alt.X("bin:N", sort=df_woe["bin"].to_list(), title=x),
+            y=alt.Y("woe:Q", title="WOE"),
+            tooltip=["bin:N", "woe:Q", "good:Q", "bad:Q"],
+        )
+    )
+
+
+def psi_by_period(
+    df: pl.DataFrame | pl.LazyFrame, x: str, t: str, *, benchmark=None
+) -> pl.DataFrame:
+    """
+    Return the PSI of a feature in each period against a benchmark period.
+
+    Parameters
+    ----------
+    df : pl.DataFrame | pl.LazyFrame
+        The data, with a binned feature and a period column.
+    x : str
+        The binned feature.
+    t : str
+        The period column.
+    benchmark : optional
+        The benchmark period. Default is the first period.
+
+    Returns
+    -------
+    pl.DataFrame
+        The columns t and 'psi', one row per period. A bin empty in a period
+        but not in the benchmark, or the reverse, makes the PSI infinite.
+
+    """
+    df_share = (
+        df.lazy()
+        .group_by(t, x)
+        .agg(pl.len().alias("n"))
+        .with_columns((pl.col("n") / pl.col("n").sum().over(t)).alias("share"))
+        .collect()
+    )
+    if benchmark is None:
+        benchmark = df_share[t].min()
+
+    # every (period, bin) pair, a bin absent from a period having a zero share
+    df_grid = df_share.select(pl.col(t).unique()).join(
+        df_share.select(pl.col(x).unique()), how="cross"
+    )
+    df_base = df_share.filter(pl.col(t) == benchmark).select(
+        x, pl.col("share").alias("base")
+    )
+
+    return (
+        df_grid.join(df_share, on=[t, x], how="left", join_nulls=True)
+        .join(df_base, on=x, how="left", join_nulls=True)
+        .with_columns(pl.col("share", "base").fill_null(0.0))
+        .group_by(t)
+        .agg(
+            pl.when(pl.col("share") != pl.col("base"))
+            .then(
+                (pl.col("share") - pl.col("base"))
+                * (pl.col("share") / pl.col("base")).log()
+            )
+            .otherwise(0.0)
+            .sum()
+            .alias("psi")
+        )
+        .drop_nulls(t)
+        .sort(t)
+    )
+
+
+def psi_chart(
+    df: pl.DataFrame | pl.LazyFrame, x: str, t: str, *, benchmark=None
+) -> alt.Chart:
+    """
+    Plot the PSI of a feature over time against a benchmark period.
+
+    Parameters
+    ----------
+    df : pl.DataFrame | pl.LazyFrame
+        The data, with a binned feature and a period column.
+    x : str
+        The binned feature.
+    t : str
+        The period column.
+    benchmark : optional
+        The benchmark period. Default is the first period.
+
+    Returns
+    -------
+    alt.Chart
+        One point per period.
+
+    """
+    alt = _altair()
+    df_psi = psi_by_period(df, x, t, benchmark=benchmark)
+
+    return (
+        alt.Chart(df_psi)
+        .mark_line(point=True)
+        .encode(
+            x=alt.X(f"{t}:O", title=t),
+            y=alt.Y("psi:Q", title=f"PSI of {x}"),
+            tooltip=[f"{t}:O", "psi:Q"],
+        )
+    )
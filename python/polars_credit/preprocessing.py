@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import numpy as np
+import polars as pl
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+from polars_credit.util.cache import cached_fit
+from polars_credit.util.profile import collect, collect_like, profiled
+
+_INTEGER_RANGES = [
+    (pl.Int8, -(2**7), 2**7 - 1),
+    (pl.Int16, -(2**15), 2**15 - 1),
+    (pl.Int32, -(2**31), 2**31 - 1),
+]
+
+# bytes per value, the values of strings being views of 16 bytes plus the
+# bytes of the strings longer than 12 bytes, and categoricals UInt32 codes
+_ITEM_SIZE = {
+    pl.Int8: 1,
+    pl.Int16: 2,
+    pl.Int32: 4,
+    pl.Int64: 8,
+    pl.UInt8: 1,
+    pl.UInt16: 2,
+    pl.UInt32: 4,
+    pl.UInt64: 8,
+    pl.Float32: 4,
+    pl.Float64: 8,
+    pl.String: 16,
+    pl.Categorical: 4,
+    pl.Enum: 4,
+}
+
+
+def _narrowest_integer(low, high) -> pl.DataType:
+    for dtype, dtype_min, dtype_max in _INTEGER_RANGES:
+        if dtype_min <= low and high <= dtype_max:
+            return dtype
+    return pl.Int64
+
+
+def _cast_expr(x: str, dtype: pl.DataType, new_dtype: pl.DataType) -> pl.Expr:
+    col = pl.col(x)
+    if isinstance(new_dtype, pl.Enum):
+        return col.cast(new_dtype, strict=False)
+    if new_dtype.is_integer() and dtype.is_float():
+        # a non-integral value would be truncated, infinity fails the strict
+        # cast instead
+        col = pl.when(col != col.round()).then(float("inf")).otherwise(col)
+    # a strict cast fails on the values beyond the narrowed type
+    return col.cast(new_dtype, strict=True).alias(x)
+
+
+def _stats_expr(x: str, dtype: pl.DataType, max_categories: int) -> pl.Expr | None:
+    col = pl.col(x)
+    if dtype.is_integer():
+        return pl.struct(min=col.min(), max=col.max()).alias(x)
+    if dtype.is_float():
+        finite = col.filter(col.is_finite())
+        return pl.struct(
+            min=col.min(),
+            max=col.max(),
+            # NaN and infinite values are not integral
+            integral=(col == col.floor()).all() & col.is_finite().all(),
+            lossless=(col.cast(pl.Float32).cast(pl.Float64) == col).all()
+            & (finite.abs().max().fill_null(0) <= np.finfo(np.float32).max),
+        ).alias(x)
+    if dtype == pl.String:
+        # one more level than the cap tells that the cap is exceeded
+        return pl.struct(
+            levels=col.drop_nulls().unique().head(max_categories + 1).implode(),
+            long_bytes=col.str.len_bytes().filter(col.str.len_bytes() > 12).sum(),
+        ).alias(x)
+    return None
+
+
+class DtypeCompactor(BaseEstimator, TransformerMixin):
+    """
+    A transformer that casts every column to the narrowest safe dtype.
+
+    Raw extracts often hold Int64, Float64 and String columns whose values fit
+    in much smaller types. Placed ahead of the binners and `WOETransformer`,
+    compaction reduces the memory of the frame and the cost of the hashing and
+    sorting of the fits. The statistics of all the columns (range, integrality,
+    exactness in float32 and distinct strings) are computed in a single lazy
+    pass.
+
+    The rules are:
+
+    - Floats become Float32 if all their values seen during fit are exact in
+      float32, or always with ``float32="always"``. Values of later data that
+      are not exact in float32 are rounded to the nearest float32.
+    - With ``narrow_integers=True`` only, integers, and floats with integral
+      values only, take the narrowest signed integer type holding the range
+      seen during fit.
+    - Numeric columns are never widened.
+    - Strings with at most `max_categories` distinct values become Categorical
+      or Enum.
+    - Other columns, and columns with only nulls, are left unchanged.
+
+    Parameters
+    ----------
+    max_categories : int, optional
+        Maximum number of distinct values of a String column to be encoded.
+        Default is 1000.
+    string_dtype : {"categorical", "enum"}, optional
+        The dtype of encoded strings. With "enum" the levels are those seen
+        during fit, and unseen values are null on transform. Default is
+        "categorical".
+    float32 : {"lossless", "always", "never"}, optional
+        When Float64 columns become Float32. Default is "lossless".
+    narrow_integers : bool, optional
+        Whether to narrow integers and integral floats to the range seen
+        during fit. On transform, a column whose values are not integral or
+        do not fit in its narrowed type raises an error rather than changing
+        the output schema. Default is False.
+
+    Attributes
+    ----------
+    dtypes_ : dict
+        The dtype of each compacted column.
+    report_ : pl.DataFrame
+        The estimated memory of every column before and after compaction, with
+        the columns 'column', 'dtype', 'new_dtype', 'bytes' and 'new_bytes'.
+    saved_bytes_ : int
+        The estimated memory saved on the data seen during fit.
+
+    Methods
+    -------
+    fit(X, y=None)
+        Choose the dtype of each column.
+    transform(X)
+        Cast the columns of X to their chosen dtypes.
+
+    Examples
+    --------
+    >>> from sklearn.pipeline import make_pipeline
+    >>> from polars_credit.bin import QuantileBinner
+    >>> from polars_credit.preprocessing import DtypeCompactor
+    >>> pipeline = make_pipeline(DtypeCompactor(), QuantileBinner(q=10))
+    >>> X_bin = pipeline.fit_transform(X)
+    >>> pipeline[0].saved_bytes_
+
+    """
+
+    def __init__(
+        self,
+        *,
+        max_categories: int = 1000,
+        string_dtype: str = "categorical",
+        float32: str = "lossless",
+        narrow_integers: bool = False,
+    ):
+        self.max_categories = max_categories
+        self.string_dtype = string_dtype
+        self.float32 = float32
+        self.narrow_integers = narrow_integers
+
+    def _check_params(self):
+        if self.string_dtype not in {"categorical", "enum"}:
+            msg = f"string_dtype must be 'categorical' or 'enum', got {self.string_dtype!r}"
+            raise ValueError(msg)
+        if self.float32 not in {"lossless", "always", "never"}:
+            msg = (
+                f"float32 must be 'lossless', 'always' or 'never', got {self.float32!r}"
+            )
+            raise ValueError(msg)
+
+    def _choose(self, dtype: pl.DataType, stats: dict) -> pl.DataType:
+        if dtype.is_numeric():
+            new_dtype = self._choose_numeric(dtype, stats)
+            size, new_size = _ITEM_SIZE.get(dtype), _ITEM_SIZE.get(new_dtype)
+            # never widen, e.g. UInt8 bin ordinals to Int16, and leave unlisted
+            # dtypes such as Int128 unchanged
+            if size is None or new_size is None or new_size >= size:
+                return dtype
+            return new_dtype
+        levels = stats["levels"]
+        if not levels or len(levels) > self.max_categories:
+            return dtype
+        if self.string_dtype == "enum":
+            return pl.Enum(sorted(levels))
+        return pl.Categorical
+
+    def _choose_numeric(self, dtype: pl.DataType, stats: dict) -> pl.DataType:
+        if stats["min"] is None:
+            return dtype
+        if dtype.is_integer() or stats["integral"]:
+            if self.narrow_integers:
+                return _narrowest_integer(stats["min"], stats["max"])
+            if dtype.is_integer():
+                return dtype
+        if self.float32 == "always" or (
+            self.float32 == "lossless" and stats["lossless"]
+        ):
+            return pl.Float32
+        return dtype
+
+    @profiled
+    @cached_fit
+    def fit(self, X: pl.DataFrame | pl.LazyFrame, y=None):
+        """
+        Choose the narrowest safe dtype of each column.
+
+        Parameters
+        ----------
+        X : pl.DataFrame | pl.LazyFrame
+            The input data.
+        y : None
+            Ignored. Kept for compatibility with scikit-learn API.
+
+        Returns
+        -------
+        self : DtypeCompactor
+            Returns the instance itself.
+
+        """
+        self._check_params()
+        schema = X.lazy().collect_schema()
+
+        exprs = [
+            _stats_expr(x, dtype, self.max_categories) for x, dtype in schema.items()
+        ]
+        exprs = [expr for expr in exprs if expr is not None]
+        df_stats = collect(X.lazy().select(pl.len().alias("__len"), *exprs))
+        n_rows = df_stats["__len"].item()
+        stats = df_stats.row(0, named=True)
+
+        self.dtypes_ = {}
+        rows = []
+        for x, dtype in schema.items():
+            new_dtype = self._choose(dtype, stats[x]) if x in stats else dtype
+            if new_dtype != dtype:
+                self.dtypes_[x] = new_dtype
+
+            size = _ITEM_SIZE.get(dtype.base_type())
+            new_size = _ITEM_SIZE.get(new_dtype.base_type())
+            if size is None or new_size is None:
+                continue
+            n_bytes = size * n_rows
+            new_bytes = new_size * n_rows
+            if dtype == pl.String:
+                n_bytes += stats[x]["long_bytes"] or 0
+                if new_dtype != dtype:
+                    new_bytes += sum(len(v.encode()) for v in stats[x]["levels"])
+            rows.append((x, str(dtype), str(new_dtype), n_bytes, new_bytes))
+
+        self.report_ = pl.DataFrame(
+            rows,
+            schema={
+                "column": pl.String,
+                "dtype": pl.String,
+                "new_dtype": pl.String,
+                "bytes": pl.Int64,
+                "new_bytes": pl.Int64,
+            },
+            orient="row",
+        )
+        self.saved_bytes_ = int(
+            self.report_["bytes"].sum() - self.report_["new_bytes"].sum()
+        )
+
+        return self
+
+    @profiled
+    def transform(self, X: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+        """
+        Cast the columns of X to the dtypes chosen during fit.
+
+        Parameters
+        ----------
+        X : pl.DataFrame | pl.LazyFrame
+            The input data.
+
+        Returns
+        -------
+        pl.DataFrame | pl.LazyFrame
+            X with its compacted columns cast, lazy if X is a LazyFrame.
+
+        Raises
+        ------
+        polars.exceptions.InvalidOperationError
+            When the result is collected, if a column narrowed to an integer
+            type holds values beyond that type, e.g. beyond the range seen
+            during fit, or non-integral values.
+
+        Notes
+        -----
+        The dtypes are those chosen during fit, whatever the data, and all the
+        casts are part of a single lazy query. Strings unseen during fit are
+        null with ``string_dtype="enum"``.
+
+        """
+        check_is_fitted(self)
+        schema = X.lazy().collect_schema()
+
+        X_cast = X.lazy().with_columns(
+            _cast_expr(x, schema[x], dtype)
+            for x, dtype in self.dtypes_.items()
+            if x in schema
+        )
+        return collect_like(X, X_cast)
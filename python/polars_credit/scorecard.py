@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from math import log
+
+import numpy as np
+import polars as pl
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.utils.validation import check_is_fitted
+
+from polars_credit.linear_model import _to_frame
+
+
+class ScorecardTransformer(BaseEstimator, ClassifierMixin):
+    """
+    A transformer that converts classifier probabilities into credit scorecard points.
+
+    This class wraps a classifier and transforms its output probabilities into
+    credit scorecard points. The transformation is based on the Points to Double
+    the Odds (PDO) and the base score and odds.
+
+    Parameters
+    ----------
+    cls : object
+        The classifier object to be wrapped. It should have fit, predict_proba,
+        and predict methods, e.g. `polars_credit.linear_model.LogisticRegression`,
+        which fits directly on Polars frames.
+    pdo : float, default=20
+        Points to Double the Odds. The number of points that doubles the odds.
+    rate : float, default=2
+        The rate at which the odds double.
+    base_score : float, default=600
+        The base score, typically representing a neutral credit score.
+    base_odds : float, default=50
+        The base odds, representing the odds at the base score.
+
+    Attributes
+    ----------
+    cls_fitted_ : object
+        The fitted classifier.
+    factor_ : float
+        The scaling factor for the log-odds.
+    offset_ : float
+        The offset added to the scaled log-odds.
+    best_points_ : dict
+        The fewest points each feature of a linear classifier adds over the
+        training data, i.e. the points of its least risky value. Only set when
+        the wrapped classifier exposes ``coef_``.
+
+    Methods
+    -------
+    fit(X, y)
+        Fit the model according to the given training data.
+    predict_proba(X)
+        Predict class probabilities for X.
+    predict(X)
+        Predict class labels for X.
+    score_expr(features=None)
+        Polars expression computing the points of a linear classifier.
+    reason_codes(X, k=4)
+        The features costing each row the most points.
+    """
+
+    def __init__(self, cls, pdo=20, rate=2, base_score=600, base_odds=50):
+        self.cls = cls
+        self.pdo = pdo
+        self.rate = rate
+        self.base_score = base_score
+        self.base_odds = base_odds
+
+    def fit(self, X, y):
+        """Fit the wrapped classifier and compute the scaling of the points."""
+        self.factor_ = self.pdo / log(self.rate)
+        self.offset_ = self.base_score - self.factor_ * log(self.base_odds)
+
+        self.cls_fitted_ = self.cls.fit(X, y)
+
+        if hasattr(self.cls_fitted_, "coef_"):
+            self.best_points_ = self._best_points(X)
+
+        return self
+
+    def _feature_points(self, features: list[str]) -> list[pl.Expr]:
+        coef = np.ravel(self.cls_fitted_.coef_)
+        return [
+            (self.factor_ * float(c) * pl.col(x).cast(pl.Float64).fill_null(0.0)).alias(
+                x
+            )
+            for x, c in zip(features, coef)
+        ]
+
+    def _best_points(self, X) -> dict[str, float]:
+        features = self._features()
+        X = _to_frame(X)
+        if X.columns != features:
+            X = pl.DataFrame(X.to_numpy(), schema=features)
+        points = X.select(self._feature_points(features))
+        return points.select(pl.all().min()).row(0, named=True)
+
+    def _features(self) -> list[str]:
+        if hasattr(self.cls_fitted_, "feature_names_in_"):
+            return list(self.cls_fitted_.feature_names_in_)
+        return [f"x{i}" for i in range(np.size(self.cls_fitted_.coef_))]
+
+    def predict_proba(self, X):
+        """Return the scorecard points of X."""
+        check_is_fitted(self)
+        log_proba = self.cls_fitted_.predict_log_proba(X)
+        scores = self.offset_ + self.factor_ * (log_proba[:, 1] - log_proba[:, 0])
+
+        return scores
+
+    def predict(self, X):
+        """Predict class labels for X."""
+        check_is_fitted(self)
+
+        return self.cls_fitted_.predict(X)
+
+    def score_expr(self, features: list[str] | None = None) -> pl.Expr:
+        """
+        Return a Polars expression computing the scorecard points.
+
+        The expression evaluates the log-odds of a fitted linear classifier from
+        the feature columns, so that points can be computed lazily, e.g. inside a
+        streaming query, without converting the data to NumPy.
+
+        Parameters
+        ----------
+        features : list[str], optional
+            The feature columns, in the order of the classifier coefficients.
+            Defaults to the ``feature_names_in_`` seen by the classifier.
+
+        Returns
+        -------
+        pl.Expr
+            An expression named ``score``, equal to `predict_proba`. Null feature
+            values contribute zero points.
+
+        Raises
+        ------
+        TypeError
+            If the wrapped classifier is not linear, i.e. has no ``coef_``.
+
+        """
+        check_is_fitted(self)
+
+        if not hasattr(self.cls_fitted_, "coef_"):
+            msg = "score_expr requires a linear classifier exposing coef_"
+            raise TypeError(msg)
+
+        if features is None:
+            features = list(self.cls_fitted_.feature_names_in_)
+
+        coef = np.ravel(self.cls_fitted_.coef_)
+        intercept = float(np.ravel(self.cls_fitted_.intercept_)[0])
+
+        log_odds = pl.sum_horizontal(
+            pl.col(x) * float(c) for x, c in zip(features, coef)
+        ) + pl.lit(intercept)
+
+        return (self.offset_ + self.factor_ * log_odds).alias("score")
+
+    def reason_codes(
+        self,
+        X,
+        k: int = 4,
+        *,
+        best_points: dict[str, float] | None = None,
+        with_points: bool = False,
+        block_size: int = 2**18,
+    ) -> pl.DataFrame:
+        """
+        Return the features costing each row the most points.
+
+        The reason codes (adverse action reasons) of a row are the features
+        whose points lie the furthest from the best points attainable by that
+        feature. The shortfall of every feature is computed by a Polars
+        expression, and the top `k` per row by a partial sort of each block of
+        rows in NumPy, so that reasons for millions of declines take seconds.
+
+        Parameters
+        ----------
+        X : pl.DataFrame | pl.LazyFrame | array-like
+            The features, e.g. WOE values. Arrays are matched to the features
+            by position. Null values contribute zero points.
+        k : int, optional
+            The number of reasons per row. Default is 4.
+        best_points : dict[str, float], optional
+            The best attainable points of each feature. Defaults to
+            ``best_points_``, the best points over the training data.
+        with_points : bool, optional
+            Whether to add the shortfall of each reason. Default is False.
+        block_size : int, optional
+            Number of rows ranked at a time. Default is 262144.
+
+        Returns
+        -------
+        pl.DataFrame
+            The columns 'reason_1' to 'reason_k', Enum of the feature names,
+            ranked from the largest shortfall, then 'points_1' to 'points_k'
+            if `with_points`. A reason is null if its feature is at its best
+            points, so rows at the best of every feature have no reason.
+
+        Raises
+        ------
+        TypeError
+            If the wrapped classifier is not linear, i.e. has no ``coef_``.
+
+        Examples
+        --------
+        >>> scorecard = ScorecardTransformer(LogisticRegression()).fit(X_woe, y)
+        >>> declined = X_woe.filter(scorecard.score_expr() > 650)
+        >>> scorecard.reason_codes(declined, k=4)
+
+        """
+        check_is_fitted(self)
+
+        if not hasattr(self.cls_fitted_, "coef_"):
+            msg = "reason_codes requires a linear classifier exposing coef_"
+            raise TypeError(msg)
+
+        features = self._features()
+        if best_points is None:
+            best_points = self.best_points_
+        if not isinstance(X, (pl.DataFrame, pl.LazyFrame)):
+            X = pl.DataFrame(np.asarray(X), schema=features)
+
+        shortfall = _to_frame(X).select(
+            (points - best_points[x]).alias(x)
+            for x, points in zip(features, self._feature_points(features))
+        )
+
+        # features beyond the last one have no shortfall, hence no reason
+        k_used = min(k, len(features))
+        top = np.zeros((shortfall.height, k), dtype=np.uint32)
+        top_points = np.zeros((shortfall.height, k))
+        for start in range(0, shortfall.height, block_size):
+            block = shortfall.slice(start, block_size).to_numpy()
+            stop = start + block.shape[0]
+            # partial sort of the k largest shortfalls, then sort of those k
+            idx = np.argpartition(-block, k_used - 1, axis=1)[:, :k_used]
+            values = np.take_along_axis(block, idx, axis=1)
+            order = np.argsort(-values, axis=1, kind="stable")
+            top[start:stop, :k_used] = np.take_along_axis(idx, order, axis=1)
+            top_points[start:stop, :k_used] = np.take_along_axis(values, order, axis=1)
+
+        df_top = pl.DataFrame(
+            {
+                **{f"reason_{j + 1}": top[:, j] for j in range(k)},
+                **{f"points_{j + 1}": top_points[:, j] for j in range(k)},
+            }
+        )
+        return df_top.select(
+            *(
+                pl.when(pl.col(f"points_{j + 1}") > 0)
+                .then(pl.col(f"reason_{j + 1}").cast(pl.Enum(features)))
+                .alias(f"reason_{j + 1}")
+                for j in range(k)
+            ),
+            *(
+                pl.when(pl.col(f"points_{j + 1}") > 0).then(pl.col(f"points_{j + 1}"))
+                for j in range(k)
+                if with_points
+            ),
+        )
@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import os
+import pickle
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import polars.selectors as cs
+from polars_credit.util.profile import collect_all
+
+_CACHE: ContextVar[ContingencyCache | None] = ContextVar("cache", default=None)
+_FIT_CACHE: ContextVar[FitCache | None] = ContextVar("fit_cache", default=None)
+
+
+class ContingencyCache:
+    """
+    LRU cache of the (feature value, target value) counts of a session.
+
+    IV, PSI and WOE are all derived from the same contingency tables. While a
+    cache is active, `util.divergence.cal_iv` and `cal_psi` (and so
+    `IVThreshold` and `PSIThreshold`), ``df.eda.iv`` and `WOETransformer.fit`
+    store the tables they compute and reuse the tables computed by the others,
+    instead of running the same group_by again.
+
+    Tables are keyed by the feature and target names and dtypes, the number of
+    rows and a fingerprint of the (feature, target) pairs, so a modified frame
+    never hits a stale entry. The fingerprints of all the requested pairs are
+    computed in a single pass, much cheaper than the grouped counts. Only
+    in-memory DataFrames are cached, LazyFrames are always computed.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Maximum estimated size of the cached tables. The least recently used
+        tables are evicted beyond it. Default is 256 MB.
+
+    Attributes
+    ----------
+    hits : int
+        Number of tables served from the cache.
+    misses : int
+        Number of tables computed and stored.
+    evictions : int
+        Number of tables evicted to stay below `max_bytes`.
+
+    Examples
+    --------
+    >>> from polars_credit.util.cache import contingency_cache
+    >>> from polars_credit.util.divergence import cal_iv
+    >>> with contingency_cache() as cache:
+    ...     df_iv = cal_iv(df, "target")
+    ...     woe = WOETransformer().fit(df.drop("target"), df["target"])
+    >>> cache.stats()
+
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._tables = OrderedDict()
+        self._bytes = 0
+
+    def __enter__(self):
+        self._token = _CACHE.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _CACHE.reset(self._token)
+
+    def __len__(self):
+        return len(self._tables)
+
+    def get(self, key) -> pl.DataFrame | None:
+        """Return the table stored under ``key``, or None."""
+        table = self._tables.get(key)
+        if table is not None:
+            self._tables.move_to_end(key)
+        return table
+
+    def put(self, key, table: pl.DataFrame):
+        """Store ``table`` under ``key``, evicting the least recently used tables."""
+        size = table.estimated_size()
+        if size > self.max_bytes:
+            return
+
+        if key in self._tables:
+            self._bytes -= self._tables.pop(key).estimated_size()
+
+        self._tables[key] = table
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, evicted = self._tables.popitem(last=False)
+            self._bytes -= evicted.estimated_size()
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all the tables and reset the statistics."""
+        self._tables.clear()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Return the hits, misses, evictions, number of tables and their size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "tables": len(self._tables),
+            "bytes": self._bytes,
+        }
+
+
+def contingency_cache(max_bytes: int = 256 * 2**20) -> ContingencyCache:
+    """
+    Share the contingency tables computed inside a ``with`` block.
+
+    Caching is off by default. See `ContingencyCache` for the cached
+    computations.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Maximum estimated size of the cached tables. Default is 256 MB.
+
+    Returns
+    -------
+    ContingencyCache
+        The context manager, also holding the cache statistics.
+
+    """
+    return ContingencyCache(max_bytes)
+
+
+def get_count_tables(
+    df: pl.DataFrame | pl.LazyFrame, y: str, xs: list[str]
+) -> list[pl.DataFrame] | None:
+    """
+    Return the contingency tables of ``xs`` against ``y`` from the active cache.
+
+    Parameters
+    ----------
+    df : pl.DataFrame | pl.LazyFrame
+        The input data containing the features and the target.
+    y : str
+        The name of the target (or time) column.
+    xs : list[str]
+        The names of the feature columns.
+
+    Returns
+    -------
+    list[pl.DataFrame] | None
+        One table per feature with the columns x, y and 'n', the number of rows
+        of each (x, y) pair. None if no cache is active or df is a LazyFrame, in
+        which case the caller computes its result directly.
+
+    """
+    cache = _CACHE.get()
+    if cache is None or not isinstance(df, pl.DataFrame) or not xs:
+        return None
+
+    # the sum of the row hashes does not depend on the row order, like the
+    # contingency table itself
+    fingerprints = df.select(
+        pl.struct(x, y).hash(seed=0).sum().alias(x) for x in xs
+    ).row(0)
+    keys = [
+        (x, y, df.schema[x], df.schema[y], df.height, fingerprint)
+        for x, fingerprint in zip(xs, fingerprints)
+    ]
+
+    tables = [cache.get(key) for key in keys]
+    missing = [i for i, table in enumerate(tables) if table is None]
+    cache.hits += len(xs) - len(missing)
+    cache.misses += len(missing)
+
+    df_lazy = df.lazy()
+    computed = collect_all(
+        df_lazy.group_by(xs[i], y).agg(pl.len().alias("n")) for i in missing
+    )
+    for i, table in zip(missing, computed):
+        cache.put(keys[i], table)
+        tables[i] = table
+
+    return tables
+
+
+def _version() -> str | None:
+    try:
+        return metadata.version("polars_credit")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def fingerprint(data: pl.DataFrame | pl.Series, n_samples: int = 1024) -> str:
+    """
+    Return a cheap fingerprint of the content of a frame.
+
+    The fingerprint combines the schema, the number of rows, the null counts
+    and the row hashes of about `n_samples` evenly spaced rows, so its cost
+    does not grow with the number of rows. Changes confined to rows outside of
+    the sample are not detected.
+
+    Parameters
+    ----------
+    data : pl.DataFrame | pl.Series
+        The data to fingerprint.
+    n_samples : int, optional
+        Number of sampled rows. Default is 1024.
+
+    Returns
+    -------
+    str
+        A hexadecimal digest.
+
+    """
+    df = data.to_frame() if isinstance(data, pl.Series) else data
+    sample = df.gather_every(max(df.height // n_samples, 1)).head(n_samples)
+    # hash the labels, not the physical codes, of categoricals
+    sample = sample.with_columns(cs.categorical().cast(pl.String))
+
+    digest = hashlib.sha256()
+    digest.update(repr((df.schema, df.height, df.null_count().row(0))).encode())
+    digest.update(sample.hash_rows(seed=0).to_numpy().tobytes())
+
+    return digest.hexdigest()
+
+
+def _key_part(value):
+    # frames by their fingerprint and arrays by their content, as the repr of
+    # both is truncated
+    if isinstance(value, (pl.DataFrame, pl.Series)):
+        return fingerprint(value)
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha256(repr((value.dtype, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+        return digest.hexdigest()
+    return value
+
+
+class FitCache:
+    """
+    Content-addressed disk cache of fitted estimators.
+
+    While a cache is active, the fit of the binners, `WOETransformer`, the
+    imputers and the feature selectors first looks for the state fitted on the
+    same data with the same parameters. On a hit, the state is loaded and fit
+    returns immediately. The key combines the estimator class and parameters
+    with a `fingerprint` of every frame passed to fit. Only fits on in-memory
+    DataFrames are cached.
+
+    Entries are pickles: only point the cache at a directory you trust.
+
+    Parameters
+    ----------
+    path : str | Path, optional
+        The cache directory, created if needed. Default is
+        ``~/.cache/polars_credit``.
+    max_bytes : int, optional
+        Maximum size of the cache directory. The least recently used entries are
+        removed beyond it. Default is 1 GB.
+    max_age : float, optional
+        Entries unused for more than `max_age` seconds are removed. Default is 30
+        days.
+    enabled : bool, optional
+        Whether the cache is used. Setting the ``POLARS_CREDIT_FIT_CACHE``
+        environment variable to ``0`` also disables it. Default is True.
+
+    Attributes
+    ----------
+    hits : int
+        Number of fits loaded from the cache.
+    misses : int
+        Number of fits run and stored.
+
+    Examples
+    --------
+    >>> from polars_credit.util.cache import fit_cache
+    >>> with fit_cache("/tmp/polars_credit"):
+    ...     pipeline.fit(X, y)
+
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        max_bytes: int = 2**30,
+        max_age: float = 30 * 24 * 3600,
+        enabled: bool = True,
+    ):
+        self.path = Path(path or Path.home() / ".cache" / "polars_credit")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        self._token = _FIT_CACHE.set(self)
+        if self.active and self.path.is_dir():
+            self.evict()
+        return self
+
+    def __exit__(self, *exc):
+        _FIT_CACHE.reset(self._token)
+
+    @property
+    def active(self) -> bool:
+        """Whether fits are looked up in the cache."""
+        return self.enabled and os.environ.get("POLARS_CREDIT_FIT_CACHE") != "0"
+
+    def key(self, estimator, args, kwargs) -> str:
+        """Return the key of fitting ``estimator`` on ``args`` and ``kwargs``."""
+        params = sorted(estimator.get_params(deep=False).items())
+        data = [
+            *(_key_part(arg) for arg in args),
+            *((name, _key_part(value)) for name, value in sorted(kwargs.items())),
+        ]
+        cls = type(estimator)
+        content = (_version(), pl.__version__, cls.__module__, cls.__qualname__, params)
+        return hashlib.sha256(repr((content, data)).encode()).hexdigest()
+
+    def load(self, key: str) -> dict | None:
+        """Return the state stored under ``key``, or None."""
+        file = self.path / f"{key}.pkl"
+        try:
+            state = pickle.loads(file.read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        # the modification time tracks the last use, for eviction
+        file.touch()
+        return state
+
+    def save(self, key: str, state: dict):
+        """Store ``state`` under ``key`` and evict old entries."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / f"{key}.{os.getpid()}.tmp"
+        tmp.write_bytes(pickle.dumps(state))
+        tmp.replace(self.path / f"{key}.pkl")
+        self.evict()
+
+    def evict(self):
+        """Remove the entries older than `max_age`, then the least recently used."""
+        now = time.time()
+        entries = []
+        for file in self.path.glob("*.pkl"):
+            stat = file.stat()
+            if now - stat.st_mtime > self.max_age:
+                file.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, file))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, file in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            file.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        """Remove all the entries."""
+        for file in self.path.glob("*.pkl"):
+            file.unlink(missing_ok=True)
+
+
+def fit_cache(
+    path: str | Path | None = None,
+    *,
+    max_bytes: int = 2**30,
+    max_age: float = 30 * 24 * 3600,
+    enabled: bool = True,
+) -> FitCache:
+    """
+    Cache the fits made inside a ``with`` block on disk.
+
+    Caching is off by default. See `FitCache` for the cached estimators and
+    the parameters.
+
+    Returns
+    -------
+    FitCache
+        The context manager, also holding the cache statistics.
+
+    """
+    return FitCache(path, max_bytes=max_bytes, max_age=max_age, enabled=enabled)
+
+
+def cached_fit(fit):
+    """Load the state fitted by ``fit`` from the active `FitCache`, if any."""
+
+    @functools.wraps(fit)
+    def wrapper(self, *args, **kwargs):
+        cache = _FIT_CACHE.get()
+        if (
+            cache is None
+            or not cache.active
+            or not args
+            or not isinstance(args[0], pl.DataFrame)
+        ):
+            return fit(self, *args, **kwargs)
+
+        key = cache.key(self, args, kwargs)
+        state = cache.load(key)
+        if state is not None:
+            cache.hits += 1
+            vars(self).update(state)
+            return self
+
+        cache.misses += 1
+        output = fit(self, *args, **kwargs)
+        params = self.get_params(deep=False)
+        cache.save(
+            key,
+            {
+                name: value
+                for name, value in vars(self).items()
+                if name not in params and name != "fit_profile_"
+            },
+        )
+        return output
+
+    return wrapper
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import polars as pl
+from polars_credit.util.cache import get_count_tables
+from polars_credit.util.profile import collect, collect_all, profiled
 
 
 def _jeffrey_divergence(
@@ -8,6 +10,8 @@ def _jeffrey_divergence(
     x: str,
     y: str,
     benchmark=None,
+    weight: str | None = None,
+    by: str | None = None,
 ) -> pl.DataFrame | pl.LazyFrame:
     """
     Calculate the Jeffrey divergence between two categorical variables.
@@ -27,12 +31,18 @@ def _jeffrey_divergence(
     benchmark : str, optional
         The benchmark category in 'y' to compare against. If None, the first unique
         value in 'y' is used as the benchmark.
+    weight : str, optional
+        A column of row counts, e.g. 'n' of a contingency table. If None, each
+        row counts once.
+    by : str, optional
+        A segment column. The divergence of every segment is computed by the
+        same grouped aggregation.
 
     Returns
     -------
     pl.DataFrame | pl.LazyFrame
         A dataframe containing the Jeffrey divergence for each category in 'x'.
-        The result has two columns:
+        The result has two columns, preceded by `by` if given:
         - 'var': The name of the variable 'x'.
         - 'val': The calculated Jeffrey divergence value.
 
@@ -48,7 +58,7 @@ def _jeffrey_divergence(
     """
     y_unique = df.select(pl.col(y)).unique().sort(y)
     if isinstance(df, pl.LazyFrame):
-        y_unique = y_unique.collect()
+        y_unique = collect(y_unique)
     y_unique = y_unique.to_series().to_list()
 
     if benchmark is None:
@@ -58,9 +68,33 @@ def _jeffrey_divergence(
         msg = f"Benchmark value '{benchmark}' not found in unique values of '{y}'"
         raise ValueError(msg)
 
+    if weight is None:
+        counts = (pl.col(y).eq(y_val).sum().alias(f"{y_val}") for y_val in y_unique)
+    else:
+        counts = (
+            pl.col(weight).filter(pl.col(y).eq(y_val)).sum().alias(f"{y_val}")
+            for y_val in y_unique
+        )
+
+    if by is not None:
+        shares = pl.exclude(by)
+        return (
+            df.group_by(by, x)
+            .agg(counts)
+            .drop(x)
+            .with_columns(shares / shares.sum().over(by))
+            .with_columns(
+                (shares - pl.col(f"{benchmark}"))
+                * (shares / pl.col(f"{benchmark}")).log()
+            )
+            .group_by(by)
+            .agg(shares.sum())
+            .select(by, var=pl.lit(x), val=pl.max_horizontal(shares))
+        )
+
     df_divergence = (
         df.group_by(x)
-        .agg(pl.col(y).eq(y_val).sum().alias(f"{y_val}") for y_val in y_unique)
+        .agg(counts)
         .drop(x)
         .select(pl.all() / pl.all().sum())
         .select(
@@ -73,7 +107,9 @@ def _jeffrey_divergence(
     return df_divergence
 
 
-def _multi_jeffrey_divergence(df: pl.DataFrame | pl.LazyFrame, y: str):
+def _multi_jeffrey_divergence(
+    df: pl.DataFrame | pl.LazyFrame, y: str, by: str | None = None
+):
     """
     Calculate Jeffrey divergence for multiple variables against a target variable.
 
@@ -86,12 +122,14 @@ def _multi_jeffrey_divergence(df: pl.DataFrame | pl.LazyFrame, y: str):
         The input DataFrame or LazyFrame containing the variables to analyze.
     y : str
         The name of the target variable column.
+    by : str, optional
+        A segment column, see `_jeffrey_divergence`.
 
     Returns
     -------
     pl.DataFrame
         A DataFrame containing the Jeffrey divergence for each variable.
-        The result has two columns:
+        The result has two columns, preceded by `by` if given:
         - 'var': The name of the variable.
         - 'val': The calculated Jeffrey divergence value.
 
@@ -99,19 +137,65 @@ def _multi_jeffrey_divergence(df: pl.DataFrame | pl.LazyFrame, y: str):
     -----
     This function uses the _jeffrey_divergence function to calculate the divergence
     for each variable. It excludes the target variable from the calculation.
-    The result is collected into a single DataFrame.
+    The result is collected into a single DataFrame. The contingency tables are
+    shared with the other consumers of an active `util.cache.ContingencyCache`.
     """
     df_lazy = df.lazy()
-    cols = df_lazy.collect_schema().names()
+    xs = [x for x in df_lazy.collect_schema().names() if x not in {y, by}]
 
-    ls_iv = [_jeffrey_divergence(df_lazy, x=x, y=y) for x in cols if x != y]
+    if by is not None:
+        df_lazy = df_lazy.drop_nulls(by)
+        ls_iv = [_jeffrey_divergence(df_lazy, x=x, y=y, by=by) for x in xs]
+        return collect(pl.concat(ls_iv)).sort(by, maintain_order=True)
 
-    df_iv = pl.concat(ls_iv).collect()
+    tables = get_count_tables(df, y, xs)
+    if tables is None:
+        ls_iv = [_jeffrey_divergence(df_lazy, x=x, y=y) for x in xs]
+    else:
+        ls_iv = [
+            _jeffrey_divergence(table.lazy(), x=x, y=y, weight="n")
+            for x, table in zip(xs, tables)
+        ]
+
+    df_iv = collect(pl.concat(ls_iv))
 
     return df_iv
 
 
-def cal_iv(df: pl.DataFrame | pl.LazyFrame, y: str):
+def _multi_target_iv(df: pl.DataFrame | pl.LazyFrame, ys: list[str]) -> pl.DataFrame:
+    # the good and bad counts of all the targets come from one aggregation per
+    # feature; rows with a null target are left out of that target's counts
+    df_lazy = df.lazy()
+    xs = [x for x in df_lazy.collect_schema().names() if x not in ys]
+
+    def iv(t):
+        n_bad, n_good = pl.col(f"{t}__bad"), pl.col(f"{t}__good")
+        bad, good = n_bad / n_bad.sum(), n_good / n_good.sum()
+        # values only seen with a null target are not in the table
+        observed = (n_bad + n_good) > 0
+        return ((bad - good) * (bad / good).log()).filter(observed).sum().alias(t)
+
+    ls_iv = [
+        df_lazy.group_by(x)
+        .agg(
+            *(pl.col(t).eq(1).sum().alias(f"{t}__bad") for t in ys),
+            *(pl.col(t).eq(0).sum().alias(f"{t}__good") for t in ys),
+        )
+        .select(pl.lit(x).alias("var"), *(iv(t) for t in ys))
+        for x in xs
+    ]
+
+    return pl.concat(collect_all(ls_iv))
+
+
+@profiled
+def cal_iv(
+    df: pl.DataFrame | pl.LazyFrame,
+    y: str | list[str],
+    *,
+    by: str | None = None,
+    output: str = "long",
+):
     """
     Calculate Information Value (IV) for multiple variables against a target variable.
 
@@ -123,16 +207,33 @@ def cal_iv(df: pl.DataFrame | pl.LazyFrame, y: str):
     ----------
     df : pl.DataFrame | pl.LazyFrame
         The input DataFrame or LazyFrame containing the variables to analyze.
-    y : str
-        The name of the target variable column.
+    y : str | list[str]
+        The name of the target variable column, or of several binary targets,
+        e.g. alternative bad definitions. The counts of all the targets are
+        computed by a single aggregation per variable, a row with a null target
+        being left out of that target's counts.
+    by : str, optional
+        A segment column. The IV of each variable in every segment
+        is computed by one grouped aggregation per variable. Not supported with
+        several targets.
+    output : {"long", "wide"}, optional
+        The layout of the IVs of several targets. Default is "long".
 
     Returns
     -------
     pl.DataFrame
         A DataFrame containing the Information Value for each variable.
-        The result has two columns:
+        The result has two columns, preceded by `by` if given:
         - 'var': The name of the variable.
         - 'iv': The calculated Information Value.
+        With several targets, the long output has a 'target' column between
+        them, and the wide output has one IV column per target instead.
+
+    Raises
+    ------
+    ValueError
+        If `output` is not "long" or "wide", or `by` is given with several
+        targets.
 
     Notes
     -----
@@ -140,11 +241,24 @@ def cal_iv(df: pl.DataFrame | pl.LazyFrame, y: str):
     divergence for each variable. The resulting values are interpreted as Information
     Values.
     """
-    df_iv = _multi_jeffrey_divergence(df, y).rename({"val": "iv"})
-    return df_iv
+    if isinstance(y, str):
+        return _multi_jeffrey_divergence(df, y, by).rename({"val": "iv"})
 
+    if output not in {"long", "wide"}:
+        msg = f"output must be 'long' or 'wide', got {output!r}"
+        raise ValueError(msg)
+    if by is not None:
+        msg = "by is not supported with several targets"
+        raise ValueError(msg)
 
-def cal_psi(df: pl.DataFrame | pl.LazyFrame, t: str):
+    df_iv = _multi_target_iv(df, list(y))
+    if output == "wide":
+        return df_iv
+    return df_iv.unpivot(index="var", variable_name="target", value_name="iv")
+
+
+@profiled
+def cal_psi(df: pl.DataFrame | pl.LazyFrame, t: str, *, by: str | None = None):
     """
     Calculate Population Stability Index for multiple variables against a time var.
 
@@ -158,12 +272,15 @@ def cal_psi(df: pl.DataFrame | pl.LazyFrame, t: str):
         The input DataFrame or LazyFrame containing the variables to analyze.
     t : str
         The name of the time variable column.
+    by : str, optional
+        A segment column. The PSI of each variable in every segment
+        is computed by one grouped aggregation per variable.
 
     Returns
     -------
     pl.DataFrame
         A DataFrame containing the Population Stability Index for each variable.
-        The result has two columns:
+        The result has two columns, preceded by `by` if given:
         - 'var': The name of the variable.
         - 'psi': The calculated Population Stability Index.
 
@@ -174,5 +291,146 @@ def cal_psi(df: pl.DataFrame | pl.LazyFrame, t: str):
     Stability Indices.
     PSI is used to measure the stability of a variable's distribution over time.
     """
-    df_iv = _multi_jeffrey_divergence(df, t).rename({"val": "psi"})
+    df_iv = _multi_jeffrey_divergence(df, t, by).rename({"val": "psi"})
     return df_iv
+
+
+def _code_dtype(n: int) -> pl.DataType:
+    for dtype, bits in ((pl.UInt8, 8), (pl.UInt16, 16), (pl.UInt32, 32)):
+        if n <= 2**bits:
+            return dtype
+    return pl.UInt64
+
+
+def _iv_of_codes(df_codes: pl.LazyFrame, code: pl.Expr, y: str, smoothing: float):
+    # IV of the groups of an integer code, the good and bad counts of every
+    # observed group being smoothed
+    good = pl.col("good") + smoothing
+    bad = pl.col("bad") + smoothing
+    return (
+        df_codes.group_by(code.alias("__code"))
+        .agg(pl.len().alias("n"), pl.col(y).sum().alias("bad"))
+        .with_columns(good=pl.col("n") - pl.col("bad"))
+        .select(
+            (
+                (bad / bad.sum() - good / good.sum())
+                * ((bad / bad.sum()) / (good / good.sum())).log()
+            )
+            .sum()
+            .alias("iv")
+        )
+    )
+
+
+@profiled
+def cal_iv_pairs(
+    df: pl.DataFrame | pl.LazyFrame,
+    y: str,
+    xs: list[str] | None = None,
+    *,
+    top_k: int = 100,
+    smoothing: float = 0.5,
+    block_size: int = 256,
+) -> pl.DataFrame:
+    """
+    Find the pairs of binned features whose joint IV most exceeds their own.
+
+    Every feature is first encoded as compact integer codes (its dense rank,
+    nulls being 0). The joint counts of a pair are then grouped by the
+    combined code ``code_1 * n_codes_2 + code_2``, so no crossed column is
+    ever materialized. The pairs are processed in blocks of `block_size`
+    queries run in parallel by Polars.
+
+    Parameters
+    ----------
+    df : pl.DataFrame | pl.LazyFrame
+        The input data, with binned or ordinal features and a binary target.
+    y : str
+        The name of the binary target variable column (0 or 1).
+    xs : list[str], optional
+        The features to cross. Default is all the columns but y.
+    top_k : int, optional
+        Number of pairs returned. Default is 100.
+    smoothing : float, optional
+        Added to the good and bad counts of every observed cell, so that the
+        many small cells of a cross with no goods or no bads do not make every
+        IV infinite. The marginal IVs are smoothed the same way. Default is
+        0.5.
+    block_size : int, optional
+        Number of pairs whose counts are computed by a single parallel call.
+        Default is 256.
+
+    Returns
+    -------
+    pl.DataFrame
+        The `top_k` pairs by decreasing 'gain', with the columns 'var_1',
+        'var_2', 'iv' (the IV of the cross), 'iv_1', 'iv_2' (the IVs of the
+        features) and 'gain', the IV of the cross minus the largest of the
+        two.
+
+    """
+    # rows with a null target are left out rather than counted as goods
+    df_lazy = df.lazy().filter(pl.col(y).is_not_null())
+    schema = df_lazy.collect_schema()
+    xs = [x for x in schema.names() if x != y] if xs is None else list(xs)
+
+    def physical(x):
+        col = pl.col(x)
+        if isinstance(schema[x], (pl.Categorical, pl.Enum)):
+            return col.to_physical()
+        return col
+
+    # the codes run from 0 (null) to the number of distinct values, each
+    # feature taking the narrowest unsigned type that holds them
+    n_codes = collect(
+        df_lazy.select(physical(x).drop_nulls().n_unique() + 1 for x in xs)
+    ).row(0, named=True)
+    df_codes = collect(
+        df_lazy.select(
+            pl.col(y).cast(pl.Int8),
+            *(
+                physical(x).rank("dense").fill_null(0).cast(_code_dtype(n_codes[x]))
+                for x in xs
+            ),
+        )
+    )
+    lf_codes = df_codes.lazy()
+
+    ls_iv = collect_all(_iv_of_codes(lf_codes, pl.col(x), y, smoothing) for x in xs)
+    iv = {x: df_iv.item() for x, df_iv in zip(xs, ls_iv)}
+
+    pairs = [(a, b) for i, a in enumerate(xs) for b in xs[i + 1 :]]
+    iv_pairs = []
+    for start in range(0, len(pairs), block_size):
+        block = pairs[start : start + block_size]
+        iv_pairs += [
+            df_iv.item()
+            for df_iv in collect_all(
+                _iv_of_codes(
+                    lf_codes.select(y, a, b),
+                    pl.col(a).cast(_code_dtype(n_codes[a] * n_codes[b])) * n_codes[b]
+                    + pl.col(b),
+                    y,
+                    smoothing,
+                )
+                for a, b in block
+            )
+        ]
+
+    return (
+        pl.DataFrame(
+            {
+                "var_1": [a for a, _ in pairs],
+                "var_2": [b for _, b in pairs],
+                "iv": iv_pairs,
+            },
+            schema={"var_1": pl.String, "var_2": pl.String, "iv": pl.Float64},
+        )
+        .with_columns(
+            iv_1=pl.col("var_1").replace_strict(iv, return_dtype=pl.Float64),
+            iv_2=pl.col("var_2").replace_strict(iv, return_dtype=pl.Float64),
+        )
+        .with_columns(gain=pl.col("iv") - pl.max_horizontal("iv_1", "iv_2"))
+        .sort("gain", descending=True)
+        .head(top_k)
+    )
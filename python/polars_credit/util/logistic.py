@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import polars as pl
+from scipy import linalg, stats
+from sklearn.exceptions import ConvergenceWarning
+
+# largest condition number of the scaled Fisher information, beyond which
+# columns are treated as collinear
+_MAX_CONDITION = 1e10
+
+
+@dataclass
+class LogisticFit:
+    """
+    Result of a logistic regression fitted by `irls`.
+
+    Attributes
+    ----------
+    cols : np.ndarray
+        The columns of the design matrix used by the fit.
+    coef : np.ndarray
+        The coefficients of `cols`.
+    cov : np.ndarray
+        The covariance matrix of the coefficients, the inverse of the Fisher
+        information.
+    loglik : float
+        The log-likelihood.
+    n_obs : float
+        The number of observations, or the sum of the sample weights.
+    n_iter : int
+        The number of IRLS iterations.
+
+    """
+
+    cols: np.ndarray
+    coef: np.ndarray
+    cov: np.ndarray
+    loglik: float
+    n_obs: float
+    n_iter: int
+
+    @property
+    def bse(self) -> np.ndarray:
+        """Standard errors of the coefficients."""
+        return np.sqrt(np.diag(self.cov))
+
+    @property
+    def pvalues(self) -> np.ndarray:
+        """Two-sided Wald test p-values of the coefficients."""
+        return 2 * stats.norm.sf(np.abs(self.coef / self.bse))
+
+    @property
+    def aic(self) -> float:
+        """Akaike information criterion."""
+        return 2 * len(self.coef) - 2 * self.loglik
+
+    @property
+    def bic(self) -> float:
+        """Bayesian information criterion."""
+        return len(self.coef) * np.log(self.n_obs) - 2 * self.loglik
+
+
+def design_matrix(X: pl.DataFrame, *, intercept: bool = True) -> np.ndarray:
+    """
+    Return the columns of X as a single Fortran-ordered float32 matrix.
+
+    Parameters
+    ----------
+    X : pl.DataFrame
+        The numeric features, e.g. WOE values. Nulls are replaced by 0.
+    intercept : bool, optional
+        Whether the first column is a column of ones. Default is True.
+
+    Returns
+    -------
+    np.ndarray
+        The (n_rows, n_features + intercept) design matrix.
+
+    """
+    exprs = [pl.all().cast(pl.Float32).fill_null(0.0)]
+    if intercept:
+        exprs.insert(0, pl.lit(1.0, dtype=pl.Float32).alias("__intercept"))
+
+    return X.select(exprs).to_numpy(order="fortran")
+
+
+def _blocks(n_rows: int, block_size: int):
+    for start in range(0, n_rows, block_size):
+        yield slice(start, min(start + block_size, n_rows))
+
+
+def _accumulate(blocks, coef):
+    # log-likelihood, gradient and Fisher information, one block of rows at a
+    # time so that the full float64 design matrix is never materialized
+    p = len(coef)
+    loglik = 0.0
+    grad = np.zeros(p)
+    info = np.zeros((p, p))
+    for Xb, yb, wb in blocks():
+        eta = Xb @ coef
+        mu = 1 / (1 + np.exp(-eta))
+        w = mu * (1 - mu)
+        r = yb - mu
+        ll = yb * eta - np.logaddexp(0, eta)
+        if wb is not None:
+            w *= wb
+            r *= wb
+            ll *= wb
+        loglik += ll.sum()
+        grad += Xb.T @ r
+        info += Xb.T @ (Xb * w[:, None])
+
+    return loglik, grad, info
+
+
+def _check_conditioning(info: np.ndarray):
+    # scaling to unit diagonal makes the check blind to the units of the columns
+    scale = np.sqrt(np.diag(info))
+    if np.any(scale == 0) or not np.isfinite(scale).all():
+        msg = "singular Fisher information: a column is constant zero"
+        raise np.linalg.LinAlgError(msg)
+    if np.linalg.cond(info / np.outer(scale, scale)) > _MAX_CONDITION:
+        msg = "singular Fisher information: the columns are collinear"
+        raise np.linalg.LinAlgError(msg)
+
+
+def independent_columns(
+    A: np.ndarray, cols, *, tol: float = 1 / _MAX_CONDITION, block_size: int = 2**16
+) -> np.ndarray:
+    """
+    Return the columns of A that are not collinear with the previous ones.
+
+    A column is kept if its distance to the span of the columns kept before it
+    is not negligible, so the intercept and the first of several duplicated
+    columns are kept.
+
+    Parameters
+    ----------
+    A : np.ndarray
+        The design matrix.
+    cols : array-like of int
+        The candidate columns, in order of preference.
+    tol : float, optional
+        Minimum squared sine of the angle between a kept column and the span of
+        the previous ones. Default is 1e-10.
+    block_size : int, optional
+        Number of rows processed at a time. Default is 65536.
+
+    Returns
+    -------
+    np.ndarray
+        The kept columns, a subset of `cols` in the same order.
+
+    """
+    cols = np.asarray(cols)
+    gram = np.zeros((len(cols), len(cols)))
+    for rows in _blocks(A.shape[0], block_size):
+        Ab = A[rows, cols].astype(np.float64)
+        gram += Ab.T @ Ab
+
+    # incremental Cholesky factor of the Gram matrix of the kept columns
+    keep = []
+    chol = np.zeros((0, 0))
+    for i in range(len(cols)):
+        z = linalg.solve_triangular(chol, gram[keep, i], lower=True)
+        residual = gram[i, i] - z @ z
+        if gram[i, i] > 0 and residual > tol * gram[i, i]:
+            k = len(keep)
+            chol = np.block(
+                [[chol, np.zeros((k, 1))], [z[None, :], np.sqrt([[residual]])]]
+            )
+            keep.append(i)
+
+    return cols[keep]
+
+
+def newton(
+    blocks, coef: np.ndarray, *, max_iter: int = 50, tol: float = 1e-8
+) -> tuple[np.ndarray, np.ndarray, float, int]:
+    """
+    Maximize the logistic log-likelihood by Newton's method, i.e. IRLS.
+
+    Parameters
+    ----------
+    blocks : callable
+        Called once per iteration, returns an iterator of (X, y, weights)
+        blocks of rows, X being float64 and weights possibly None.
+    coef : np.ndarray
+        The starting coefficients.
+    max_iter : int, optional
+        Maximum number of iterations. Default is 50.
+    tol : float, optional
+        The fit stops when no coefficient moves by more than `tol`. Default is
+        1e-8.
+
+    Returns
+    -------
+    tuple
+        The coefficients, their covariance matrix, the log-likelihood and the
+        number of iterations.
+
+    Raises
+    ------
+    numpy.linalg.LinAlgError
+        If the Fisher information is singular or nearly so, e.g. because of
+        duplicated or collinear columns.
+
+    Warns
+    -----
+    sklearn.exceptions.ConvergenceWarning
+        If the coefficients still move by more than `tol` after `max_iter`
+        iterations.
+
+    """
+    for n_iter in range(1, max_iter + 1):  # noqa: B007
+        loglik, grad, info = _accumulate(blocks, coef)
+        _check_conditioning(info)
+        step = np.linalg.solve(info, grad)
+        coef = coef + step
+        if np.max(np.abs(step)) < tol:
+            break
+    else:
+        msg = (
+            f"IRLS did not converge in {max_iter} iterations, the largest step "
+            f"was {np.max(np.abs(step)):.3g}; increase max_iter, or check for "
+            "separation of the target by the features"
+        )
+        warnings.warn(msg, ConvergenceWarning, stacklevel=2)
+
+    return coef, np.linalg.inv(info), loglik, n_iter
+
+
+def irls(
+    A: np.ndarray,
+    y: np.ndarray,
+    cols,
+    *,
+    weights: np.ndarray | None = None,
+    coef: np.ndarray | None = None,
+    max_iter: int = 50,
+    tol: float = 1e-8,
+    block_size: int = 2**16,
+) -> LogisticFit:
+    """
+    Fit a logistic regression on some columns of a design matrix by IRLS.
+
+    Parameters
+    ----------
+    A : np.ndarray
+        The design matrix, e.g. from `design_matrix`.
+    y : np.ndarray
+        The binary target.
+    cols : array-like of int
+        The columns of A used by the model, including the intercept column.
+    weights : np.ndarray, optional
+        The sample weights.
+    coef : np.ndarray, optional
+        The starting coefficients, e.g. those of a nested model. Default is 0.
+    max_iter : int, optional
+        Maximum number of iterations. Default is 50.
+    tol : float, optional
+        The fit stops when no coefficient moves by more than `tol`. Default is
+        1e-8.
+    block_size : int, optional
+        Number of rows processed at a time. Default is 65536.
+
+    Returns
+    -------
+    LogisticFit
+        The fitted model.
+
+    Raises
+    ------
+    numpy.linalg.LinAlgError
+        If the columns are collinear, see `newton`.
+
+    """
+    cols = np.asarray(cols)
+    coef = np.zeros(len(cols)) if coef is None else np.asarray(coef, dtype=np.float64)
+
+    def blocks():
+        # only a block of the selected columns is copied at a time
+        for rows in _blocks(A.shape[0], block_size):
+            wb = None if weights is None else weights[rows]
+            yield A[rows, cols].astype(np.float64), y[rows], wb
+
+    coef, cov, loglik, n_iter = newton(blocks, coef, max_iter=max_iter, tol=tol)
+
+    n_obs = len(y) if weights is None else float(np.sum(weights))
+    return LogisticFit(cols, coef, cov, loglik, n_obs, n_iter)
+
+
+def score_test(
+    A: np.ndarray,
+    y: np.ndarray,
+    fit: LogisticFit,
+    candidates,
+    *,
+    weights: np.ndarray | None = None,
+    block_size: int = 2**16,
+) -> np.ndarray:
+    """
+    Return the score test statistics of adding each candidate column to a fit.
+
+    The statistics of all the candidates are computed in a single pass over
+    the rows, without fitting any of the extended models.
+
+    Parameters
+    ----------
+    A : np.ndarray
+        The design matrix.
+    y : np.ndarray
+        The binary target.
+    fit : LogisticFit
+        The current model.
+    candidates : array-like of int
+        The columns of A to test.
+    weights : np.ndarray, optional
+        The sample weights.
+    block_size : int, optional
+        Number of rows processed at a time. Default is 65536.
+
+    Returns
+    -------
+    np.ndarray
+        The statistics, chi-squared with one degree of freedom under the null
+        hypothesis that the candidate's coefficient is 0.
+
+    """
+    candidates = np.asarray(candidates)
+    k = len(candidates)
+    u = np.zeros(k)
+    info_cc = np.zeros(k)
+    info_cb = np.zeros((k, len(fit.cols)))
+    for rows in _blocks(A.shape[0], block_size):
+        Xb = A[rows, fit.cols].astype(np.float64)
+        Xc = A[rows, candidates].astype(np.float64)
+        mu = 1 / (1 + np.exp(-(Xb @ fit.coef)))
+        w = mu * (1 - mu)
+        r = y[rows] - mu
+        if weights is not None:
+            w *= weights[rows]
+            r *= weights[rows]
+        u += Xc.T @ r
+        info_cc += (Xc * Xc * w[:, None]).sum(axis=0)
+        info_cb += Xc.T @ (Xb * w[:, None])
+
+    # variance of the score of each candidate given the fitted coefficients
+    var = info_cc - np.einsum("ij,ij->i", info_cb @ fit.cov, info_cb)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(var > 0, u**2 / var, 0.0)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import functools
+import sys
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING
+
+import polars as pl
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+_PROFILER: ContextVar[Profiler | None] = ContextVar("profiler", default=None)
+_RECORD: ContextVar[ProfileRecord | None] = ContextVar("record", default=None)
+
+
+def _peak_rss_mb() -> float | None:
+    # the resource module is not available on Windows
+    if sys.platform == "win32":
+        return None
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _frame_shape(args) -> tuple[int | None, int | None]:
+    for arg in args:
+        if isinstance(arg, pl.DataFrame):
+            return arg.height, arg.width
+        if isinstance(arg, pl.LazyFrame):
+            return None, arg.collect_schema().len()
+    return None, None
+
+
+@dataclass
+class ProfileRecord:
+    """
+    Measurements of a single profiled call.
+
+    Attributes
+    ----------
+    name : str
+        The profiled call, e.g. ``"WOETransformer.fit"`` or ``"cal_iv"``.
+    wall_time : float
+        Elapsed wall time in seconds.
+    n_rows : int or None
+        Number of rows of the input frame, None for a LazyFrame.
+    n_cols : int or None
+        Number of columns of the input frame.
+    peak_rss_mb : float or None
+        Peak resident memory of the process in MB when the call returned, None
+        on Windows.
+    rss_increase_mb : float or None
+        Growth of the peak resident memory during the call, in MB. Zero means the
+        call stayed below the peak previously reached by the process. None on
+        Windows.
+    depth : int
+        Nesting level, 0 for calls made directly by the user.
+    query_plans : list[str]
+        Optimized Polars query plans of the queries collected by the call.
+
+    """
+
+    name: str
+    wall_time: float = 0.0
+    n_rows: int | None = None
+    n_cols: int | None = None
+    peak_rss_mb: float | None = 0.0
+    rss_increase_mb: float | None = 0.0
+    depth: int = 0
+    query_plans: list[str] = field(default_factory=list)
+
+
+class Profiler:
+    """
+    Context manager recording the fit/transform calls made inside it.
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Called with each finished `ProfileRecord`, e.g. to forward the
+        measurements to a metrics system.
+    explain : bool, optional
+        Whether to record the optimized query plans. Default is True.
+
+    Attributes
+    ----------
+    records : list[ProfileRecord]
+        The finished records, in completion order.
+
+    Examples
+    --------
+    >>> from polars_credit.util.profile import profile
+    >>> from polars_credit.woe import WOETransformer
+    >>> with profile() as prof:
+    ...     woe = WOETransformer().fit(X, y)
+    >>> prof.to_frame()
+    >>> woe.fit_profile_.wall_time
+
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[ProfileRecord], None] | None = None,
+        *,
+        explain: bool = True,
+    ):
+        self.callback = callback
+        self.explain = explain
+        self.records = []
+
+    def __enter__(self):
+        self._token = _PROFILER.set(self)
+        return self
+
+    def __exit__(self, *exc):
+        _PROFILER.reset(self._token)
+
+    def _run(self, name: str, func, args, kwargs):
+        parent = _RECORD.get()
+        n_rows, n_cols = _frame_shape(args)
+        record = ProfileRecord(
+            name=name,
+            n_rows=n_rows,
+            n_cols=n_cols,
+            depth=0 if parent is None else parent.depth + 1,
+        )
+
+        token = _RECORD.set(record)
+        rss_before = _peak_rss_mb()
+        start = time.perf_counter()
+        try:
+            output = func(*args, **kwargs)
+        finally:
+            record.wall_time = time.perf_counter() - start
+            record.peak_rss_mb = _peak_rss_mb()
+            if rss_before is not None:
+                record.rss_increase_mb = record.peak_rss_mb - rss_before
+            else:
+                record.rss_increase_mb = None
+            _RECORD.reset(token)
+
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+        return output, record
+
+    def to_frame(self) -> pl.DataFrame:
+        """Return the records as a DataFrame, one row per profiled call."""
+        return pl.DataFrame([asdict(record) for record in self.records])
+
+
+def profile(
+    callback: Callable[[ProfileRecord], None] | None = None,
+    *,
+    explain: bool = True,
+) -> Profiler:
+    """
+    Profile the polars_credit calls made inside a ``with`` block.
+
+    Profiling is off by default and costs nothing outside of this context
+    manager. Inside it, every fit and transform of the WOE transformer, the
+    binners and the feature selectors, as well as the `util.divergence`
+    functions, record wall time, input shape, peak memory and query plans.
+    Fitted estimators also expose the record of their last fit as
+    ``fit_profile_``.
+
+    Parameters
+    ----------
+    callback : callable, optional
+        Called with each finished `ProfileRecord`.
+    explain : bool, optional
+        Whether to record the optimized query plans. Default is True.
+
+    Returns
+    -------
+    Profiler
+        The context manager, holding the records once the block has run.
+
+    """
+    return Profiler(callback, explain=explain)
+
+
+def profiled(func):
+    """Record calls of ``func`` when a `Profiler` is active."""
+    is_method = "." in func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = _PROFILER.get()
+        if profiler is None:
+            return func(*args, **kwargs)
+
+        if is_method:
+            owner = args[0]
+            name = f"{type(owner).__name__}.{func.__name__}"
+        else:
+            name = func.__name__
+
+        output, record = profiler._run(name, func, args, kwargs)
+        if is_method and func.__name__ == "fit":
+            owner.fit_profile_ = record
+
+        return output
+
+    return wrapper
+
+
+def _explain(lf: pl.LazyFrame):
+    profiler = _PROFILER.get()
+    record = _RECORD.get()
+    if profiler is not None and profiler.explain and record is not None:
+        record.query_plans.append(lf.explain())
+
+
+def collect(lf: pl.LazyFrame) -> pl.DataFrame:
+    """Collect ``lf``, recording its query plan when profiling."""
+    _explain(lf)
+    return lf.collect()
+
+
+def collect_like(X: pl.DataFrame | pl.LazyFrame, lf: pl.LazyFrame):
+    """Collect ``lf`` if ``X`` is a DataFrame, keep it lazy if ``X`` is a LazyFrame."""
+    if isinstance(X, pl.LazyFrame):
+        return lf
+    return collect(lf)
+
+
+def collect_all(lfs: Iterable[pl.LazyFrame]) -> list[pl.DataFrame]:
+    """Collect ``lfs`` in parallel, recording their query plans when profiling."""
+    lfs = list(lfs)
+    for lf in lfs:
+        _explain(lf)
+    return pl.collect_all(lfs)
@@ -1,8 +1,26 @@
 from __future__ import annotations
 
+import numpy as np
 import polars as pl
 from sklearn.base import BaseEstimator, TransformerMixin
 
+from polars_credit.util.cache import cached_fit, get_count_tables
+from polars_credit.util.profile import collect, collect_all, collect_like, profiled
+
+
+def _woe_from_counts(table: pl.DataFrame, y: str, x: str) -> pl.DataFrame:
+    # same result as get_woe, from a contingency table with an 'n' column
+    return (
+        table.group_by(x)
+        .agg(
+            pl.col("n").filter(pl.col(y).eq(0)).sum().alias("good"),
+            pl.col("n").filter(pl.col(y).eq(1)).sum().alias("bad"),
+        )
+        .with_columns(pl.col("good", "bad") / pl.col("good", "bad").sum())
+        .with_columns((pl.col("bad") / pl.col("good")).log().alias("woe"))
+        .sort(x)
+    )
+
 
 def get_woe(df: pl.DataFrame, y: str, x: str) -> pl.DataFrame:
     """
@@ -52,6 +70,136 @@ def get_woe(df: pl.DataFrame, y: str, x: str) -> pl.DataFrame:
     return df_woe
 
 
+_ORDINAL_DTYPES = frozenset({pl.UInt8, pl.UInt16})
+
+
+def _is_ordinal(x: str, df_woe: pl.DataFrame) -> bool:
+    # bin ordinals are 0..k-1; a raw UInt8/UInt16 feature with other values,
+    # e.g. a code list, is mapped by value instead
+    if df_woe[x].dtype not in _ORDINAL_DTYPES:
+        return False
+    keys = df_woe[x].drop_nulls().sort()
+    return keys.to_list() == list(range(len(keys)))
+
+
+def _dense_woe(x: str, df_woe: pl.DataFrame) -> tuple[pl.Series, float | None]:
+    # WOE indexed by bin ordinal, null for ordinals unseen during fit, and the
+    # WOE of nulls if any
+    df_dense = df_woe.drop_nulls(x)
+    # empty when the feature was null on every row during fit
+    n_ordinals = 0 if df_dense.is_empty() else df_dense[x].max() + 1
+    woe = pl.Series([None] * n_ordinals, dtype=pl.Float64)
+    woe = woe.scatter(df_dense[x], df_dense["woe"])
+    null_woe = df_woe.filter(pl.col(x).is_null())["woe"]
+    return woe, null_woe.item() if len(null_woe) else None
+
+
+def _replace_woe(x: str, df_woe: pl.DataFrame) -> pl.Expr:
+    values = df_woe[x]
+    if _is_ordinal(x, df_woe):
+        # bin ordinals index a dense array of WOE values directly
+        woe, null_woe = _dense_woe(x, df_woe)
+        # ordinals beyond the table, unseen during fit, are null
+        ordinal = pl.col(x)
+        if woe.is_empty():
+            expr = pl.lit(None, dtype=pl.Float64)
+        else:
+            expr = pl.when(ordinal < len(woe)).then(
+                pl.lit(woe).gather(ordinal.clip(upper_bound=len(woe) - 1))
+            )
+        if null_woe is not None:
+            expr = expr.fill_null(pl.when(pl.col(x).is_null()).then(null_woe))
+        return expr.alias(x)
+    if values.dtype == pl.Categorical:
+        # categoricals produced by separate calls, e.g. binning new data, do not
+        # share a string cache, so they are matched on their labels
+        return (
+            pl.col(x)
+            .cast(pl.String)
+            .replace_strict(values.cast(pl.String), df_woe["woe"])
+        )
+    return pl.col(x).replace_strict(values, df_woe["woe"])
+
+
+def _key_expr(x: str, dtype: pl.DataType) -> pl.Expr:
+    if isinstance(dtype, (pl.Categorical, pl.Enum)):
+        return pl.col(x).to_physical()
+    return pl.col(x)
+
+
+def get_woe_long(df: pl.LazyFrame, y: str, xs: list[str]) -> list[pl.LazyFrame]:
+    """
+    Calculate the Weight of Evidence (WOE) of many features in long format.
+
+    Instead of one query per feature, the features are unpivoted into
+    (variable, value, target) rows and the good/bad counts of all features are
+    computed in a single grouped aggregation. Features whose values share a
+    physical dtype are aggregated together, so the number of aggregations
+    depends on the number of distinct dtypes, not on the number of features.
+    The unpivoted frame holds one row per row and feature, so this trades the
+    planning overhead of many queries for memory.
+
+    Parameters
+    ----------
+    df : pl.LazyFrame
+        The input LazyFrame containing both the features and target variable.
+    y : str
+        The name of the binary target variable column (0 or 1).
+    xs : list[str]
+        The names of the feature columns for which WOE is calculated.
+
+    Returns
+    -------
+    list[pl.LazyFrame]
+        One LazyFrame per physical dtype with the following columns:
+        - 'variable': The name of the feature
+        - 'value': The value of the feature, in its physical representation
+        - 'row': The index of a row holding that value
+        - 'woe': The calculated Weight of Evidence for each value
+
+    """
+    schema = df.collect_schema()
+    df_key = df.select(
+        pl.col(y),
+        pl.int_range(pl.len(), dtype=pl.UInt32).alias("__row"),
+        *(_key_expr(x, schema[x]) for x in xs),
+    )
+    key_schema = df_key.collect_schema()
+
+    groups = {}
+    for x in xs:
+        groups.setdefault(key_schema[x], []).append(x)
+
+    ls_woe = []
+    for cols in groups.values():
+        # the features are keyed by their name, as an Enum so that grouping does
+        # not hash the repeated 'variable' strings
+        feature = pl.col("variable").cast(pl.Enum(cols))
+
+        df_woe = (
+            df_key.unpivot(cols, index=[y, "__row"])
+            .select(feature.alias("feature"), "value", y, "__row")
+            .group_by("feature", "value")
+            .agg(
+                pl.col(y).eq(0).sum().alias("good"),
+                pl.col(y).eq(1).sum().alias("bad"),
+                pl.col("__row").first().alias("row"),
+            )
+            .with_columns(
+                pl.col("good", "bad") / pl.col("good", "bad").sum().over("feature")
+            )
+            .select(
+                pl.col("feature").cast(pl.String).alias("variable"),
+                "value",
+                "row",
+                (pl.col("bad") / pl.col("good")).log().alias("woe"),
+            )
+        )
+        ls_woe.append(df_woe)
+
+    return ls_woe
+
+
 class WOETransformer(BaseEstimator, TransformerMixin):
     """
     A transformer that applies Weight of Evidence (WOE) encoding to features.
@@ -60,12 +208,28 @@ class WOETransformer(BaseEstimator, TransformerMixin):
     variables into continuous variables based on their relationship with a binary
     target variable. It's particularly useful in credit scoring and risk modeling.
 
+    Parameters
+    ----------
+    method : {"auto", "per_column", "long"}, optional
+        How the WOE mappings are computed during fit. "per_column" runs one query
+        per feature, "long" unpivots the features and computes all mappings in a
+        single grouped aggregation (see `get_woe_long`), which avoids the planning
+        overhead of thousands of queries on very wide data but materializes rows
+        times columns values. "auto" uses "long" when X has more than
+        `wide_threshold` columns. Default is "per_column".
+    wide_threshold : int, optional
+        Number of columns above which "auto" switches to "long". Default is 1000.
+    segment_col : str, optional
+        A column of X splitting the rows into segments, e.g. product lines. The
+        WOE of every segment is fitted by a single grouped aggregation per
+        feature, and each row is encoded with the WOE of its segment.
+
     Attributes
     ----------
     woe_maps : dict
         A dictionary storing the WOE mappings for each feature. Keys are feature
         names, and values are DataFrames containing the original values and their
-        corresponding WOE values.
+        corresponding WOE values, preceded by the segment with a `segment_col`.
 
     Methods
     -------
@@ -73,6 +237,8 @@ class WOETransformer(BaseEstimator, TransformerMixin):
         Compute the WOE mappings for each feature in X with respect to y.
     transform(X)
         Transform the input features using the computed WOE mappings.
+    oof_fit_transform(X, y, folds=5)
+        Fit the mappings and return the out-of-fold WOE of X.
 
     Examples
     --------
@@ -92,6 +258,92 @@ class WOETransformer(BaseEstimator, TransformerMixin):
     This transformer uses lazy evaluation for efficiency and can handle large datasets.
     """
 
+    def __init__(
+        self,
+        *,
+        method: str = "per_column",
+        wide_threshold: int = 1000,
+        segment_col: str | None = None,
+    ):
+        self.method = method
+        self.wide_threshold = wide_threshold
+        self.segment_col = segment_col
+
+    def _use_long_format(self, X: pl.DataFrame) -> bool:
+        if self.method not in {"auto", "per_column", "long"}:
+            msg = f"method must be 'auto', 'per_column' or 'long', got {self.method!r}"
+            raise ValueError(msg)
+
+        if self.method == "auto":
+            return X.width > self.wide_threshold
+        return self.method == "long"
+
+    def _fit_long(self, X: pl.DataFrame, y: pl.Series) -> dict:
+        df = X.with_columns(y).lazy()
+        ls_woe_lazy = [
+            df_woe.select("variable", "row", "woe")
+            for df_woe in get_woe_long(df, y.name, X.columns)
+        ]
+        df_woe = pl.concat(collect_all(ls_woe_lazy))
+        dict_woe = df_woe.partition_by("variable", as_dict=True, include_key=False)
+
+        woe_maps = {}
+        for x in X.columns:
+            df_x = dict_woe[(x,)]
+            woe_maps[x] = pl.DataFrame([X[x].gather(df_x["row"]), df_x["woe"]]).sort(x)
+
+        return woe_maps
+
+    def _fit_segmented(self, X: pl.DataFrame, y: pl.Series) -> dict:
+        seg = self.segment_col
+        xs = [x for x in X.columns if x != seg]
+        df = X.lazy().with_columns(y).drop_nulls(seg)
+
+        ls_woe = collect_all(
+            df.group_by(seg, x)
+            .agg(
+                pl.col(y.name).eq(0).sum().alias("good"),
+                pl.col(y.name).eq(1).sum().alias("bad"),
+            )
+            .with_columns(pl.col("good", "bad") / pl.col("good", "bad").sum().over(seg))
+            .select(seg, x, (pl.col("bad") / pl.col("good")).log().alias("woe"))
+            .sort(seg, x)
+            for x in xs
+        )
+        return dict(zip(xs, ls_woe))
+
+    def _transform_segmented(self, X: pl.DataFrame | pl.LazyFrame):
+        # one left join per feature on (segment, value), which keeps the order
+        # of the rows of X
+        seg = self.segment_col
+        X_woe = X.lazy()
+        schema = X_woe.collect_schema()
+        for x in schema.names():
+            if x not in self.woe_maps:
+                continue
+            df_woe = self.woe_maps[x].lazy()
+            key = pl.col(x)
+            if isinstance(schema[x], (pl.Categorical, pl.Enum)):
+                # labels, categoricals of separate calls not sharing a cache
+                key = key.cast(pl.String)
+            X_woe = (
+                X_woe.with_columns(key.alias("__key"))
+                .join(
+                    df_woe.select(
+                        seg, key.alias("__key"), pl.col("woe").alias("__woe")
+                    ),
+                    on=[seg, "__key"],
+                    how="left",
+                    join_nulls=True,
+                )
+                .with_columns(pl.col("__woe").alias(x))
+                .drop("__key", "__woe")
+            )
+
+        return collect_like(X, X_woe)
+
+    @profiled
+    @cached_fit
     def fit(self, X: pl.DataFrame, y: pl.Series):
         """
         Compute the Weight of Evidence (WOE) mappings for each feature.
@@ -119,8 +371,27 @@ class WOETransformer(BaseEstimator, TransformerMixin):
         and their corresponding WOE values.
 
         The WOE calculation is performed using lazy evaluation for efficiency.
+        With `method` "long", or "auto" on data wider than `wide_threshold`
+        columns, all mappings are computed in a single long-format aggregation,
+        with identical results. Inside an active
+        `util.cache.ContingencyCache`, the mappings are derived from the shared
+        contingency tables.
         """
-        self.woe_maps = {}
+        if self.segment_col is not None:
+            self.woe_maps = self._fit_segmented(X, y)
+            return self
+
+        tables = get_count_tables(X.with_columns(y), y.name, X.columns)
+        if tables is not None:
+            self.woe_maps = {
+                x: _woe_from_counts(table, y.name, x).select(x, "woe")
+                for x, table in zip(X.columns, tables)
+            }
+            return self
+
+        if self._use_long_format(X):
+            self.woe_maps = self._fit_long(X, y)
+            return self
 
         df = X.with_columns(y).lazy()
 
@@ -128,12 +399,121 @@ class WOETransformer(BaseEstimator, TransformerMixin):
             get_woe(df, y.name, x).select(pl.col(x), pl.col("woe")) for x in X.columns
         ]
 
-        ls_woe = pl.collect_all(ls_woe_lazy)
+        ls_woe = collect_all(ls_woe_lazy)
 
         self.woe_maps = dict(zip(X.columns, ls_woe))
         return self
 
-    def transform(self, X: pl.DataFrame):
+    @profiled
+    def oof_fit_transform(
+        self,
+        X: pl.DataFrame,
+        y: pl.Series,
+        *,
+        folds: int | pl.Series = 5,
+        seed: int | None = None,
+    ) -> pl.DataFrame:
+        """
+        Fit the WOE mappings and return the out-of-fold WOE values of X.
+
+        The rows are split into folds and each row is encoded with the WOE
+        fitted on the other folds, so a model trained on the output does not
+        see its own target leak through the encoding. Instead of K fits, the
+        good/bad counts of each (value, fold) pair are computed by a single
+        aggregation per feature: the counts outside a fold are the totals minus
+        the counts of the fold, so the cost is close to that of a single fit.
+        The rows are then mapped by one join on (value, fold).
+
+        Parameters
+        ----------
+        X : pl.DataFrame
+            The input DataFrame containing the features to be encoded.
+        y : pl.Series
+            The binary target variable.
+        folds : int | pl.Series, optional
+            The number of random folds, or the fold of each row, e.g. a month
+            for a time-based split. Default is 5.
+        seed : int, optional
+            The seed of the random fold assignment.
+
+        Returns
+        -------
+        pl.DataFrame
+            X with every feature replaced by its out-of-fold WOE. A value absent
+            from all the other folds is null, like a value unseen during fit.
+
+        Raises
+        ------
+        ValueError
+            If there are fewer than 2 folds, or `segment_col` is set.
+
+        Notes
+        -----
+        `woe_maps` is fitted on all the rows, so `transform` encodes new data as
+        after `fit`.
+
+        """
+        if self.segment_col is not None:
+            msg = "out-of-fold encoding is not supported with segment_col"
+            raise ValueError(msg)
+        if isinstance(folds, pl.Series):
+            fold = folds
+            n_folds = folds.n_unique()
+        else:
+            # drawn once, so that the counts and the join see the same folds
+            n_folds = folds
+            fold = pl.int_range(X.height, dtype=pl.UInt32, eager=True).shuffle(seed)
+            fold = fold % folds
+        if n_folds < 2:
+            msg = f"at least 2 folds are needed, got {n_folds}"
+            raise ValueError(msg)
+
+        df = X.lazy().with_columns(y, fold.alias("__fold"))
+        ls_counts = collect_all(
+            df.group_by(x, "__fold").agg(
+                pl.col(y.name).eq(0).sum().alias("good"),
+                pl.col(y.name).eq(1).sum().alias("bad"),
+            )
+            for x in X.columns
+        )
+
+        good, bad = pl.col("good"), pl.col("bad")
+        ls_oof = []
+        self.woe_maps = {}
+        for x, df_counts in zip(X.columns, ls_counts):
+            self.woe_maps[x] = (
+                df_counts.group_by(x)
+                .agg(good.sum(), bad.sum())
+                .with_columns(pl.col("good", "bad") / pl.col("good", "bad").sum())
+                .select(x, (bad / good).log().alias("woe"))
+                .sort(x)
+            )
+
+            # counts of the other folds: totals minus the counts of the fold
+            good_out = good.sum().over(x) - good
+            bad_out = bad.sum().over(x) - bad
+            df_oof = df_counts.select(
+                x,
+                "__fold",
+                pl.when(good_out + bad_out > 0)
+                .then(
+                    (
+                        (bad_out / (bad.sum() - bad.sum().over("__fold")))
+                        / (good_out / (good.sum() - good.sum().over("__fold")))
+                    ).log()
+                )
+                .alias("__woe"),
+            )
+            ls_oof.append(
+                df.select(x, "__fold")
+                .join(df_oof.lazy(), on=[x, "__fold"], how="left", join_nulls=True)
+                .select(pl.col("__woe").alias(x))
+            )
+
+        return pl.concat(collect_all(ls_oof), how="horizontal")
+
+    @profiled
+    def transform(self, X: pl.DataFrame | pl.LazyFrame):
         """
         Transform the input DataFrame using the computed WOE mappings.
 
@@ -142,13 +522,14 @@ class WOETransformer(BaseEstimator, TransformerMixin):
 
         Parameters
         ----------
-        X : pl.DataFrame
+        X : pl.DataFrame | pl.LazyFrame
             The input DataFrame to be transformed.
 
         Returns
         -------
-        pl.DataFrame
-            A new DataFrame with all features transformed to their WOE values.
+        pl.DataFrame | pl.LazyFrame
+            A new DataFrame with all fitted features transformed to their WOE values,
+            lazy if X is a LazyFrame. Columns unseen during fit are left unchanged.
 
         Notes
         -----
@@ -158,10 +539,100 @@ class WOETransformer(BaseEstimator, TransformerMixin):
         it will be replaced with a null value.
 
         The transformation is performed using Polars' efficient column operations.
+        With a `segment_col`, rows of segments unseen during fit are null too.
         """
-        X_woe = X.with_columns(
-            pl.col(x).replace_strict(self.woe_maps[x][x], self.woe_maps[x]["woe"])
-            for x in X.columns
+        if self.segment_col is not None:
+            return self._transform_segmented(X)
+
+        X_woe = X.lazy().with_columns(
+            _replace_woe(x, self.woe_maps[x])
+            for x in X.lazy().collect_schema().names()
+            if x in self.woe_maps
         )
 
-        return X_woe
+        return collect_like(X, X_woe)
+
+    @profiled
+    def transform_numpy(
+        self,
+        X: pl.DataFrame | pl.LazyFrame,
+        *,
+        out: np.ndarray | None = None,
+        order: str = "F",
+        dtype=np.float32,
+        fill_value: float = 0.0,
+    ) -> np.ndarray:
+        """
+        Write the WOE values of X into a single NumPy matrix.
+
+        Unlike ``transform(X).to_numpy()``, no WOE DataFrame is built and no
+        float64 copy is made: each feature is mapped and written into its
+        column of the preallocated output, so the peak memory is the output plus
+        a single column. Bin ordinals (UInt8/UInt16 columns fitted on the values
+        0..k-1, see the binners' ``output="index"``) are looked up with
+        `np.take` straight into the output.
+
+        Parameters
+        ----------
+        X : pl.DataFrame | pl.LazyFrame
+            The input DataFrame to be transformed. A LazyFrame is collected first.
+        out : np.ndarray, optional
+            The (n_rows, n_features) output, e.g. a `np.memmap`. Allocated if
+            None.
+        order : {"F", "C"}, optional
+            Memory layout of an allocated output. "F" (column-major) makes each
+            column write contiguous. Default is "F".
+        dtype : np.dtype, optional
+            Data type of an allocated output. Default is float32.
+        fill_value : float, optional
+            Value written for nulls without a WOE of their own and for bin
+            ordinals unseen during fit. Default is 0.0.
+
+        Returns
+        -------
+        np.ndarray
+            The output, with one column per fitted feature of X, in the order of
+            the columns of X.
+
+        Raises
+        ------
+        ValueError
+            If `out` does not have the shape (n_rows, n_features).
+
+        """
+        if isinstance(X, pl.LazyFrame):
+            X = collect(X)
+        features = [x for x in X.columns if x in self.woe_maps]
+        if self.segment_col is not None:
+            # segmented maps are joined, then the WOE columns are copied
+            X = self._transform_segmented(X)
+
+        shape = (X.height, len(features))
+        if out is None:
+            out = np.empty(shape, dtype=dtype, order=order)
+        elif out.shape != shape:
+            msg = f"out must have the shape {shape}, got {out.shape}"
+            raise ValueError(msg)
+
+        for j, x in enumerate(features):
+            df_woe = self.woe_maps[x]
+            if self.segment_col is not None:
+                out[:, j] = X[x].fill_null(fill_value).to_numpy()
+            elif X[x].dtype in _ORDINAL_DTYPES and _is_ordinal(x, df_woe):
+                woe, null_woe = _dense_woe(x, df_woe)
+                # a leading entry for nulls and a trailing one that ordinals
+                # beyond the table are clipped to
+                lookup = np.concatenate(
+                    [
+                        [fill_value if null_woe is None else null_woe],
+                        woe.fill_null(fill_value).to_numpy(),
+                        [fill_value],
+                    ]
+                ).astype(out.dtype)
+                codes = (X[x].cast(pl.UInt32) + 1).fill_null(0).to_numpy()
+                np.take(lookup, codes, out=out[:, j], mode="clip")
+            else:
+                col = X.select(_replace_woe(x, df_woe)).to_series()
+                out[:, j] = col.fill_null(fill_value).to_numpy()
+
+        return out
@@ -0,0 +1,141 @@
+use polars::prelude::*;
+use pyo3_polars::derive::polars_expr;
+use serde::Deserialize;
+
+#[derive(Deserialize)]
+struct BinIndexKwargs {
+    breaks: Vec<Vec<f64>>,
+}
+
+fn bin_index_type(input_fields: &[Field]) -> PolarsResult<Field> {
+    let fields: Vec<Field> = input_fields
+        .iter()
+        .map(|f| Field::new(f.name(), DataType::UInt16))
+        .collect();
+    Ok(Field::new("bin_index", DataType::Struct(fields)))
+}
+
+/// Number of breaks strictly lower than `value`, i.e. the index of the
+/// right-closed bin `(breaks[i - 1], breaks[i]]` holding it.
+///
+/// The loop always runs `log2(len)` iterations and the comparison is turned
+/// into a conditional move, so there is no data dependent branch to mispredict.
+#[inline]
+fn search_sorted(breaks: &[f64], value: f64) -> u16 {
+    let mut n = breaks.len();
+    if n == 0 {
+        return 0;
+    }
+
+    let mut base = 0usize;
+    while n > 1 {
+        let half = n / 2;
+        base = if breaks[base + half - 1] < value {
+            base + half
+        } else {
+            base
+        };
+        n -= half;
+    }
+
+    (base + (breaks[base] < value) as usize) as u16
+}
+
+/// The bin of `value`, none for NaN like `Expr.cut`, which has no bin for it.
+#[inline]
+fn bin_of(breaks: &[f64], value: f64) -> Option<u16> {
+    if value.is_nan() {
+        None
+    } else {
+        Some(search_sorted(breaks, value))
+    }
+}
+
+fn bin_index(s: &Series, breaks: &[f64]) -> PolarsResult<Series> {
+    polars_ensure!(
+        breaks.len() < u16::MAX as usize,
+        ComputeError: "too many breakpoints for column '{}'", s.name()
+    );
+
+    let s_f64 = s.cast(&DataType::Float64)?;
+    let ca = s_f64.f64()?;
+
+    let mut out: UInt16Chunked = ca
+        .into_iter()
+        .map(|opt_v| opt_v.and_then(|v| bin_of(breaks, v)))
+        .collect();
+    out.rename(s.name());
+
+    Ok(out.into_series())
+}
+
+#[polars_expr(output_type_func=bin_index_type)]
+fn pl_bin_index(inputs: &[Series], kwargs: BinIndexKwargs) -> PolarsResult<Series> {
+    polars_ensure!(
+        inputs.len() == kwargs.breaks.len(),
+        ComputeError: "expected one list of breakpoints per column"
+    );
+
+    let columns = inputs
+        .iter()
+        .zip(kwargs.breaks.iter())
+        .map(|(s, breaks)| bin_index(s, breaks))
+        .collect::<PolarsResult<Vec<Series>>>()?;
+
+    let df = DataFrame::new(columns)?;
+    Ok(df.into_struct("bin_index").into_series())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::{bin_of, search_sorted};
+
+    #[test]
+    fn test_search_sorted_matches_right_closed_bins() {
+        let breaks = [1.0, 2.0, 3.5];
+        let cases = [
+            (f64::NEG_INFINITY, 0),
+            (0.5, 0),
+            (1.0, 0),
+            (1.5, 1),
+            (2.0, 1),
+            (3.0, 2),
+            (3.5, 2),
+            (4.0, 3),
+            (f64::INFINITY, 3),
+        ];
+        for (value, expected) in cases {
+            assert_eq!(search_sorted(&breaks, value), expected, "value {value}");
+        }
+        assert_eq!(search_sorted(&[], 1.0), 0);
+        assert_eq!(search_sorted(&[2.0], 1.0), 0);
+        assert_eq!(search_sorted(&[2.0], 3.0), 1);
+    }
+
+    #[test]
+    fn test_search_sorted_edges() {
+        // every power of two length and its neighbours, on and between breaks
+        for len in 1..=17 {
+            let breaks: Vec<f64> = (0..len).map(|i| i as f64).collect();
+            for i in 0..len {
+                let value = i as f64;
+                assert_eq!(search_sorted(&breaks, value), i as u16, "len {len}");
+                assert_eq!(search_sorted(&breaks, value + 0.5), i as u16 + 1);
+            }
+            assert_eq!(search_sorted(&breaks, -0.5), 0);
+            assert_eq!(search_sorted(&breaks, f64::MAX), len as u16);
+        }
+        assert_eq!(search_sorted(&[0.0], -0.0), 0);
+        assert_eq!(search_sorted(&[f64::NEG_INFINITY], f64::NEG_INFINITY), 0);
+        assert_eq!(search_sorted(&[f64::INFINITY], f64::INFINITY), 0);
+    }
+
+    #[test]
+    fn test_bin_of_nan_is_none() {
+        let breaks = [1.0, 2.0];
+        assert_eq!(bin_of(&breaks, f64::NAN), None);
+        assert_eq!(bin_of(&[], f64::NAN), None);
+        assert_eq!(bin_of(&breaks, 1.5), Some(1));
+        assert_eq!(bin_of(&breaks, f64::INFINITY), Some(2));
+    }
+}
@@ -1,3 +1,4 @@
+mod bin;
 mod woe;
 use pyo3::types::PyModule;
 use pyo3::{pymodule, Bound, PyResult};
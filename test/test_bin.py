@@ -1,6 +1,40 @@
+from contextlib import nullcontext
+
+import numpy as np
 import polars as pl
+import polars_credit
 import pytest
-from polars_credit.bin import get_qcut_breaks_expr
+from polars_credit.bin import (
+    CategoryBinner,
+    CustomBinner,
+    QuantileBinner,
+    _merge_adjacent,
+    get_qcut_breaks_expr,
+    quantile_grid,
+)
+from polars_credit.util.divergence import cal_iv
+
+rng = np.random.default_rng(0)
+# skewed, discrete and partly null features with a target driven by b
+X_num = pl.DataFrame(
+    {
+        "a": rng.lognormal(size=2000).round(2),
+        "b": rng.integers(0, 7, 2000),
+        "c": [None if i % 9 == 0 else float(i % 97) for i in range(2000)],
+    }
+)
+y_num = pl.Series(
+    "y", (rng.random(2000) < 0.1 + 0.05 * X_num["b"].to_numpy()).astype(int)
+)
+# a feature whose distribution shifts with the segment
+segment = rng.choice(["prime", "subprime", "thin"], 3000)
+X_seg = pl.DataFrame(
+    {
+        "segment": segment,
+        "a": rng.normal(size=3000) + 2 * (segment == "subprime"),
+        "b": [None if i % 7 == 0 else i % 20 for i in range(3000)],
+    }
+)
 
 
 @pytest.mark.parametrize(
@@ -22,3 +56,155 @@ def test_get_qcut_breaks_expr_parametrized(data, q, allow_duplicates, expected_l
     )
 
     assert len(result["col"][0]) == expected_len
+
+
+@pytest.mark.parametrize("native", [True, False])
+def test_binner_index_output(monkeypatch, native):
+    if not native:
+        monkeypatch.setattr(polars_credit, "_has_kernel", lambda name: False)
+    elif not polars_credit._has_kernel("pl_bin_index"):
+        pytest.skip("compiled plugin lacks pl_bin_index")
+
+    # NaN has no bin, like with cut
+    df = pl.DataFrame(
+        {"a": [0.5, 1.0, 1.5, None, 9.0, float("nan")], "b": [3, 2, 1, 0, None, 1]}
+    )
+    breakpoints = {"a": [1.0, 2.0], "b": [0.5]}
+
+    labels = CustomBinner(breakpoints).fit(df).transform(df)
+    binner = CustomBinner(breakpoints, output="index").fit(df)
+    result = binner.transform(df)
+
+    assert result.schema == {"a": pl.UInt8, "b": pl.UInt8}
+    for col in df.columns:
+        assert result[col].to_list() == labels[col].to_physical().to_list()
+        assert [binner.get_bin_labels()[col][i] for i in result[col].drop_nulls()] == (
+            labels[col].drop_nulls().cast(pl.String).to_list()
+        )
+
+    result = QuantileBinner(3, output="index").fit(df).transform(df)
+    assert result["a"].to_list() == [0, 0, 1, None, 2, None]
+
+
+def test_plugin_library_finds_windows_extension(monkeypatch, tmp_path):
+    (tmp_path / "__init__.py").touch()
+    (tmp_path / "_internal.pyd").touch()
+    monkeypatch.setattr(polars_credit, "LIB", tmp_path)
+
+    assert polars_credit._plugin_library() == tmp_path / "_internal.pyd"
+
+
+def test_category_binner():
+    df = pl.DataFrame(
+        {
+            "merchant": ["a"] * 4 + ["b"] * 4 + ["c"] * 4 + ["d", "e", None],
+            "n": range(15),
+        }
+    )
+    y = pl.Series("y", [0, 0, 0, 1] + [1, 1, 0, 1] + [0, 0, 0, 0] + [1, 1, 0])
+
+    binner = CategoryBinner(min_frequency=2, max_groups=3).fit(df, y)
+    assert binner.mapping_["merchant"]["level"].to_list() == [
+        "c",
+        "a",
+        "b",
+        "__other__",
+    ]
+
+    binner = CategoryBinner(min_frequency=2, max_groups=2).fit(df, y)
+    result = binner.transform(df.with_columns(pl.col("merchant").cast(pl.Categorical)))
+
+    assert result["n"].equals(df["n"])
+    assert result["merchant"].dtype == pl.Enum(["c|a", "b|__other__"])
+    assert result["merchant"].to_list() == ["c|a"] * 4 + ["b|__other__"] * 4 + [
+        "c|a"
+    ] * 4 + ["b|__other__"] * 2 + [None]
+
+    unseen = binner.transform(pl.LazyFrame({"merchant": ["z", "c"]})).collect()
+    assert unseen["merchant"].to_list() == ["b|__other__", "c|a"]
+
+
+def test_merge_adjacent_closest_rates():
+    # (levels, count, bad), sorted by target rate
+    groups = [(["a"], 8, 1), (["b"], 8, 2), (["c"], 8, 5), (["d"], 8, 6)]
+
+    # the gaps of (a, b) and (c, d) tie; the leftmost pair is merged first
+    assert _merge_adjacent(list(groups), 3) == [
+        (["a", "b"], 16, 3),
+        (["c"], 8, 5),
+        (["d"], 8, 6),
+    ]
+    assert _merge_adjacent(list(groups), 2) == [
+        (["a", "b"], 16, 3),
+        (["c", "d"], 16, 11),
+    ]
+    assert _merge_adjacent(list(groups), 1) == [(["a", "b", "c", "d"], 32, 14)]
+    assert _merge_adjacent(list(groups), 4) == groups
+
+
+@pytest.mark.parametrize("string_cache", [False, True])
+def test_transform_sparse(string_cache):
+    df = pl.DataFrame({"a": [0.5, 1.5, None, 3.0], "b": [1, 5, 2, None]})
+    binner = CustomBinner({"a": [1.0, 2.0], "b": [3]}).fit(df)
+
+    with pl.StringCache() if string_cache else nullcontext():
+        # categoricals of the cache get global ids that bins must not follow
+        pl.Series(["x", "y", "z"], dtype=pl.Categorical)
+        matrix = binner.transform_sparse(df)
+    columns = binner.get_dummy_columns()
+
+    assert matrix.shape == (4, columns.height) == (4, 7)
+    assert matrix.nnz == 8
+    expected = (
+        binner.transform(df)
+        .select(pl.col(x).cast(pl.String).fill_null("null") for x in df.columns)
+        .to_dicts()
+    )
+    for row, dummies in zip(expected, matrix.toarray()):
+        hot = columns.filter(pl.Series(dummies == 1))
+        assert dict(zip(hot["feature"], hot["label"])) == row
+
+
+def test_quantile_grid_matches_refits():
+    qs = [3, 5, 10, 20]
+    df_grid = quantile_grid(X_num, y_num, qs)
+    assert df_grid.shape == (9 + 3, 5)
+    with pl.StringCache():
+        # categoricals of the cache get global ids that bins must not follow
+        pl.Series(["x", "y", "z"], dtype=pl.Categorical)
+        assert quantile_grid(X_num, y_num, qs).equals(df_grid)
+
+    for q in qs:
+        binner = QuantileBinner(q).fit(X_num)
+        df_iv = cal_iv(binner.transform(X_num).with_columns(y_num), "y")
+        expected = dict(zip(df_iv[:, 0], df_iv[:, 1]))
+        for row in df_grid.filter(pl.col("q") == q).iter_rows(named=True):
+            assert row["n_bins"] == len(binner.breakpoints_[row["column"]]) + 1
+            assert row["iv"] == pytest.approx(expected[row["column"]])
+
+    binner = QuantileBinner(qs, min_bin_share=0.05).fit(X_num, y_num)
+    for x, q in binner.q_.items():
+        assert binner.breakpoints_[x] == sorted(
+            QuantileBinner(q).fit(X_num).breakpoints_[x]
+        )
+        assert df_grid.filter(column=x, q=q)["min_share"].item() >= 0.05
+
+    with pytest.raises(ValueError, match="y is required"):
+        QuantileBinner(qs).fit(X_num)
+
+
+def test_quantile_binner_segment_col():
+    binner = QuantileBinner(4, segment_col="segment").fit(X_seg)
+    assert sorted(binner.breakpoints_) == ["prime", "subprime", "thin"]
+
+    X_bin = binner.transform(X_seg)
+    for s, breaks in binner.breakpoints_.items():
+        part = X_seg.filter(segment=s)
+        expected = part.select(pl.col(x).cut(breaks[x]).cast(pl.String) for x in "ab")
+        result = X_bin.filter(segment=s).select(pl.col("a", "b").cast(pl.String))
+        assert result.equals(expected)
+
+    unseen = pl.DataFrame({"segment": ["other"], "a": [0.0], "b": [1]})
+    assert binner.transform(unseen).select("a", "b").null_count().row(0) == (1, 1)
+    with pytest.raises(ValueError, match="segment_col"):
+        binner.transform_sparse(X_seg)
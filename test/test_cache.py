@@ -0,0 +1,95 @@
+import polars as pl
+import polars_credit.eda  # noqa: F401
+import pytest
+from polars.testing import assert_frame_equal
+from polars_credit.bin import QuantileBinner
+from polars_credit.feature_selection import IVThreshold, PSIThreshold
+from polars_credit.util.cache import contingency_cache, fit_cache
+from polars_credit.util.divergence import cal_iv, cal_psi
+from polars_credit.woe import WOETransformer
+
+df = pl.DataFrame(
+    {
+        "A": ["a", "b", "a", None, "b", "c", "a", "c"],
+        "B": [1, 2, 1, 2, 1, 2, None, 2],
+        "t": [1, 1, 1, 1, 2, 2, 2, 2],
+        "y": [0, 1, 0, 1, 1, 0, 0, 1],
+    }
+)
+X, y = df.select("A", "B"), df["y"]
+# the frames of the IV against y and of the PSI against t
+df_y, df_t = df.drop("t"), df.drop("y")
+X_num = pl.DataFrame({"a": range(100), "b": [float(i % 7) for i in range(100)]})
+
+
+def test_cached_results_match():
+    expected_iv = cal_iv(df_y, "y")
+    expected_eda_iv = df_y.eda.iv("y")
+    expected_psi = cal_psi(df_t, "t")
+    expected_woe = WOETransformer().fit(X, y).woe_maps
+
+    with contingency_cache() as cache:
+        assert_frame_equal(cal_iv(df_y, "y"), expected_iv)
+        assert cache.stats()["misses"] == 2
+
+        assert_frame_equal(df_y.eda.iv("y"), expected_eda_iv)
+        assert IVThreshold().fit(X, y).iv_.equals(expected_iv)
+        woe_maps = WOETransformer().fit(X, y).woe_maps
+        assert_frame_equal(cal_psi(df_t, "t"), expected_psi)
+
+    assert cache.stats()["hits"] == 6
+    assert cache.stats()["misses"] == 4
+    for x in X.columns:
+        assert_frame_equal(woe_maps[x], expected_woe[x])
+
+
+def test_cache_invalidation_and_eviction():
+    with contingency_cache() as cache:
+        cal_iv(df_y, "y")
+        cal_iv(df_y.with_columns(pl.col("B").reverse()), "y")
+        cal_iv(df_y.sample(fraction=1.0, shuffle=True, seed=0), "y")
+    assert (cache.hits, cache.misses) == (3, 3)
+
+    with contingency_cache(max_bytes=1) as cache:
+        cal_iv(df_y, "y")
+    assert len(cache) == 0
+
+
+def test_no_cache_by_default():
+    assert cal_iv(df_y.lazy(), "y")["iv"].to_list() == pytest.approx(
+        cal_iv(df_y, "y")["iv"].to_list()
+    )
+
+
+def test_fit_cache(tmp_path, monkeypatch):
+    with fit_cache(tmp_path) as cache:
+        expected = QuantileBinner(q=4).fit(X_num).breakpoints_
+        binner = QuantileBinner(q=4).fit(X_num)
+        QuantileBinner(q=5).fit(X_num)
+        QuantileBinner(q=4).fit(X_num.with_columns(pl.col("a") * 2))
+        WOETransformer().fit(X, y)
+        woe = WOETransformer().fit(X, y)
+
+    assert binner.breakpoints_ == expected
+    assert woe.woe_maps.keys() == {"A", "B"}
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert len(list(tmp_path.glob("*.pkl"))) == 4
+
+    # data passed by keyword is part of the key, whatever its length
+    X_long = pl.DataFrame({"a": [i % 3 for i in range(1_000)]})
+    t = pl.Series("t", [i % 2 for i in range(1_000)])
+    with fit_cache(tmp_path) as cache:
+        PSIThreshold().fit(X_long, t=t)
+        PSIThreshold().fit(X_long, t=t.scatter(500, 5))
+        PSIThreshold().fit(X_long, t=t)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    monkeypatch.setenv("POLARS_CREDIT_FIT_CACHE", "0")
+    with fit_cache(tmp_path) as cache:
+        QuantileBinner(q=4).fit(X_num)
+    assert (cache.hits, cache.misses) == (0, 0)
+
+    monkeypatch.delenv("POLARS_CREDIT_FIT_CACHE")
+    with fit_cache(tmp_path, max_bytes=0) as cache:
+        QuantileBinner(q=4).fit(X_num)
+    assert not list(tmp_path.glob("*.pkl"))
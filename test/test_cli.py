@@ -0,0 +1,102 @@
+import warnings
+
+import joblib
+import numpy as np
+import polars as pl
+import pytest
+from polars_credit.bin import QuantileBinner
+from polars_credit.cli import _output_paths, main, score
+from polars_credit.scorecard import ScorecardTransformer
+from polars_credit.woe import WOETransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+
+
+def _fit_pipeline(tmp_path, output="label"):
+    rng = np.random.default_rng(0)
+    df = pl.DataFrame(
+        {
+            "id": np.arange(200),
+            "A": rng.normal(size=200),
+            "B": rng.integers(0, 5, 200),
+        }
+    )
+    y = pl.Series("y", (df["A"] + rng.normal(size=200) > 0).cast(pl.Int8))
+    X = df.drop("id")
+
+    pipeline = make_pipeline(
+        QuantileBinner(q=4, output=output),
+        WOETransformer(),
+        ScorecardTransformer(LogisticRegression()),
+    ).fit(X, y)
+    joblib.dump(pipeline, tmp_path / "pipeline.joblib")
+    return df, X, pipeline
+
+
+def test_score_matches_in_memory_pipeline(tmp_path):
+    df, X, pipeline = _fit_pipeline(tmp_path)
+
+    (tmp_path / "in").mkdir()
+    df[:120].write_parquet(tmp_path / "in" / "part-0.parquet")
+    df[120:].write_parquet(tmp_path / "in" / "part-1.parquet")
+
+    # the whole query runs on the streaming engine, without falling back
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        main(
+            [
+                "score",
+                str(tmp_path / "pipeline.joblib"),
+                str(tmp_path / "in" / "*.parquet"),
+                str(tmp_path / "out"),
+                "--keep",
+                "id",
+            ]
+        )
+
+    scored = pl.read_parquet(tmp_path / "out" / "*.parquet").sort("id")
+    expected = pipeline.predict_proba(X)
+
+    assert scored.columns == ["id", "score"]
+    np.testing.assert_allclose(scored["score"].to_numpy(), expected)
+
+
+def test_score_mirrors_partitions(tmp_path):
+    df, _, _ = _fit_pipeline(tmp_path)
+
+    # Hive partitions whose files all have the same name
+    for month, part in [(1, df[:120]), (2, df[120:])]:
+        (tmp_path / "in" / f"month={month}").mkdir(parents=True)
+        part.write_parquet(tmp_path / "in" / f"month={month}" / "part-0.parquet")
+
+    stats = score(
+        tmp_path / "pipeline.joblib",
+        str(tmp_path / "in" / "**" / "*.parquet"),
+        tmp_path / "out",
+        keep=["id"],
+    )
+    assert stats["rows"] == df.height
+    for month in (1, 2):
+        assert (tmp_path / "out" / f"month={month}" / "part-0.parquet").exists()
+
+    files = [tmp_path / "a" / "x.parquet", tmp_path / "a" / "x.parquet"]
+    with pytest.raises(ValueError, match="same output"):
+        _output_paths(files, str(tmp_path / "a" / "*.parquet"), tmp_path / "out")
+
+
+def test_score_warns_on_in_memory_fallback(tmp_path):
+    df, X, pipeline = _fit_pipeline(tmp_path, output="index")
+    (tmp_path / "in").mkdir()
+    df.write_parquet(tmp_path / "in" / "part-0.parquet")
+
+    # the dense lookup of bin ordinals is not streamable
+    with pytest.warns(UserWarning, match="scored in memory"):
+        score(
+            tmp_path / "pipeline.joblib",
+            str(tmp_path / "in" / "*.parquet"),
+            tmp_path / "out",
+            keep=["id"],
+        )
+
+    scored = pl.read_parquet(tmp_path / "out" / "*.parquet").sort("id")
+    np.testing.assert_allclose(scored["score"].to_numpy(), pipeline.predict_proba(X))
@@ -0,0 +1,74 @@
+import polars as pl
+import polars_credit as pc
+import pytest
+from polars_credit.util.divergence import cal_iv, cal_iv_pairs
+
+
+def test_cal_iv_pairs():
+    # y depends on A and B jointly (XOR), not on either of them alone
+    df = pl.DataFrame(
+        {
+            "A": [0, 0, 1, 1] * 25,
+            "B": [0, 1, 0, 1] * 25,
+            "C": pl.Series(["x", "y", "y", "x", "y"] * 20).cast(pl.Categorical),
+            "y": [1, 0, 0, 1] * 23 + [0, 0, 0, 0, 1, 1, 1, 1],
+        }
+    )
+
+    df_pairs = cal_iv_pairs(df, "y", smoothing=0.0)
+    assert df_pairs.columns == ["var_1", "var_2", "iv", "iv_1", "iv_2", "gain"]
+    assert df_pairs.height == 3
+    assert df_pairs.row(0)[:2] == ("A", "B")
+
+    cross = df.select(pl.format("{}_{}", "A", "B").alias("AB"), "y")
+    assert df_pairs["iv"][0] == pytest.approx(cal_iv(cross, "y")["iv"][0])
+    assert df_pairs["iv_1"][0] == pytest.approx(
+        cal_iv(df.select("A", "y"), "y")["iv"][0]
+    )
+
+    assert cal_iv_pairs(df, "y", ["A", "B", "C"], top_k=1, block_size=1).height == 1
+
+
+def test_cal_iv_pairs_null_target():
+    # B has more levels than a UInt8 code holds
+    df = pl.DataFrame(
+        {
+            "A": [0, 0, 0, 0, 1, 1, 1, 1] * 100,
+            "B": pl.Series(range(800)) % 300,
+            "y": [1, 1, 1, 0, 1, 0, 0, 0] * 90 + [None] * 80,
+        }
+    )
+
+    # rows with a null target are not counted as goods
+    df_pairs = cal_iv_pairs(df, "y")
+    expected = cal_iv_pairs(df.drop_nulls("y"), "y")
+    assert df_pairs.row(0)[:2] == expected.row(0)[:2]
+    assert df_pairs.row(0)[2:] == pytest.approx(expected.row(0)[2:])
+    assert cal_iv_pairs(df, "y", smoothing=0.0)["iv_1"][0] == pytest.approx(
+        cal_iv(df.select("A", "y").drop_nulls("y"), "y")["iv"][0]
+    )
+
+
+def test_cal_iv_several_targets():
+    df = pl.DataFrame(
+        {
+            "A": [1, 2, 1, 2, 1, 2, 3, 3],
+            "B": ["x", "x", "y", "y", "x", "y", "x", "y"],
+            "y1": [0, 1, 0, 1, 0, 0, 1, 0],
+            "y2": [1, 0, None, 1, 1, 0, 0, 1],
+        }
+    )
+
+    df_long = cal_iv(df, ["y1", "y2"])
+    assert df_long.columns == ["var", "target", "iv"]
+    df_wide = cal_iv(df, ["y1", "y2"], output="wide")
+    assert df_wide.columns == ["var", "y1", "y2"]
+
+    for t, other in [("y1", "y2"), ("y2", "y1")]:
+        expected = cal_iv(df.drop(other).drop_nulls(t), t)
+        result = df_long.filter(target=t).select("var", "iv")
+        assert result["iv"].to_list() == pytest.approx(expected["iv"].to_list())
+        assert df_wide[t].to_list() == pytest.approx(expected["iv"].to_list())
+
+    df_plugin = df.select(pc.cal_iv("A", ["y1", "y2"]).alias("A")).unnest("A")
+    assert df_plugin.row(0) == pytest.approx(tuple(df_wide.filter(var="A").row(0)[1:]))
@@ -0,0 +1,49 @@
+import numpy as np
+import polars as pl
+import polars_credit.eda  # noqa: F401
+import pytest
+
+rng = np.random.default_rng(0)
+df = pl.DataFrame(
+    {
+        "t": rng.integers(0, 3, 3_000),
+        "a": rng.integers(0, 5, 3_000),
+        "b": rng.choice(["u", "v", None], 3_000).tolist(),
+        "y": rng.integers(0, 2, 3_000),
+    }
+)
+
+
+by_period = df.eda.by_period("t", y="y")
+
+
+def test_by_period():
+    assert by_period.columns == [
+        "t",
+        "var",
+        "null_count",
+        "null_ratio",
+        "identical_ratio",
+        "n_unique",
+        "mean",
+        "iv",
+    ]
+    assert by_period["var"].to_list() == ["a", "b"] * 3
+    assert by_period.filter(pl.col("var") == "b")["mean"].is_null().all()
+
+    assert df.eda.by_period("t").columns[-1] == "mean"
+    with pytest.raises(ValueError, match="requires y"):
+        df.eda.by_period("t", ["iv"])
+
+
+@pytest.mark.parametrize("metric", ["null_ratio", "identical_ratio", "n_unique", "iv"])
+def test_by_period_matches_loop(metric):
+    # the same as looping over the periods
+    for period in range(3):
+        df_period = df.filter(pl.col("t") == period).drop("t")
+        if metric == "iv":
+            expected = df_period.eda.iv("y")
+        else:
+            expected = getattr(df_period.eda, metric)().filter(pl.col("var") != "y")
+        row = by_period.filter(pl.col("t") == period)
+        np.testing.assert_allclose(row[metric], expected[metric])
@@ -1,6 +1,21 @@
+import numpy as np
 import polars as pl
 import pytest
-from polars_credit.feature_selection import NullRatioThreshold
+from polars_credit import feature_selection
+from polars_credit.feature_selection import (
+    IVThreshold,
+    NullRatioThreshold,
+    StepwiseSelector,
+)
+from polars_credit.util.logistic import design_matrix, irls
+from sklearn.linear_model import LogisticRegression
+
+# a logistic target of x0, x1 and x2, with three noise features
+rng = np.random.default_rng(0)
+Z = rng.standard_normal((20_000, 6))
+logit = Z[:, 0] - 0.5 * Z[:, 1] + 0.3 * Z[:, 2] - 1
+X_logit = pl.DataFrame(Z, schema=[f"x{i}" for i in range(6)])
+y_logit = pl.Series("y", (rng.random(20_000) < 1 / (1 + np.exp(-logit))).astype(int))
 
 
 @pytest.mark.parametrize(
@@ -29,3 +44,168 @@ def test_null_ratio_threshold(threshold, expected_columns):
 
     # Check that the correct columns remain
     assert set(result.columns) == set(expected_columns)
+
+
+@pytest.mark.parametrize(
+    ("params", "expected"),
+    [
+        ({"p_enter": 0.01}, {"x0", "x1", "x2"}),
+        ({"criterion": "bic", "direction": "backward"}, {"x0", "x1", "x2"}),
+        ({"sign": "positive"}, {"x0", "x2"}),
+        ({"max_features": 1}, {"x0"}),
+    ],
+)
+def test_stepwise_selector(params, expected):
+    selector = StepwiseSelector(**params).fit(X_logit, y_logit)
+
+    assert set(selector.selected_features_) == expected
+    assert selector.transform(X_logit).columns == [
+        x for x in X_logit.columns if x in expected
+    ]
+    if "sign" in params:
+        assert (selector.coef_ > 0).all()
+
+
+@pytest.mark.parametrize("direction", ["forward", "backward", "both"])
+def test_stepwise_selector_collinear(direction):
+    # a duplicated column and a sum of columns cannot be fitted with them
+    X = X_logit.with_columns(dup=pl.col("x0"), total=pl.col("x1") + pl.col("x2"))
+    selector = StepwiseSelector(direction, criterion="bic").fit(X, y_logit)
+
+    assert "dup" not in selector.selected_features_
+    assert len(set(selector.selected_features_) & {"x1", "x2", "total"}) <= 2
+
+
+def test_stepwise_selector_backward_sign():
+    selector = StepwiseSelector("backward", p_remove=1.0, sign="positive").fit(
+        X_logit, y_logit
+    )
+
+    assert "x1" not in selector.selected_features_
+    assert (selector.coef_ > 0).all()
+    # the wrongly signed features are removed from the full model first
+    assert selector.steps_["feature"][-1] == "x1"
+
+
+def test_stepwise_selector_failed_fit(monkeypatch):
+    def singular(*args, **kwargs):
+        raise np.linalg.LinAlgError
+
+    X, y = X_logit.head(1000), y_logit.head(1000)
+    with pytest.raises(ValueError, match="criterion"):
+        StepwiseSelector(criterion="aicc").fit(X, y)
+
+    # the starting model cannot be skipped, and no scratch state is left
+    monkeypatch.setattr(feature_selection, "irls", singular)
+    selector = StepwiseSelector("backward", sign="positive")
+    with pytest.raises(ValueError, match="singular"):
+        selector.fit(X, y)
+    assert not hasattr(selector, "_A")
+
+
+def test_irls_matches_sklearn():
+    fit = irls(design_matrix(X_logit), y_logit.to_numpy().astype(float), np.arange(7))
+    lr = LogisticRegression(penalty=None, tol=1e-10).fit(
+        X_logit.to_numpy(), y_logit.to_numpy()
+    )
+
+    np.testing.assert_allclose(fit.coef[1:], lr.coef_[0], atol=1e-4)
+    np.testing.assert_allclose(fit.coef[0], lr.intercept_[0], atol=1e-4)
+
+
+def test_iv_threshold_segment_col():
+    # A separates the target in segment "p" only, B in no segment
+    X = pl.DataFrame(
+        {
+            "segment": ["p"] * 8 + ["s"] * 8,
+            "A": [0, 0, 0, 0, 1, 1, 1, 1] + [0, 1] * 4,
+            "B": [0, 1] * 8,
+        }
+    )
+    y = pl.Series("y", [0, 0, 0, 1, 1, 1, 1, 0] + [0, 0, 1, 1] * 2)
+
+    selector = IVThreshold(threshold=0.1, segment_col="segment").fit(X, y)
+    assert selector.iv_.columns == ["segment", "var", "iv"]
+    assert selector.iv_.height == 4
+    assert selector.get_cols_to_drop() == ["B"]
+    assert selector.transform(X).columns == ["segment", "A"]
+
+
+def test_iv_threshold_several_targets():
+    X = pl.DataFrame({"A": [0, 0, 1, 1] * 4, "B": [0, 1] * 8})
+    targets = pl.DataFrame({"y1": [0, 0, 1, 1] * 4, "y2": [0, 1, 1, 0] * 4})
+
+    selector = IVThreshold(threshold=0.1).fit(X, targets)
+    assert selector.iv_.columns == ["var", "target", "iv"]
+    assert selector.get_cols_to_drop() == ["B"]
+
+
+def test_iv_threshold_screening():
+    rng = np.random.default_rng(0)
+    n = 100_000
+    z = rng.standard_normal(n)
+    y = pl.Series("y", rng.random(n) < 1 / (1 + np.exp(2 - z)), dtype=pl.Int8)
+    # from no signal to a strong one, around the threshold in the middle
+    X = pl.DataFrame(
+        {
+            f"x{i}": np.digitize(s * z + rng.standard_normal(n), [-1, 0, 1])
+            for i, s in enumerate(np.linspace(0, 0.6, 30))
+        }
+    )
+
+    exact = IVThreshold(threshold=0.02).fit(X, y)
+    screened = IVThreshold(threshold=0.02, sample_size=10_000, seed=0).fit(X, y)
+
+    assert screened.get_cols_to_drop() == exact.get_cols_to_drop()
+    decisions = screened.screening_["decision"]
+    assert set(decisions) == {"keep", "drop", "full"}
+    # the features left to the full data have their exact IV
+    full = screened.screening_.filter(decision="full")["var"]
+    np.testing.assert_allclose(
+        screened.iv_.filter(pl.col("var").is_in(full))["iv"],
+        exact.iv_.filter(pl.col("var").is_in(full))["iv"],
+    )
+
+    with pytest.raises(ValueError, match="sample_size"):
+        IVThreshold(sample_size=10, segment_col="x0").fit(X, y)
+
+
+def test_iv_threshold_screening_decides_all_on_sample():
+    rng = np.random.default_rng(2)
+    n = 100_000
+    z = rng.standard_normal(n)
+    y = pl.Series("y", rng.random(n) < 1 / (1 + np.exp(1 - 2 * z)), dtype=pl.Int8)
+    X = pl.DataFrame(
+        {
+            "strong": np.digitize(z, [-1, 0, 1]),
+            "noise": np.digitize(rng.standard_normal(n), [-1, 0, 1]),
+        }
+    )
+
+    screened = IVThreshold(threshold=0.02, sample_size=10_000, seed=0).fit(X, y)
+    assert screened.screening_["decision"].to_list() == ["keep", "drop"]
+    assert screened.get_cols_to_drop() == ["noise"]
+    assert screened.iv_["var"].to_list() == ["strong", "noise"]
+
+
+def test_iv_threshold_screening_near_threshold():
+    rng = np.random.default_rng(1)
+    n = 100_000
+    # binary features whose IV on all the rows is within 20% of the threshold
+    X = pl.DataFrame({f"x{i}": rng.random(n) < 0.5 for i in range(3)}).cast(pl.Int8)
+    z = sum((X[x].to_numpy() - 0.5) * s for x, s in zip(X.columns, [0.30, 0.31, 0.32]))
+    y = pl.Series("y", rng.random(n) < 1 / (1 + np.exp(1.4 - z)), dtype=pl.Int8)
+
+    exact = IVThreshold(threshold=0.02).fit(X, y)
+    assert exact.iv_["iv"].to_list() == pytest.approx([0.02] * 3, rel=0.2)
+    assert 0 < len(exact.get_cols_to_drop()) < 3
+
+    # no feature this close to the threshold is decided on the sample
+    screened = IVThreshold(threshold=0.02, sample_size=10_000, seed=0).fit(X, y)
+    assert screened.screening_["decision"].to_list() == ["full"] * 3
+    assert screened.get_cols_to_drop() == exact.get_cols_to_drop()
+
+    # too few replicates for the ends of a 0.999 interval to be quantiles
+    with pytest.raises(ValueError, match="n_bootstrap"):
+        IVThreshold(sample_size=10_000, n_bootstrap=200).fit(X, y)
+    IVThreshold(sample_size=10_000, confidence=0.9, n_bootstrap=200).fit(X, y)
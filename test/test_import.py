@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _run(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+@pytest.mark.parametrize("module", ["sklearn", "altair", "polars_credit.woe"])
+def test_import_does_not_load_heavy_modules(module):
+    code = f"import sys, polars_credit; print({module!r} in sys.modules)"
+
+    assert _run(code) == "False"
+
+
+def test_submodule_is_loaded_on_attribute_access():
+    code = (
+        "import sys, polars_credit; polars_credit.woe; print('sklearn' in sys.modules)"
+    )
+
+    assert _run(code) == "True"
+
+
+def test_import_time_budget():
+    # generous bound, fails only if a heavy dependency sneaks back into the import
+    code = (
+        "import time; t = time.perf_counter(); import polars; t0 = time.perf_counter();"
+        "import polars_credit; print(time.perf_counter() - t0)"
+    )
+
+    assert float(_run(code)) < 0.5
+
+
+def test_all_lists_every_submodule():
+    import polars_credit
+
+    assert set(polars_credit.__all__) >= polars_credit._SUBMODULES
+
+    code = "from polars_credit import *; print(scorecard.__name__)"
+    assert _run(code) == "polars_credit.scorecard"
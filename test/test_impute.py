@@ -0,0 +1,74 @@
+import polars as pl
+import polars.selectors as cs
+import pytest
+from polars_credit.bin import CustomBinner
+from polars_credit.impute import StatisticImputer, WOEAwareImputer
+
+df = pl.DataFrame(
+    {
+        "A": [1.0, None, 3.0, 4.0, 10.0],
+        "B": [1, 2, None, 2, 5],
+        "C": ["x", None, "x", "z", "z"],
+    }
+)
+
+
+@pytest.mark.parametrize(
+    ("strategy", "expected"),
+    [
+        # integer columns get rounded fill values
+        ("median", {"A": 3.5, "B": 2}),
+        ("mean", {"A": 4.5, "B": 2}),
+        (
+            [(cs.numeric(), ("quantile", 1.0)), ("C", "mode")],
+            {"A": 10.0, "B": 5, "C": "x"},
+        ),
+        (
+            [(cs.all(), "mode"), (["A", "B"], ("constant", 0))],
+            {"A": 0, "B": 0, "C": "x"},
+        ),
+    ],
+)
+def test_statistic_imputer(strategy, expected):
+    imputer = StatisticImputer(strategy).fit(df)
+
+    assert imputer.fill_value_dict_ == expected
+    result = imputer.transform(df)
+    assert result.select(expected).null_count().sum_horizontal().item() == 0
+    assert result.schema == df.schema
+
+
+def test_statistic_imputer_approximate():
+    X = pl.DataFrame({"A": range(1000)})
+
+    imputer = StatisticImputer("median", approximate=True, sample_size=100).fit(X)
+
+    assert imputer.fill_value_dict_["A"] == pytest.approx(499.5, abs=10)
+
+
+def test_statistic_imputer_invalid_strategy():
+    with pytest.raises(ValueError, match="strategy"):
+        StatisticImputer("max").fit(df)
+
+
+def test_woe_aware_imputer():
+    X = pl.DataFrame(
+        {
+            "A": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, None, None, 7.0, 8.0],
+            "B": [1, 1, 1, 1, 1, 2, 2, 2, 2, 2],
+        }
+    )
+    y = pl.Series("y", [0, 0, 1, 0, 0, 1, 1, 1, 1, 0])
+
+    imputer = WOEAwareImputer(CustomBinner({"A": [4.0], "B": [1.5]})).fit(X, y)
+
+    # the missing group is all bad, closest to the riskier upper bin of A
+    assert imputer.fill_value_dict_ == {"A": 7.0}
+    assert imputer.transform(X)["A"].null_count() == 0
+
+    # bins are the binner's ordinals, even under a string cache
+    with pl.StringCache():
+        pl.Series(["x", "y", "z"], dtype=pl.Categorical)
+        woe = WOEAwareImputer(CustomBinner({"A": [4.0], "B": [1.5]})).fit(X, y).woe_
+    assert woe.filter(variable="A")["bin"].to_list() == [0, 1, None]
+    assert woe.equals(imputer.woe_)
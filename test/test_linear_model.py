@@ -0,0 +1,68 @@
+import numpy as np
+import polars as pl
+import pytest
+from polars_credit.linear_model import LogisticRegression
+from polars_credit.scorecard import ScorecardTransformer
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression as SklearnLogisticRegression
+
+rng = np.random.default_rng(0)
+X = pl.DataFrame(rng.standard_normal((5_000, 3)), schema=["a", "b", "c"])
+p = X.select(1 / (1 + (1 - pl.col("a") + pl.col("b")).exp())).to_series()
+y = pl.Series("y", rng.random(5_000) < p.to_numpy(), dtype=pl.Int8)
+w = rng.random(5_000)
+scorecard = ScorecardTransformer(LogisticRegression()).fit(X, y)
+
+
+def test_matches_sklearn():
+    model = LogisticRegression(block_size=1_000).fit(X, y, sample_weight=w)
+    expected = SklearnLogisticRegression(penalty=None, tol=1e-10).fit(
+        X.to_numpy(), y.to_numpy(), sample_weight=w
+    )
+
+    np.testing.assert_allclose(model.coef_, expected.coef_, atol=1e-5)
+    np.testing.assert_allclose(model.intercept_, expected.intercept_, atol=1e-5)
+    np.testing.assert_allclose(
+        model.predict_proba(X), expected.predict_proba(X.to_numpy()), atol=1e-6
+    )
+    np.testing.assert_allclose(
+        model.predict_proba(X.to_numpy()), model.predict_proba(X)
+    )
+
+    summary = model.summary()
+    assert summary["feature"].to_list() == ["intercept", "a", "b", "c"]
+    assert (summary["std_err"] > 0).all()
+
+
+def test_fit_rejects_nulls_and_warns():
+    with pytest.raises(ValueError, match=r"\['b'\]"):
+        LogisticRegression().fit(X.with_columns(b=pl.lit(None, pl.Float64)), y)
+
+    with pytest.warns(ConvergenceWarning, match="did not converge"):
+        model = LogisticRegression(max_iter=1).fit(X, y)
+    assert model.n_iter_ == 1
+
+
+def test_scorecard():
+    np.testing.assert_allclose(
+        scorecard.predict_proba(X), X.select(scorecard.score_expr())["score"]
+    )
+
+
+def test_reason_codes():
+    reasons = scorecard.reason_codes(X, k=2, with_points=True)
+
+    assert reasons.columns == ["reason_1", "reason_2", "points_1", "points_2"]
+    assert reasons["reason_1"].dtype == pl.Enum(["a", "b", "c"])
+
+    # the shortfall of each feature from its fewest points over the data
+    coef = scorecard.cls_fitted_.coef_[0]
+    points = X.to_numpy() * coef * scorecard.factor_
+    shortfall = points - points.min(axis=0)
+    expected = np.sort(shortfall, axis=1)[:, ::-1]
+    np.testing.assert_allclose(reasons["points_1"], expected[:, 0])
+    np.testing.assert_allclose(reasons["points_2"], expected[:, 1])
+    assert reasons["reason_1"].to_list() == ["abc"[i] for i in shortfall.argmax(axis=1)]
+
+    # more reasons than features pad with nulls
+    assert scorecard.reason_codes(X, k=4)["reason_4"].null_count() == X.height
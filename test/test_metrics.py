@@ -1,8 +1,14 @@
 from math import isclose
 
+import numpy as np
 import polars as pl
 import pytest
-from polars_credit.metrics import ks_score, roc_auc_score
+from polars_credit.metrics import (
+    gains_curve_points,
+    ks_score,
+    roc_auc_score,
+    roc_curve_points,
+)
 
 df1 = pl.DataFrame(
     {
@@ -29,3 +35,22 @@ def test_roc_auc_score(input, output):
 def test_ks_score(input, output):
     score = input.select(ks_score("true", "pred"))[0, 0]
     assert isclose(score, output, rel_tol=1e-6)
+
+
+@pytest.mark.parametrize("method", ["threshold", "rdp"])
+def test_curve_points(method):
+    rng = np.random.default_rng(0)
+    score = rng.random(100_000)
+    df = pl.DataFrame({"true": rng.random(100_000) < score, "pred": score}).cast(
+        {"true": pl.Int8}
+    )
+
+    roc = roc_curve_points(df, "true", "pred", max_points=100, method=method)
+    gains = gains_curve_points(df.lazy(), "true", "pred", max_points=100, method=method)
+
+    for curve in (roc, gains):
+        assert curve.height == 100
+        assert curve.row(0)[1:] == (0.0, 0.0)
+        assert curve.row(-1)[1:] == (1.0, 1.0)
+    auc = np.trapezoid(roc["tpr"], roc["fpr"])
+    assert isclose(auc, df.select(roc_auc_score("true", "pred")).item(), abs_tol=1e-3)
@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+
+import numpy as np
+import polars as pl
+import pytest
+from polars_credit.monitor import RollingMonitor
+from sklearn.metrics import roc_auc_score, roc_curve
+
+rng = np.random.default_rng(0)
+n = 20_000
+score = rng.integers(300, 900, n)
+df = pl.DataFrame(
+    {
+        "day": [
+            date(2024, 1, 1) + timedelta(days=int(d)) for d in rng.integers(0, 60, n)
+        ],
+        "score": score,
+        "bad": (rng.random(n) < 1 / (1 + np.exp((700 - score) / 80))).astype(np.int8),
+    }
+)
+
+
+def test_rolling_monitor():
+    # one bucket per point, so that the metrics are exact
+    monitor = RollingMonitor(breaks=range(300, 900), windows=[30, 7])
+
+    for day in df["day"].unique().sort():
+        monitor.update(df.filter(pl.col("day") == day), "day", "bad", "score")
+
+    metrics = monitor.metrics()
+    assert metrics["window"].to_list() == [7, 30]
+    assert len(monitor.days) == 30
+
+    for start, auc, ks, gini in metrics.select("start", "auc", "ks", "gini").rows():
+        df_window = df.filter(pl.col("day") >= start)
+        fpr, tpr, _ = roc_curve(df_window["bad"], df_window["score"])
+        assert auc == pytest.approx(roc_auc_score(df_window["bad"], df_window["score"]))
+        assert ks == pytest.approx(np.max(tpr - fpr))
+        assert gini == pytest.approx(2 * auc - 1)
+
+    # matured outcomes replace the counts of a day
+    last = df.filter(pl.col("day") == monitor.latest)
+    monitor.update(last.with_columns(bad=pl.lit(0, pl.Int8)), "day", "bad", "score")
+    assert monitor.metrics()["n"].to_list() == metrics["n"].to_list()
+    assert monitor.metrics()["bad_rate"][0] < metrics["bad_rate"][0]
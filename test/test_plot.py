@@ -0,0 +1,33 @@
+import polars as pl
+import pytest
+
+pytest.importorskip("altair")
+
+from polars_credit.plot import ks_chart, psi_by_period, psi_chart, roc_chart, woe_chart
+
+df = pl.DataFrame(
+    {
+        "y": [0, 1, 0, 1, 1, 0, 0, 1, 0, 0],
+        "score": [0.1, 0.8, 0.3, 0.6, 0.9, 0.2, 0.4, 0.7, 0.5, 0.1],
+        "bin": ["a", "b", "a", "b", "b", "a", "c", "c", "a", "c"],
+        "month": [1, 1, 1, 1, 1, 2, 2, 2, 2, 2],
+    }
+)
+
+
+def test_charts():
+    for chart in (
+        roc_chart(df, "y", "score", max_points=5),
+        ks_chart(df, "y", "score"),
+        woe_chart(df, "bin", "y"),
+        psi_chart(df.lazy(), "bin", "month"),
+    ):
+        assert chart.to_dict()
+
+
+def test_psi_by_period():
+    df_psi = psi_by_period(df, "bin", "month")
+
+    assert df_psi["month"].to_list() == [1, 2]
+    assert df_psi["psi"][0] == 0
+    assert df_psi["psi"][1] == float("inf")
@@ -0,0 +1,58 @@
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+from polars_credit.preprocessing import DtypeCompactor
+
+X = pl.DataFrame(
+    {
+        "int": [1, 200, None, 3],
+        "integral": [1.0, 2.0, None, -5.0],
+        "exact": [0.5, 0.25, 1.5, None],
+        "inexact": [0.1, 0.2, 0.3, 0.4],
+        "str": ["a", "b", "a", None],
+        "ordinal": pl.Series([1, 2, 3, 4], dtype=pl.UInt8),
+        "wide": [0, 2**40, 1, 1],
+    }
+)
+
+
+def test_dtype_compactor():
+    compactor = DtypeCompactor(string_dtype="enum").fit(X)
+
+    # integers keep their type, integral floats are exact in float32
+    assert compactor.dtypes_ == {
+        "integral": pl.Float32,
+        "exact": pl.Float32,
+        "str": pl.Enum(["a", "b"]),
+    }
+    assert compactor.saved_bytes_ > 0
+    assert compactor.report_.height == X.width
+
+    X_compact = compactor.transform(X.lazy()).collect()
+    assert_frame_equal(X_compact, X, check_dtypes=False)
+
+
+def test_dtype_compactor_narrow_integers():
+    compactor = DtypeCompactor(narrow_integers=True).fit(X)
+    assert compactor.dtypes_["int"] == pl.Int16
+    assert compactor.dtypes_["integral"] == pl.Int8
+
+    # the schema is decided at fit, in a single lazy query
+    X_compact = compactor.transform(X.lazy())
+    assert X_compact.collect_schema()["int"] == pl.Int16
+    assert_frame_equal(X_compact.collect(), X, check_dtypes=False)
+
+    # values the narrowed types cannot hold fail rather than change the schema
+    for expr in [pl.col("int") * 1000, pl.col("integral") + 0.7]:
+        with pytest.raises(pl.exceptions.InvalidOperationError):
+            compactor.transform(X.with_columns(expr))
+
+    # dtypes without a known size are left unchanged
+    X_wide = pl.DataFrame({"big": pl.Series([1, 2], dtype=pl.Decimal(20, 0))})
+    assert DtypeCompactor(narrow_integers=True).fit(X_wide).dtypes_ == {}
+
+
+def test_dtype_compactor_max_categories():
+    compactor = DtypeCompactor(max_categories=1, float32="always").fit(X)
+    assert "str" not in compactor.dtypes_
+    assert compactor.dtypes_["inexact"] == pl.Float32
@@ -0,0 +1,65 @@
+import polars as pl
+from polars_credit.bin import QuantileBinner
+from polars_credit.feature_selection import IVThreshold
+from polars_credit.util.profile import profile
+from polars_credit.woe import WOETransformer
+
+X = pl.DataFrame(
+    {
+        "A": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
+        "B": [10, 20, 10, 20, 10, 20, 10, 20],
+    }
+)
+y = pl.Series("y", [0, 1, 0, 1, 1, 0, 1, 0])
+
+
+def test_profile_records_fit_and_transform():
+    records = []
+
+    with profile(callback=records.append) as prof:
+        binner = QuantileBinner(q=2).fit(X)
+        X_bin = binner.transform(X)
+        WOETransformer().fit(X_bin, y)
+
+    names = [record.name for record in prof.records]
+    assert names == [
+        "QuantileBinner.fit",
+        "QuantileBinner.transform",
+        "WOETransformer.fit",
+    ]
+    assert records == prof.records
+    assert binner.fit_profile_ is prof.records[0]
+    assert (prof.records[0].n_rows, prof.records[0].n_cols) == (8, 2)
+    assert all(record.query_plans for record in prof.records)
+    assert prof.to_frame().height == 3
+
+
+def test_profile_records_nested_calls():
+    with profile(explain=False) as prof:
+        IVThreshold().fit(X, y)
+
+    assert [(r.name, r.depth) for r in prof.records] == [
+        ("cal_iv", 1),
+        ("IVThreshold.fit", 0),
+    ]
+    assert not any(record.query_plans for record in prof.records)
+
+
+def test_no_profile_outside_context():
+    binner = QuantileBinner(q=2).fit(X)
+
+    assert not hasattr(binner, "fit_profile_")
+
+
+def test_profile_without_resource_module(monkeypatch):
+    import sys
+
+    # as on Windows, where the resource module does not exist
+    monkeypatch.setattr(sys, "platform", "win32")
+    monkeypatch.setitem(sys.modules, "resource", None)
+
+    with profile() as prof:
+        QuantileBinner(q=2).fit(X)
+
+    assert prof.records[0].peak_rss_mb is None
+    assert prof.records[0].rss_increase_mb is None
@@ -0,0 +1,174 @@
+import numpy as np
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+from polars_credit.bin import QuantileBinner
+from polars_credit.woe import WOETransformer, _is_ordinal
+
+X = pl.DataFrame(
+    {
+        "A": [1.5, 2.5, None, 4.5, 1.5, 2.5, 4.5, 1.5],
+        "B": [10, 20, 10, 20, 10, 20, None, 20],
+        "C": ["a", "b", "a", "c", "b", "a", None, "c"],
+        "D": [0.1, 0.7, 0.3, 0.9, 0.2, 0.5, 0.8, 0.4],
+    }
+)
+y = pl.Series("y", [0, 1, 0, 1, 1, 0, 1, 0])
+
+# a string and a bin ordinal feature over 4 folds, for out-of-fold encoding
+X_cat = pl.DataFrame(
+    {
+        "s": [None if i % 11 == 0 else "abcd"[i * 7 % 4] for i in range(400)],
+        "o": pl.Series([i * 13 % 5 for i in range(400)], dtype=pl.UInt8),
+    }
+)
+y_bin = pl.Series("y", [int((i * 31 + i // 3) % 3 == 0) for i in range(400)])
+folds = pl.Series("fold", [i // 100 for i in range(400)])
+
+# pure noise, whose out-of-fold encoding must not correlate with the target
+rng = np.random.default_rng(0)
+X_noise = pl.DataFrame({"x": rng.integers(0, 200, 20_000).astype(str)})
+y_noise = pl.Series("y", rng.integers(0, 2, 20_000))
+
+
+@pytest.mark.parametrize("binned", [False, True])
+def test_woe_long_format_matches_per_column(binned):
+    X_fit = QuantileBinner(q=2).fit_transform(X) if binned else X
+
+    woe_per_column = WOETransformer(method="per_column").fit(X_fit, y)
+    woe_long = WOETransformer(method="long").fit(X_fit, y)
+
+    assert woe_long.woe_maps.keys() == woe_per_column.woe_maps.keys()
+    for x, df_woe in woe_per_column.woe_maps.items():
+        assert_frame_equal(woe_long.woe_maps[x], df_woe)
+
+
+def test_woe_auto_method_uses_wide_threshold():
+    # the long format is opt-in, however wide the data
+    assert not WOETransformer(wide_threshold=3)._use_long_format(X)
+
+    woe = WOETransformer(method="auto", wide_threshold=3)
+    assert woe._use_long_format(X)
+    assert not woe.set_params(wide_threshold=4)._use_long_format(X)
+
+
+def test_transform_bin_index_matches_labels():
+    df = pl.DataFrame({"x": pl.Series([0, 1, 2, None, 1, 0, 2, 1], dtype=pl.UInt8)})
+    y = pl.Series("y", [0, 1, 0, 1, 1, 0, 0, 1])
+
+    woe = WOETransformer().fit(df, y)
+    expected = WOETransformer().fit(df.cast(pl.String), y).transform(df.cast(pl.String))
+
+    assert woe.transform(df).equals(expected)
+
+    # an ordinal unseen during fit is null, like an unseen value
+    unseen = pl.DataFrame({"x": pl.Series([1, 7], dtype=pl.UInt8)})
+    assert woe.transform(unseen)["x"].to_list() == [expected["x"][1], None]
+
+
+def test_transform_raw_unsigned_codes():
+    # a raw UInt16 feature, not bin ordinals, is mapped by value
+    df = pl.DataFrame({"x": pl.Series([3, 9, 60_000, None, 9, 3], dtype=pl.UInt16)})
+    y = pl.Series("y", [0, 1, 0, 1, 1, 0])
+
+    woe = WOETransformer().fit(df, y)
+    assert not _is_ordinal("x", woe.woe_maps["x"])
+
+    X_new = pl.DataFrame({"x": pl.Series([9, 60_000, None, 3], dtype=pl.UInt16)})
+    expected = woe.transform(X_new.cast(pl.String))
+    assert woe.transform(X_new).equals(expected)
+    np.testing.assert_array_equal(
+        woe.transform_numpy(X_new, dtype=np.float64, fill_value=np.nan)[:, 0],
+        expected["x"].fill_null(np.nan).to_numpy(),
+    )
+
+
+@pytest.mark.parametrize("order", ["F", "C"])
+def test_transform_numpy(tmp_path, order):
+    X_mixed = pl.DataFrame(
+        {
+            "s": ["a", "b", None, "a", "b", "a", "b", "a"],
+            "o": pl.Series([0, 1, 2, None, 1, 0, 2, 1], dtype=pl.UInt8),
+        }
+    )
+    y = pl.Series("y", [0, 1, 0, 1, 1, 0, 0, 1])
+    woe = WOETransformer().fit(X_mixed, y)
+    expected = woe.transform(X_mixed).to_numpy()
+
+    result = woe.transform_numpy(X_mixed, order=order)
+    assert result.dtype == np.float32
+    assert result.flags[f"{order}_CONTIGUOUS"]
+    np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+    out = np.lib.format.open_memmap(
+        tmp_path / "woe.npy", mode="w+", dtype=np.float32, shape=expected.shape
+    )
+    assert woe.transform_numpy(X_mixed.lazy(), out=out) is out
+    np.testing.assert_allclose(out, expected, rtol=1e-6)
+
+    unseen = pl.DataFrame({"o": pl.Series([5], dtype=pl.UInt8)})
+    assert woe.transform_numpy(unseen, fill_value=-1.0).tolist() == [[-1.0]]
+
+
+def test_transform_numpy_unseen_ordinals():
+    # "n" is null on every row during fit, so its WOE map only has nulls
+    X_fit = pl.DataFrame(
+        {
+            "o": pl.Series([0, 1, 2, None, 1, 0, 2, 1], dtype=pl.UInt8),
+            "n": pl.Series([None] * 8, dtype=pl.UInt8),
+        }
+    )
+    y = pl.Series("y", [0, 1, 0, 1, 1, 0, 0, 1])
+    woe = WOETransformer().fit(X_fit, y)
+
+    # the ordinal right after the table is unseen, not null
+    X_new = pl.DataFrame(
+        {
+            "o": pl.Series([3, None], dtype=pl.UInt8),
+            "n": pl.Series([3, None], dtype=pl.UInt8),
+        }
+    )
+    null_woe = woe.woe_maps["o"].filter(pl.col("o").is_null())["woe"].item()
+    assert woe.transform(X_new).rows() == [(None, None), (null_woe, 0.0)]
+    result = woe.transform_numpy(X_new, fill_value=np.nan, dtype=np.float64)
+    np.testing.assert_array_equal(result, [[np.nan, np.nan], [null_woe, 0.0]])
+
+
+def test_oof_fit_transform_matches_fold_fits():
+    woe = WOETransformer()
+    result = woe.oof_fit_transform(X_cat, y_bin, folds=folds)
+
+    for k in range(4):
+        train = folds != k
+        woe_k = WOETransformer().fit(X_cat.filter(train), y_bin.filter(train))
+        expected = woe_k.transform(X_cat.filter(~train))
+        assert_frame_equal(result.filter(~train), expected)
+
+    full = WOETransformer().fit(X_cat, y_bin)
+    for x, df_woe in full.woe_maps.items():
+        assert_frame_equal(woe.woe_maps[x], df_woe)
+
+    assert woe.oof_fit_transform(X_cat, y_bin, folds=3, seed=0).shape == X_cat.shape
+    with pytest.raises(ValueError, match="at least 2 folds"):
+        woe.oof_fit_transform(X_cat, y_bin, folds=1)
+
+
+def test_oof_fit_transform_does_not_leak():
+    result = WOETransformer().oof_fit_transform(X_noise, y_noise)
+    corr = np.corrcoef(result["x"].to_numpy(), y_noise.to_numpy())
+    assert abs(corr[0, 1]) < 0.05
+
+
+def test_woe_segment_col():
+    X_seg = X.with_columns(segment=pl.Series(["p", "p", "s", "s"] * 2))
+    woe = WOETransformer(segment_col="segment").fit(X_seg, y)
+    result = woe.transform(X_seg)
+
+    for s in ["p", "s"]:
+        mask = X_seg["segment"] == s
+        part = X.filter(mask)
+        expected = WOETransformer().fit(part, y.filter(mask)).transform(part)
+        assert_frame_equal(result.filter(mask).drop("segment"), expected)
+
+    unseen = X_seg.head(1).with_columns(segment=pl.lit("other"))
+    assert woe.transform(unseen).drop("segment").null_count().sum_horizontal()[0] == 4